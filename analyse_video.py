@@ -1,80 +1,103 @@
-def analyze_thumbnails(client, videos_data, is_shorts=False):
-    if is_shorts:
-        filtered_data = videos_data[videos_data['쇼츠'] == True]
-        content_type = "쇼츠(Shorts)"
-    else:
-        filtered_data = videos_data[videos_data['쇼츠'] == False]
-        content_type = "롱폼(Longform)"
+import pandas as pd
+
+from llm_scheduler import create_completion, run_concurrently, OPENAI_MAX_WORKERS
+from llm_cache import cached_completion, stream_completion
+from metrics import add_video_metrics, summarize, top_videos, LIKE_RATE, COMMENT_RATE, RATIO_PERCENTILE, VIEWS_ZSCORE, TYPE_VIEWS_ZSCORE
+
+
+# 썸네일 1개 분석 (오류가 나도 결과 딕셔너리 반환)
+def analyze_thumbnail(client, channel_name, video, limiter=None, use_cache=True):
+    thumbnail_url = video['썸네일']
     
-    # 데이터가 없는 경우
+    prompt = f"""
+        YouTube 채널 "{channel_name}"의 "{video['제목']}" 영상의 썸네일 이미지입니다. 그 외 정보는 다음과 같습니다:
+        조회수: {video['조회수']}
+        좋아요: {video['좋아요']}
+        댓글수: {video['댓글수']}
+        조회구독비율: {video['조회수/구독자 비율']:.4f}
+
+        이 썸네일을 보고 시각적 요소(색상, 구도, 텍스트, 표정 등)가 이 동영상의 인기를 끄는데 기여했을지 200자 이내로 분석해주세요.
+        """
+    
+    try:
+        analysis = cached_completion(
+            client,
+            model='gpt-4o-2024-08-06', 
+            messages=[
+                {"role": "system", "content": "당신은 유튜브 썸네일 분석 전문가입니다."},
+                {"role": "user", "content": prompt}, 
+                {"role": "user", "content": [
+                    {"type": "image_url", "image_url": {"url": thumbnail_url}}
+                ]}
+            ],
+            temperature=0.3,
+            max_tokens=300,
+            use_cache=use_cache,
+            create=lambda **kwargs: create_completion(client, limiter=limiter, **kwargs)
+        )
+    except Exception as e:
+        analysis = f"분석 중 오류 발생: {str(e)}"
+    
+    return {
+        "키워드": video['키워드'],
+        "채널명": video['채널명'],
+        "video_id": video['video_id'],
+        "제목": video['제목'],
+        "썸네일": thumbnail_url,
+        "분석": analysis
+    }
+
+
+# 썸네일 분석을 동시에 요청하고 끝나는 순서대로 반환
+def iter_thumbnail_analyses(client, videos_data, is_shorts=False, max_workers=OPENAI_MAX_WORKERS, limiter=None, use_cache=True):
+    """
+    조회구독비율 순위(0부터)와 분석 결과 딕셔너리를 (rank, result) 형태로 하나씩 반환
+    분석할 영상이 없으면 아무것도 반환하지 않음
+    """
+    filtered_data = videos_data[videos_data['쇼츠'] == is_shorts]
     if filtered_data.empty:
-        return f"분석할 {content_type} 영상이 없습니다."
+        return
     
     # 모든 동영상을 조회구독비율 기준으로 정렬
     sorted_videos = filtered_data.sort_values(by='조회수/구독자 비율', ascending=False)
     
-    # 결과를 저장할 리스트
-    all_thumbnail_analyses = []
-    
     # 채널 이름 가져오기
     channel_name = filtered_data['채널명'].iloc[0]
     
-    # 각 동영상에 대해 분석 수행
-    for _, video in sorted_videos.iterrows():
-        thumbnail_url = video['썸네일']
-        video_id = video['video_id']
-        
-        prompt = f"""
-        YouTube 채널 "{channel_name}"의 "{video['제목']}" 영상의 썸네일 이미지입니다. 그 외 정보는 다음과 같습니다:
-        조회수: {video['조회수']}
-        좋아요: {video['좋아요']}
-        댓글수: {video['댓글수']}
-        조회구독비율: {video['조회수/구독자 비율']:.4f}
+    jobs = [
+        (rank, lambda video=video: analyze_thumbnail(client, channel_name, video, limiter, use_cache))
+        for rank, video in enumerate(sorted_videos.to_dict('records'))
+    ]
+    yield from run_concurrently(jobs, max_workers=max_workers)
 
-        이 썸네일을 보고 시각적 요소(색상, 구도, 텍스트, 표정 등)가 이 동영상의 인기를 끄는데 기여했을지 200자 이내로 분석해주세요.
-        """
-        
-        try:
-            response = client.chat.completions.create(
-                model='gpt-4o-2024-08-06', 
-                messages=[
-                    {"role": "system", "content": "당신은 유튜브 썸네일 분석 전문가입니다."},
-                    {"role": "user", "content": prompt}, 
-                    {"role": "user", "content": [
-                        {"type": "image_url", "image_url": {"url": thumbnail_url}}
-                    ]}
-                ],
-                temperature=0.3,
-                max_tokens=300
-            )
-            
-            # 분석 결과 저장
-            analysis_result = {
-                "키워드": video['키워드'],
-                "채널명": video['채널명'],
-                "video_id": video_id,
-                "제목": video['제목'],
-                "썸네일": thumbnail_url,
-                "분석": response.choices[0].message.content.strip()
-            }
-            
-            all_thumbnail_analyses.append(analysis_result)
-            
-        except Exception as e:
-            analysis_result = {
-                "키워드": video['키워드'],
-                "채널명": video['채널명'],
-                "video_id": video_id,
-                "제목": video['제목'],
-                "썸네일": thumbnail_url,
-                "분석": f"분석 중 오류 발생: {str(e)}"
-            }
-            all_thumbnail_analyses.append(analysis_result)
-    
-    return all_thumbnail_analyses
 
+def analyze_thumbnails(client, videos_data, is_shorts=False, on_result=None, use_cache=True):
+    """
+    on_result: 분석이 끝날 때마다 (rank, result)를 받는 콜백 (화면에 바로 표시할 때 사용)
+    결과는 조회구독비율 순으로 정렬된 리스트로 반환
+    """
+    content_type = "쇼츠(Shorts)" if is_shorts else "롱폼(Longform)"
+    
+    # 결과를 저장할 리스트
+    all_thumbnail_analyses = {}
+    
+    for rank, result in iter_thumbnail_analyses(client, videos_data, is_shorts, use_cache=use_cache):
+        all_thumbnail_analyses[rank] = result
+        if on_result:
+            on_result(rank, result)
+    
+    # 데이터가 없는 경우
+    if not all_thumbnail_analyses:
+        return f"분석할 {content_type} 영상이 없습니다."
+    
+    return [all_thumbnail_analyses[rank] for rank in sorted(all_thumbnail_analyses)]
 
-def analyze_channel_video(client, llm, videos_data, is_shorts=False):  # client, llm, videos_data, thumbnail, is_shorts=False  # 썸네일 분석 추가
+
+# 채널 분석 요청 메시지 생성 (분석할 영상이 없으면 안내 문구를 문자열로 반환)
+def channel_analysis_messages(videos_data, is_shorts=False):
+    # 참여도 지표 계산 (비율 백분위는 쇼츠/롱폼 그룹 안에서, 조회수 z-score는 쇼츠/롱폼을 합친 채널 전체 기준)
+    videos_data = add_video_metrics(videos_data)
+    
     # 해당 카테고리(쇼츠/롱폼)에 맞는 영상 필터링
     if is_shorts:
         filtered_data = videos_data[videos_data['쇼츠'] == True]
@@ -88,30 +111,10 @@ def analyze_channel_video(client, llm, videos_data, is_shorts=False):  # client,
         return f"분석할 {content_type} 영상이 없습니다."
     
     # 데이터 준비
-    data_summary = {
-        "영상_수": len(filtered_data),
-        "평균_조회수": filtered_data['조회수'].mean(),
-        "평균_좋아요": filtered_data['좋아요'].mean(),
-        "평균_댓글수": filtered_data['댓글수'].mean(),
-        "평균_조회구독비율": filtered_data['조회수/구독자 비율'].mean(),
-        "최고_조회수": filtered_data['조회수'].max(),
-        "최고_좋아요": filtered_data['좋아요'].max(),
-        "최고_댓글수": filtered_data['댓글수'].max()
-    }
+    data_summary = summarize(filtered_data)
     
     # 상위 3개 영상 정보 (조회수 기준)
-    top_videos = filtered_data.sort_values(by='조회수', ascending=False).head(3)
-    top_videos_info = []
-    
-    for _, row in top_videos.iterrows():
-        video_info = {
-            "제목": row['제목'],
-            "조회수": row['조회수'],
-            "좋아요": row['좋아요'],
-            "댓글수": row['댓글수'],
-            "조회구독비율": row['조회수/구독자 비율'], 
-        }
-        top_videos_info.append(video_info)
+    top_videos_info = top_videos(filtered_data, '조회수', 3)
     
     # 프롬프트 작성
     channel_name = filtered_data['채널명'].iloc[0]
@@ -120,22 +123,27 @@ def analyze_channel_video(client, llm, videos_data, is_shorts=False):  # client,
     다음은 YouTube 채널 "{channel_name}"의 {content_type} 영상 {len(filtered_data)}개에 대한 데이터입니다:
     
     전체 데이터 요약:
-    - 영상 수: {data_summary['영상_수']}개
-    - 평균 조회수: {data_summary['평균_조회수']:.1f}회
-    - 평균 좋아요: {data_summary['평균_좋아요']:.1f}개
-    - 평균 댓글 수: {data_summary['평균_댓글수']:.1f}개
-    - 평균 조회수/구독자 비율: {data_summary['평균_조회구독비율']:.4f}
+    - 영상 수: {data_summary['count']}개
+    - 평균 조회수: {data_summary['mean_views']:.1f}회
+    - 평균 좋아요: {data_summary['mean_likes']:.1f}개
+    - 평균 댓글 수: {data_summary['mean_comments']:.1f}개
+    - 평균 조회수/구독자 비율: {data_summary['mean_ratio']:.4f} (중앙값 {data_summary['ratio_p50']:.4f}, 상위 10% 기준 {data_summary['ratio_p90']:.4f})
+    - 평균 좋아요/조회수: {data_summary['mean_like_rate']:.2f}%
+    - 평균 댓글/조회수: {data_summary['mean_comment_rate']:.2f}%
     
     상위 3개 영상 (조회수 기준):
     """
     
     for i, video in enumerate(top_videos_info):
+        # 채널 영상이 2개 미만이면 비교 대상이 없어 z-score 생략
+        zscore = f"\n       - 채널 전체 영상(쇼츠+롱폼) 평균 대비 조회수 z-score: {video[VIEWS_ZSCORE]:.2f}" if pd.notna(video[VIEWS_ZSCORE]) else ""
         prompt += f"""
     {i+1}. "{video['제목']}"
        - 조회수: {video['조회수']}회
        - 좋아요: {video['좋아요']}개
        - 댓글 수: {video['댓글수']}개
-       - 조회수/구독자 비율: {video['조회구독비율']:.4f}
+       - 조회수/구독자 비율: {video['조회수/구독자 비율']:.4f} ({content_type} 영상 중 백분위 {video[RATIO_PERCENTILE]:.0f})
+       - 좋아요/조회수: {video[LIKE_RATE]:.2f}%, 댓글/조회수: {video[COMMENT_RATE]:.2f}%{zscore}
         """
     
     prompt += f"""
@@ -149,25 +157,57 @@ def analyze_channel_video(client, llm, videos_data, is_shorts=False):  # client,
     분석 결과는 400-500단어 내외로 작성해주세요.
     """
     
+    return [
+        {"role": "system", "content": "당신은 유튜브 채널과 영상 데이터를 분석하는 전문가입니다. 데이터를 깊이 있게 분석하고 통찰력 있는 인사이트를 제공해주세요."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def analyze_channel_video(client, llm, videos_data, is_shorts=False, use_cache=True):  # client, llm, videos_data, thumbnail, is_shorts=False  # 썸네일 분석 추가
+    messages = channel_analysis_messages(videos_data, is_shorts)
+    if isinstance(messages, str):
+        return messages
+    
     try:
-        response = client.chat.completions.create(
+        return cached_completion(
+            client,
             model=llm,  # gpt-4o-2024-08-06
-            messages=[
-                {"role": "system", "content": "당신은 유튜브 채널과 영상 데이터를 분석하는 전문가입니다. 데이터를 깊이 있게 분석하고 통찰력 있는 인사이트를 제공해주세요."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=1000,
+            use_cache=use_cache,
         )
-        
-        # 응답에서 텍스트 추출
-        return response.choices[0].message.content.strip()
-        
+    
     except Exception as e:
         return f"데이터 분석 중 오류가 발생했습니다: {str(e)}"
 
 
-def analyze_keyword_video(client, llm, videos_data, is_shorts=False):
+# 분석 결과를 생성되는 대로 조각(str) 단위로 반환 (st.write_stream 용)
+def analyze_channel_video_stream(client, llm, videos_data, is_shorts=False, use_cache=True):
+    messages = channel_analysis_messages(videos_data, is_shorts)
+    if isinstance(messages, str):
+        yield messages
+        return
+    
+    try:
+        yield from stream_completion(
+            client,
+            model=llm,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=1000,
+            use_cache=use_cache,
+        )
+    
+    except Exception as e:
+        yield f"데이터 분석 중 오류가 발생했습니다: {str(e)}"
+
+
+# 키워드 분석 요청 메시지 생성 (분석할 영상이 없으면 안내 문구를 문자열로 반환)
+def keyword_analysis_messages(videos_data, is_shorts=False):
+    # 참여도 지표 계산 (비율 백분위와 조회수 z-score 모두 같은 쇼츠/롱폼 그룹의 검색 결과 전체 기준)
+    videos_data = add_video_metrics(videos_data)
+    
     # 해당 카테고리(쇼츠/롱폼)에 맞는 영상 필터링
     if is_shorts:
         filtered_data = videos_data[videos_data['쇼츠'] == True]
@@ -181,32 +221,10 @@ def analyze_keyword_video(client, llm, videos_data, is_shorts=False):
         return f"분석할 {content_type} 영상이 없습니다."
     
     # 데이터 준비
-    data_summary = {
-        "영상_수": len(filtered_data),
-        "채널_수": len(filtered_data['채널명'].unique()),
-        "평균_조회수": filtered_data['조회수'].mean(),
-        "평균_좋아요": filtered_data['좋아요'].mean(),
-        "평균_댓글수": filtered_data['댓글수'].mean(),
-        "평균_조회구독비율": filtered_data['조회수/구독자 비율'].mean(),
-        "최고_조회수": filtered_data['조회수'].max(),
-        "최고_좋아요": filtered_data['좋아요'].max(),
-        "최고_댓글수": filtered_data['댓글수'].max()
-    }
+    data_summary = summarize(filtered_data)
     
     # 상위 3개 영상 정보 (조회수 기준)
-    top_videos = filtered_data.sort_values(by='조회수', ascending=False).head(3)
-    top_videos_info = []
-    
-    for _, row in top_videos.iterrows():
-        video_info = {
-            "제목": row['제목'],
-            "채널명": row['채널명'],
-            "조회수": row['조회수'],
-            "좋아요": row['좋아요'],
-            "댓글수": row['댓글수'],
-            "조회구독비율": row['조회수/구독자 비율']
-        }
-        top_videos_info.append(video_info)
+    top_videos_info = top_videos(filtered_data, '조회수', 3)
     
     popular_channels = filtered_data.groupby('채널명')['조회수'].sum().sort_values(ascending=False).head(3)  # 인기 채널 분석
     keyword = filtered_data['키워드'].iloc[0]  # 키워드 정보 가져오기
@@ -215,23 +233,28 @@ def analyze_keyword_video(client, llm, videos_data, is_shorts=False):
     다음은 키워드 "{keyword}"의 {content_type} 영상 {len(filtered_data)}개에 대한 데이터입니다:
     
     전체 데이터 요약:
-    - 영상 수: {data_summary['영상_수']}개
-    - 채널 수: {data_summary['채널_수']}개
-    - 평균 조회수: {data_summary['평균_조회수']:.1f}회
-    - 평균 좋아요: {data_summary['평균_좋아요']:.1f}개
-    - 평균 댓글 수: {data_summary['평균_댓글수']:.1f}개
-    - 평균 조회수/구독자 비율: {data_summary['평균_조회구독비율']:.4f}
+    - 영상 수: {data_summary['count']}개
+    - 채널 수: {data_summary['channel_count']}개
+    - 평균 조회수: {data_summary['mean_views']:.1f}회
+    - 평균 좋아요: {data_summary['mean_likes']:.1f}개
+    - 평균 댓글 수: {data_summary['mean_comments']:.1f}개
+    - 평균 조회수/구독자 비율: {data_summary['mean_ratio']:.4f} (중앙값 {data_summary['ratio_p50']:.4f}, 상위 10% 기준 {data_summary['ratio_p90']:.4f})
+    - 평균 좋아요/조회수: {data_summary['mean_like_rate']:.2f}%
+    - 평균 댓글/조회수: {data_summary['mean_comment_rate']:.2f}%
     
     상위 3개 영상 (조회수 기준):
     """
     
     for i, video in enumerate(top_videos_info):
+        # 같은 그룹 영상이 1개뿐이면 비교 대상이 없어 z-score 생략
+        zscore = f"\n       - 이 키워드의 {content_type} 영상 평균 대비 조회수 z-score: {video[TYPE_VIEWS_ZSCORE]:.2f}" if pd.notna(video[TYPE_VIEWS_ZSCORE]) else ""
         prompt += f"""
     {i+1}. "{video['제목']}"
        - 조회수: {video['조회수']}회
        - 좋아요: {video['좋아요']}개
        - 댓글 수: {video['댓글수']}개
-       - 조회수/구독자 비율: {video['조회구독비율']:.4f}
+       - 조회수/구독자 비율: {video['조회수/구독자 비율']:.4f} ({content_type} 영상 중 백분위 {video[RATIO_PERCENTILE]:.0f})
+       - 좋아요/조회수: {video[LIKE_RATE]:.2f}%, 댓글/조회수: {video[COMMENT_RATE]:.2f}%{zscore}
         """
     
     # 인기 채널 정보 추가
@@ -251,19 +274,47 @@ def analyze_keyword_video(client, llm, videos_data, is_shorts=False):
     분석 결과는 400-500단어 내외로 작성해주세요.
     """
     
+    return [
+        {"role": "system", "content": "당신은 키워드로 묶인 유튜브 영상들의 데이터를 분석하는 전문가입니다. 데이터를 깊이 있게 분석하고 통찰력 있는 인사이트를 제공해주세요."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def analyze_keyword_video(client, llm, videos_data, is_shorts=False, use_cache=True):
+    messages = keyword_analysis_messages(videos_data, is_shorts)
+    if isinstance(messages, str):
+        return messages
+    
     try:
-        response = client.chat.completions.create(
+        return cached_completion(
+            client,
             model=llm,  # "gpt-4o-2024-08-06"
-            messages=[
-                {"role": "system", "content": "당신은 키워드로 묶인 유튜브 영상들의 데이터를 분석하는 전문가입니다. 데이터를 깊이 있게 분석하고 통찰력 있는 인사이트를 제공해주세요."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=1000,
+            use_cache=use_cache,
         )
-        
-        # 응답에서 텍스트 추출
-        return response.choices[0].message.content.strip()
-        
+    
     except Exception as e:
         return f"데이터 분석 중 오류가 발생했습니다: {str(e)}"
+
+
+# 분석 결과를 생성되는 대로 조각(str) 단위로 반환 (st.write_stream 용)
+def analyze_keyword_video_stream(client, llm, videos_data, is_shorts=False, use_cache=True):
+    messages = keyword_analysis_messages(videos_data, is_shorts)
+    if isinstance(messages, str):
+        yield messages
+        return
+    
+    try:
+        yield from stream_completion(
+            client,
+            model=llm,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=1000,
+            use_cache=use_cache,
+        )
+    
+    except Exception as e:
+        yield f"데이터 분석 중 오류가 발생했습니다: {str(e)}"
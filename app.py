@@ -3,21 +3,24 @@ import pandas as pd
 import os
 from dotenv import load_dotenv
 
-from googleapiclient.discovery import build
-
 from openai import OpenAI
 
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-
 # 커스텀 모듈
-from youtube import is_youtubeshorts, youtube_transcript
-from saveNload import save_info, load_info, fetch_youtube_data, get_top_videos_by_search_id, save_video_analysis, save_video_analysis_keyword, save_thumbnail_analysis
-from blog import blog_content, blog_summarizer
-from analyse_video import analyze_channel_video, analyze_keyword_video, analyze_thumbnails
-from feedback import save_feedback_yt, save_feedback_ig, save_feedback_th
-from pdf_rag import extract_text_from_pdf, generate_from_pdf2youtube, generate_from_pdf2instagram, generate_from_pdf2threads
-from generate_contents import generate_from_channel, generate_from_keyword
+from db import connect_postgres, get_connection, run_migrations
+from saveNload import save_info_bulk, load_info, refresh_channel, comment_fetcher, save_blog_summaries, fetch_youtube_data_concurrent, get_top_videos_by_search_id, save_video_analysis, save_video_analysis_keyword, save_thumbnail_analysis, save_generated_content, save_generated_contents, ContentWriter
+from blog import iter_blog_summaries
+from analyse_video import analyze_channel_video_stream, analyze_keyword_video_stream, analyze_thumbnails
+from feedback import save_feedback_yt, save_feedback_ig, save_feedback_th, youtube_feedback_summaries
+from pdf_rag import extract_text_from_pdf, generate_from_pdf2youtube, generate_from_pdf2instagram, generate_from_pdf2threads, generate_from_pdf2all
+from generate_contents import generate_from_channel, generate_from_keyword, generate_all_platforms
+from content_parser import PLATFORM_FIELDS, SectionStreamParser, missing_sections, format_content
+from llm_cache import stream_completion
+from read_models import PAGE_SIZE, TRANSCRIPT_PREVIEW_CHARS, count_rows, list_video_analyses, get_video_analysis, list_thumbnail_analyses, get_thumbnail_result, list_first_blog_summaries, get_blog_summary, list_blog_int_summaries, get_blog_int_summary, list_content_youtube, invalidate
+from enrich import enrich_videos
+from youtube import YouTubeAnalyzer
+from metrics import summarize, split_summary, FETCH_COLUMNS
+from video_stats import save_video_stats, rows_from_info_records
+from quota import estimate_channel_run, estimate_keyword_run, plan_run, remaining_today
 
 
 st.set_page_config(page_title="유튜브 채널 분석기", layout="wide")
@@ -29,173 +32,155 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
-llm_option = st.selectbox("LLM 선택", ('gpt-4o-2024-08-06', 'gpt-4o-mini-2024-07-18', 'gpt-3.5-turbo-0125'))  # 'o1-mini-2024-09-12'
+# 스키마 변경 사항(인덱스 등) 반영 - 프로세스당 한 번만 실제로 실행됨
+try:
+    run_migrations()
+except Exception as e:
+    st.error(f"DB 스키마 업데이트 중 오류가 발생했습니다: {str(e)}")
 
+llm_option = st.selectbox("LLM 선택", ('gpt-4o-2024-08-06', 'gpt-4o-mini-2024-07-18', 'gpt-3.5-turbo-0125'))  # 'o1-mini-2024-09-12'
 
-# PostgreSQL에 접속
-def connect_postgres():
-    conn = psycopg2.connect(
-        host="15.164.112.237", 
-        database="dify", 
-        user="difyuser", 
-        password="bico0218"
-    )
-    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    
-    return conn
 
 def search_unique_id():
-    conn = connect_postgres()
-    cur = conn.cursor()
-    
-    # 시퀀스가 없으면 생성
-    cur.execute("CREATE SEQUENCE IF NOT EXISTS youtube_search_seq")
-    
-    # 다음 시퀀스 값 가져오기
-    cur.execute("SELECT nextval('youtube_search_seq')")
-    search_id = cur.fetchone()[0]
-    
-    cur.close()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        
+        # 시퀀스가 없으면 생성
+        cur.execute("CREATE SEQUENCE IF NOT EXISTS youtube_search_seq")
+        
+        # 다음 시퀀스 값 가져오기
+        cur.execute("SELECT nextval('youtube_search_seq')")
+        search_id = cur.fetchone()[0]
+        
+        cur.close()
     
     return search_id
 
+TOP_VIDEOS_PAGE_SIZE = 30  # 검색 ID별 대표 동영상 목록 한 페이지의 검색 ID 수
+
 # 만 단위로 변환
 def format_to_10k(n):
     num = round(n / 10000, 1)  # 소수점 첫째자리에서 반올림
     return f"{num}만"
 
-# 유튜브 채널 데이터 수집
-class YouTubeAnalyzer:
-    def __init__(self, api_key):
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
-    
-    # Extract channel ID from URL or custom URL
-    def get_channel_id(self, channel_url):
-        if 'youtube.com/channel/' in channel_url:
-            return channel_url.split('channel/')[1].split('/')[0]
-        elif 'youtube.com/@' in channel_url:
-            username = channel_url.split('@')[1].split('/')[0]
-            request = self.youtube.channels().list(
-                part='id',
-                forUsername=username
-            )
-            try:
-                response = request.execute()
-                if response.get('items'):
-                    return response['items'][0]['id']
-            except:
-                pass
-            
-            # If the above method fails, try with search
-            request = self.youtube.search().list(
-                part='snippet',
-                q=username,
-                type='channel',
-                maxResults=1
-            )
-            response = request.execute()
-            
-            # Verify the channel handle matches
-            for item in response['items']:
-                channel_id = item['snippet']['channelId']
-                channel_info = self.youtube.channels().list(
-                    part='snippet',
-                    id=channel_id
-                ).execute()
-                
-                if channel_info['items'][0]['snippet'].get('customUrl', '').lower() == f'@{username.lower()}':
-                    return channel_id
-            
-            raise ValueError(f"Could not find channel ID for {channel_url}")
-    
-    # Get channel statistics including subscriber count
-    def get_channel_stats(self, channel_id):
-        request = self.youtube.channels().list(
-            part='statistics,snippet',
-            id=channel_id
-        )
-        response = request.execute()
-        channel_info = response['items'][0]
-        return {
-            'title': channel_info['snippet']['title'],
-            'subscribers': int(channel_info['statistics']['subscriberCount']),
-            'thumbnail': channel_info['snippet']['thumbnails']['high']['url']
-        }
-    
-    # 해당 채널의 동영상 정보
-    def get_all_videos(self, channel_id):
-        videos = []
-        next_page_token = None
-        
-        while True:
-            request = self.youtube.search().list(
-                part='snippet',
-                channelId=channel_id,
-                maxResults=50,
-                type='video',
-                pageToken=next_page_token,
-                order='date'  # 최신 영상부터
-            )
-            response = request.execute()
-            
-            # Get video IDs for batch statistics request
-            video_ids = [item['id']['videoId'] for item in response['items']]
-            
-            if not video_ids:
-                break
-            
-            # Get video statistics in batch
-            stats_request = self.youtube.videos().list(
-                part='statistics',
-                id=','.join(video_ids)
-            )
-            stats_response = stats_request.execute()
-            
-            # Combine video information with statistics
-            for video, stats in zip(response['items'], stats_response['items']):
-                videos.append({
-                    'title': video['snippet']['title'],
-                    'thumbnail': video['snippet']['thumbnails']['high']['url'],
-                    'views': int(stats['statistics'].get('viewCount', 0)),
-                    'like_count': int(stats['statistics'].get('likeCount', 0)),
-                    'comment_count': int(stats['statistics'].get('commentCount', 0)),
-                    'published_at': video['snippet']['publishedAt'],
-                    'video_id': video['id']['videoId']
-                })
-            
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
-        
-        return videos
-    
-    # 상위 n개 댓글
-    def get_top_comments(self, video_id, max_results=3):
-        """Get top comments for a specific video"""
-        try:
-            request = self.youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                maxResults=max_results,
-                order='relevance'  # 인기순 정렬
-            )
-            response = request.execute()
-            
-            comments = []
-            for item in response.get('items', []):
-                comment = item['snippet']['topLevelComment']['snippet']
-                comments.append({
-                    'author': comment['authorDisplayName'],
-                    'text': comment['textDisplay'],
-                    'like_count': comment['likeCount'],
-                    'published_at': comment['publishedAt']
-                })
-            
-            return comments
-        except Exception as e:
-            # 댓글이 비활성화된 경우 등의 예외 처리
-            return [{'author': '댓글 없음', 'text': '댓글을 가져올 수 없습니다 (비활성화되었거나 접근 불가)', 'like_count': 0, 'published_at': ''}]
+# 실행 전 YouTube API 할당량 확인 후 실행 방식('full' 또는 'skip_comments') 반환
+def check_quota(estimate):
+    run_mode = plan_run(estimate)  # 댓글을 빼도 부족하면 QuotaExceededError
+    st.caption(f"예상 YouTube API 사용량: {estimate['total']} 유닛 / 오늘 남은 할당량: {remaining_today()} 유닛")
+    if run_mode == 'skip_comments':
+        st.warning("YouTube API 할당량이 부족해 댓글 수집을 건너뜁니다.")
+    return run_mode
+
+# 썸네일 분석 결과 1개 표시
+def show_thumbnail_analysis(analysis):
+    st.write(f"#### {analysis['제목']}")
+    cols = st.columns([1, 2])
+    with cols[0]:
+        st.image(analysis['썸네일'])
+    with cols[1]:
+        st.write(analysis['분석'])
+
+# 썸네일 분석 실행 (끝나는 대로 화면에 먼저 표시하고, 완료되면 정렬된 결과로 대체)
+def run_thumbnail_analysis(videos_data, is_shorts):
+    placeholder = st.empty()
+    with placeholder.container():
+        st.write("### 인기 썸네일 분석 (진행 중)")
+        result = analyze_thumbnails(openai_client, videos_data, is_shorts=is_shorts, on_result=lambda rank, analysis: show_thumbnail_analysis(analysis))
+    placeholder.empty()
+    return result
+
+
+# 생성된 콘텐츠의 섹션 상태 표시 (모두 비었으면 오류, 일부만 비었으면 경고)
+def report_sections(content, platform, label):
+    missing = missing_sections(content, platform)
+    if len(missing) == len(PLATFORM_FIELDS[platform]):
+        st.error(f"생성된 {label} 콘텐츠에서 섹션을 찾을 수 없어 저장하지 않았습니다.")
+    elif missing:
+        st.warning(f"{label} 콘텐츠가 저장되었지만 비어 있는 항목이 있습니다: {', '.join(missing)}")
+    else:
+        st.success(f"{label} 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
+
+# 블로그 요약으로 콘텐츠를 스트리밍 생성하고, 섹션이 완성될 때마다 바로 저장
+def stream_blog_content(platform, blog_id, keyword, messages):
+    """
+    (전체 텍스트, {field: text}) 반환. 생성 중인 텍스트는 임시로 표시했다가 완료되면 지움
+    """
+    writer = ContentWriter('blog', platform, blog_id, keyword)
+    parser = SectionStreamParser(platform, on_section=writer.save)
+
+    def deltas():
+        for delta in stream_completion(openai_client, model=llm_option, messages=messages, temperature=0.3, max_tokens=1500):
+            parser.feed(delta)
+            yield delta
+
+    placeholder = st.empty()
+    with placeholder.container():
+        text = st.write_stream(deltas())
+    placeholder.empty()
+    return text.strip(), parser.close()
+
+# 목록 페이지 선택 (0부터 시작하는 페이지 번호 반환)
+def select_page(table_name, key, page_size=PAGE_SIZE):
+    total = count_rows(table_name)
+    pages = max(-(-total // page_size), 1)
+    page = st.number_input(f"페이지 (전체 {total}건, {pages}페이지)", min_value=1, max_value=pages, value=1, step=1, key=key)
+    return int(page) - 1
+
+# 검색 ID별 대표 동영상 목록 (필터 입력이 없으면 최신 검색부터 페이지 단위로, 있으면 전체에서 필터링)
+def load_top_videos(table_name, key, filter_keys):
+    cursors = st.session_state.setdefault(f'{key}_cursors', [None])  # 페이지별 before_id
+    if any(st.session_state.get(filter_key) for filter_key in filter_keys):
+        return get_top_videos_by_search_id(table_name, transcript_chars=TRANSCRIPT_PREVIEW_CHARS)
+
+    df = get_top_videos_by_search_id(table_name, limit=TOP_VIDEOS_PAGE_SIZE, before_id=cursors[-1], transcript_chars=TRANSCRIPT_PREVIEW_CHARS)
+    if df.empty and len(cursors) > 1:  # 보고 있던 페이지가 비었으면 첫 페이지로
+        cursors[:] = [None]
+        df = get_top_videos_by_search_id(table_name, limit=TOP_VIDEOS_PAGE_SIZE, transcript_chars=TRANSCRIPT_PREVIEW_CHARS)
+    return df
+
+# load_top_videos 목록의 이전/다음 페이지 버튼 (필터 입력 중에는 전체를 보여주므로 표시하지 않음)
+def top_videos_pager(df, key, filter_keys):
+    if any(st.session_state.get(filter_key) for filter_key in filter_keys):
+        return
+    cursors = st.session_state[f'{key}_cursors']
+    st.caption(f"최근 검색부터 {TOP_VIDEOS_PAGE_SIZE}개씩 표시합니다 ({len(cursors)}페이지). 조회 조건을 입력하면 전체 기록에서 찾습니다.")
+    col_prev, col_next = st.columns(2)
+    with col_prev:
+        if st.button("이전 페이지", key=f'{key}_prev', disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_next:
+        if st.button("다음 페이지", key=f'{key}_next', disabled=len(df) < TOP_VIDEOS_PAGE_SIZE):
+            cursors.append(int(df['pk_ID'].min()))
+            st.rerun()
+
+# 쇼츠/롱폼 동영상 분석 리스트 (미리보기 목록 + 선택한 분석만 전체 내용 조회)
+def show_video_analysis_list(table_name, key):
+    page = select_page(table_name, key=f'{key}_page')
+    analysis_df = list_video_analyses(table_name, page)
+    st.dataframe(
+        analysis_df,
+        column_config={
+            "검색ID": st.column_config.Column(width="small"),
+            "쇼츠": st.column_config.Column(width="small"),
+            "분석 미리보기": st.column_config.TextColumn(width="large"),
+            "생성일시": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm")
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+    if analysis_df.empty:
+        return
+    selected = st.selectbox(
+        "전체 분석 내용을 볼 항목",
+        options=[(search_id, bool(is_shorts)) for search_id, is_shorts in zip(analysis_df['검색ID'], analysis_df['쇼츠'])],
+        format_func=lambda item: f"{item[0]} ({'쇼츠' if item[1] else '롱폼'})",
+        index=None,
+        key=f'{key}_detail'
+    )
+    if selected:
+        st.markdown(get_video_analysis(table_name, *selected))
 
 
 # # 메인 탭 # #
@@ -205,7 +190,7 @@ tab_channel, tab_keyword, tab_blog, tab_result, tab_content = st.tabs(["채널 
 # 채널 데이터 탭
 with tab_channel:
     if 'channel_status' not in st.session_state:
-        st.session_state.channel_status = 'initial'  # 'initial', 'confirmed', 'show_existing'
+        st.session_state.channel_status = 'initial'  # 'initial', 'confirmed', 'show_existing', 'refresh'
     if 'current_channel' not in st.session_state:
         st.session_state.current_channel = None
     if 'current_channel_keyword' not in st.session_state:
@@ -247,8 +232,9 @@ with tab_channel:
     # 
     if st.session_state.channel_status == 'confirm_needed':
         st.warning("이미 분석된 적 있는 채널입니다. 그래도 분석을 진행하시겠습니까?")
+        st.caption("증분 업데이트: 마지막 분석 이후 올라온 동영상만 새로 수집하고, 기존 동영상은 조회수 등 통계만 갱신합니다.")
         
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             if st.button("예", key="confirm_channel_yes"):
                 st.session_state.channel_status = 'confirmed'
@@ -257,6 +243,10 @@ with tab_channel:
             if st.button("아니오", key="confirm_channel_no"):
                 st.session_state.channel_status = 'show_existing'
                 st.rerun()
+        with col3:
+            if st.button("증분 업데이트", key="confirm_channel_refresh"):
+                st.session_state.channel_status = 'refresh'
+                st.rerun()
     
     # 기존 분석 결과 표시
     if st.session_state.channel_status == 'show_existing':
@@ -315,6 +305,9 @@ with tab_channel:
             try:
                 analyzer = YouTubeAnalyzer(YOUTUBE_API_KEY)
                 
+                # 남은 YouTube API 할당량 확인 (부족하면 댓글 수집 제외, 그래도 부족하면 중단)
+                run_mode = check_quota(estimate_channel_run(video_limit=10))
+                
                 # 고유 검색 ID 생성 (PostgreSQL에서 자동으로 생성)
                 pk_id = search_unique_id()
                 
@@ -336,31 +329,33 @@ with tab_channel:
                 with col2:
                     st.write(f"구독자: {format_to_10k(channel_stats['subscribers'])} ({channel_stats['subscribers']}명)")
                 
-                # 동영상 정보 가져오기
-                videos = analyzer.get_all_videos(channel_id)
-                
-                # 상위 10개 동영상만 처리 (또는 전체 동영상이 10개 미만인 경우)
-                top_videos = videos[:10]
+                # 상위 10개 동영상만 가져와서 처리 (또는 전체 동영상이 10개 미만인 경우)
+                top_videos = analyzer.get_all_videos(channel_id, limit=10)
                 
                 st.subheader(f"상위 {len(top_videos)}개 동영상 분석 및 저장 중...")
                 progress_bar = st.progress(0)
                 
-                # 각 동영상 정보 처리 및 저장
-                for i, video in enumerate(top_videos):
-                    video_id = video['video_id']
-                    
-                    is_shorts = is_youtubeshorts(video_id)  # 쇼츠 여부 확인
-                    transcript = youtube_transcript(video_id)  # 자막 가져오기
+                # 쇼츠 여부, 자막, 댓글을 모든 동영상에 대해 병렬로 수집 (결과는 입력 순서 유지)
+                enriched = enrich_videos(
+                    [video['video_id'] for video in top_videos],
+                    comment_fetcher(run_mode == 'full'),
+                    on_progress=lambda done, total: progress_bar.progress(done / total)  # 진행상황 업데이트
+                )
+                
+                # 모든 동영상 정보를 한 번에 저장
+                records = []
+                for video, extra in zip(top_videos, enriched):
                     view_subscriber_ratio = video['views'] / channel_stats['subscribers'] if channel_stats['subscribers'] > 0 else 0  # 조회수/구독자 비율 계산
-                    comments = analyzer.get_top_comments(video_id, 3)  # 댓글 가져오기
-                    
-                    save_info(
-                        'info_channel', pk_id, keyword, channel_url, channel_stats['title'], channel_stats['subscribers'], 
-                        video_id, video['title'], video['thumbnail'], video['views'], video['like_count'], video['comment_count'], view_subscriber_ratio,
-                        is_shorts, transcript, video['published_at'], comments
-                    )
                     
-                    progress_bar.progress((i + 1) / len(top_videos))  # 진행상황 업데이트
+                    records.append(dict(
+                        search_unique_id=pk_id, keyword=keyword, channel_url=channel_url, channel_name=channel_stats['title'], channel_subscribers=channel_stats['subscribers'], 
+                        video_id=video['video_id'], video_title=video['title'], video_thumbnail=video['thumbnail'], video_view_count=video['views'], video_like_count=video['like_count'], 
+                        video_comment_count=video['comment_count'], video_view_subscriber_ratio=view_subscriber_ratio,
+                        is_shorts=extra['is_shorts'], transcript=extra['transcript'], published_at=video['published_at'], top_comments=extra['comments']
+                    ))
+                
+                save_info_bulk('info_channel', records)
+                save_video_stats(rows_from_info_records(records))  # 조회수 추이 기록
                 
                 st.success(f"성공적으로 채널 '{channel_stats['title']}'의 데이터를 저장했습니다!")
         
@@ -371,6 +366,41 @@ with tab_channel:
                 st.error(f"채널 분석 중 오류가 발생했습니다: {str(e)}")
                 st.session_state.channel_status = 'initial'
 
+    # 채널 증분 업데이트 (새 동영상만 수집, 기존 동영상은 통계만 갱신)
+    if st.session_state.channel_status == 'refresh' and st.session_state.current_channel:
+        with st.spinner("채널의 새 동영상을 확인하는 중..."):
+            try:
+                run_mode = check_quota(estimate_channel_run(video_limit=10))
+                
+                pk_id = search_unique_id()
+                progress_bar = st.progress(0)
+                
+                refreshed = refresh_channel(
+                    YouTubeAnalyzer(YOUTUBE_API_KEY),
+                    st.session_state.current_channel,
+                    st.session_state.current_channel_keyword,
+                    pk_id,
+                    limit=10,
+                    on_progress=lambda done, total: progress_bar.progress(done / total),
+                    include_comments=run_mode == 'full'
+                )
+                progress_bar.progress(1.0)
+                
+                channel_stats = refreshed['channel_stats']
+                st.subheader(f"채널: {channel_stats['title']}")
+                st.write(f"구독자: {format_to_10k(channel_stats['subscribers'])} ({channel_stats['subscribers']}명)")
+                st.write(f"새 동영상 {refreshed['new_count']}개 수집, 기존 동영상 {refreshed['refreshed_count']}개 통계 갱신"
+                         + (f", 삭제/비공개 {refreshed['removed_count']}개 제외" if refreshed['removed_count'] else ""))
+                
+                st.success(f"채널 '{channel_stats['title']}'의 데이터를 업데이트했습니다! (검색 ID: {pk_id}, 이전 검색 ID: {refreshed['previous_search_id']})")
+                
+                # 업데이트 완료 후 상태 초기화
+                st.session_state.channel_status = 'initial'
+            
+            except Exception as e:
+                st.error(f"채널 업데이트 중 오류가 발생했습니다: {str(e)}")
+                st.session_state.channel_status = 'initial'
+
     st.markdown("---")
 
     st.subheader("저장된 채널 데이터 조회")
@@ -394,12 +424,13 @@ with tab_channel:
         st.session_state.found_data_channel = None
     
     try:
-        top_videos_df = get_top_videos_by_search_id('info_channel')
+        top_videos_df = load_top_videos('info_channel', 'channel_top_videos', ['search_keyword_ch', 'search_channel_ch', 'search_date_ch'])
         
         if not top_videos_df.empty:
             search_keyword = st.text_input("조회할 키워드를 입력하세요.", key='search_keyword_ch')
             search_channel = st.text_input("조회할 채널명을 입력하세요.", key='search_channel_ch')
             search_date = st.text_input("업로드 시점을 입력하세요. 연도-월-일 형태로 입력하세요. (예 2025-01-01)", key='search_date_ch')
+            top_videos_pager(top_videos_df, 'channel_top_videos', ['search_keyword_ch', 'search_channel_ch', 'search_date_ch'])
             
             filtered_df = top_videos_df.copy()
             
@@ -528,21 +559,24 @@ with tab_channel:
                 # 쇼츠와 롱폼 영상 분리해서 통계 표시
                 shorts_df = display_df[display_df['쇼츠'] == True]
                 longform_df = display_df[display_df['쇼츠'] == False]
+                split_stats = split_summary(display_df)
                 
                 col1, col2 = st.columns(2)
                 with col1:
                     st.subheader("쇼츠 영상")
-                    st.write(f"영상 수: {len(shorts_df)}")
-                    if not shorts_df.empty:
-                        st.write(f"평균 조회수: {shorts_df['조회수'].mean():.1f}")
-                        st.write(f"평균 좋아요: {shorts_df['좋아요'].mean():.1f}")
+                    st.write(f"영상 수: {split_stats['shorts']['count']}")
+                    if split_stats['shorts']['count']:
+                        st.write(f"평균 조회수: {split_stats['shorts']['mean_views']:.1f}")
+                        st.write(f"평균 좋아요: {split_stats['shorts']['mean_likes']:.1f}")
+                        st.write(f"평균 참여율: {split_stats['shorts']['mean_engagement_rate']:.2f}%")
                 
                 with col2:
                     st.subheader("롱폼 영상")
-                    st.write(f"영상 수: {len(longform_df)}")
-                    if not longform_df.empty:
-                        st.write(f"평균 조회수: {longform_df['조회수'].mean():.1f}")
-                        st.write(f"평균 좋아요: {longform_df['좋아요'].mean():.1f}")
+                    st.write(f"영상 수: {split_stats['longform']['count']}")
+                    if split_stats['longform']['count']:
+                        st.write(f"평균 조회수: {split_stats['longform']['mean_views']:.1f}")
+                        st.write(f"평균 좋아요: {split_stats['longform']['mean_likes']:.1f}")
+                        st.write(f"평균 참여율: {split_stats['longform']['mean_engagement_rate']:.2f}%")
                 
                 # 분석 섹션
                 st.subheader("채널 데이터 분석하기")
@@ -675,36 +709,31 @@ with tab_channel:
                         # 분석 수행 및 결과 표시
                         if st.session_state.shorts_analyzed_channel:
                             if st.session_state.shorts_analysis_result_channel is None:
-                                with st.spinner("쇼츠 영상 분석 중..."):
-                                    # 쇼츠 분석 수행
-                                    shorts_analysis = analyze_channel_video(openai_client, llm_option, display_df, is_shorts=True)
-                                    st.session_state.shorts_analysis_result_channel = shorts_analysis
+                                # 쇼츠 분석 수행 (생성되는 대로 표시)
+                                shorts_analysis = st.write_stream(analyze_channel_video_stream(openai_client, llm_option, display_df, is_shorts=True))
+                                st.session_state.shorts_analysis_result_channel = shorts_analysis
 
-                                    thumbnail_analysis_shorts = analyze_thumbnails(openai_client, display_df, is_shorts=True)
+                                with st.spinner("쇼츠 썸네일 분석 중..."):
+                                    thumbnail_analysis_shorts = run_thumbnail_analysis(display_df, is_shorts=True)
                                     st.session_state.shorts_thumbnail_analysis_channel = thumbnail_analysis_shorts
                                     
                                     # 분석 내용 저장
                                     save_video_analysis('analysis_channel', st.session_state.selected_search_id, True, shorts_analysis)  # save_video_analysis('channel_analysis', search_id_input, True, shorts_analysis)
                                     save_thumbnail_analysis(thumbnail_analysis_shorts, st.session_state.selected_search_id, True, display_df['채널URL'].iloc[0])  # save_thumbnail_analysis(thumbnail_analysis_shorts, search_id_input, True, display_df['채널URL'].iloc[0])
-                                    
-                                    st.success("쇼츠 영상 분석 완료 및 저장되었습니다!")
+                                
+                                st.success("쇼츠 영상 분석 완료 및 저장되었습니다!")
 
-                                    # 분석 완료 후 상태 초기화
-                                    st.session_state.shorts_analysis_status = 'initial'
-                            
-                            # 저장된 분석 결과 표시
-                            st.write(st.session_state.shorts_analysis_result_channel)
+                                # 분석 완료 후 상태 초기화
+                                st.session_state.shorts_analysis_status = 'initial'
+                            else:
+                                # 저장된 분석 결과 표시
+                                st.write(st.session_state.shorts_analysis_result_channel)
 
                             # 썸네일 분석 결과 표시
                             st.write("### 인기 썸네일 분석")
                             if isinstance(st.session_state.shorts_thumbnail_analysis_channel, list):
                                 for analysis in st.session_state.shorts_thumbnail_analysis_channel:
-                                    st.write(f"#### {analysis['제목']}")
-                                    cols = st.columns([1, 2])
-                                    with cols[0]:
-                                        st.image(analysis['썸네일'])
-                                    with cols[1]:
-                                        st.write(analysis['분석'])
+                                    show_thumbnail_analysis(analysis)
                             else:
                                 st.write(st.session_state.shorts_thumbnail_analysis_channel)
                 
@@ -837,35 +866,30 @@ with tab_channel:
                         # 분석 수행 및 결과 표시
                         if st.session_state.longform_analyzed_channel:
                             if st.session_state.longform_analysis_result_channel is None:
-                                with st.spinner("롱폼 영상 분석 중..."):
-                                    # 롱폼 분석 수행
-                                    longform_analysis = analyze_channel_video(openai_client, llm_option, display_df, is_shorts=False)
-                                    st.session_state.longform_analysis_result_channel = longform_analysis
-                                    
-                                    thumbnail_analysis_long = analyze_thumbnails(openai_client, display_df, is_shorts=False)
+                                # 롱폼 분석 수행 (생성되는 대로 표시)
+                                longform_analysis = st.write_stream(analyze_channel_video_stream(openai_client, llm_option, display_df, is_shorts=False))
+                                st.session_state.longform_analysis_result_channel = longform_analysis
+
+                                with st.spinner("롱폼 썸네일 분석 중..."):
+                                    thumbnail_analysis_long = run_thumbnail_analysis(display_df, is_shorts=False)
                                     st.session_state.longform_thumbnail_analysis_channel = thumbnail_analysis_long
 
                                     # 분석 내용 저장
                                     save_video_analysis('analysis_channel', st.session_state.selected_search_id, False, longform_analysis)  # save_video_analysis('channel_analysis', search_id_input, False, longform_analysis)
                                     save_thumbnail_analysis(thumbnail_analysis_long, st.session_state.selected_search_id, False, display_df['채널URL'].iloc[0])  # save_thumbnail_analysis(thumbnail_analysis_long, search_id_input, False, display_df['채널URL'].iloc[0])
-                                    
-                                    st.success("롱폼 영상 분석 완료 및 저장되었습니다!")
+                                
+                                st.success("롱폼 영상 분석 완료 및 저장되었습니다!")
 
-                                    # 분석 완료 후 상태 초기화
-                                    st.session_state.longform_analysis_status = 'initial'
-                            
-                            # 저장된 분석 결과 표시
-                            st.write(st.session_state.longform_analysis_result_channel)
+                                # 분석 완료 후 상태 초기화
+                                st.session_state.longform_analysis_status = 'initial'
+                            else:
+                                # 저장된 분석 결과 표시
+                                st.write(st.session_state.longform_analysis_result_channel)
 
                             st.write("### 인기 썸네일 분석")
                             if isinstance(st.session_state.longform_thumbnail_analysis_channel, list):
                                 for analysis in st.session_state.longform_thumbnail_analysis_channel:
-                                    st.write(f"#### {analysis['제목']}")
-                                    cols = st.columns([1, 2])
-                                    with cols[0]:
-                                        st.image(analysis['썸네일'])
-                                    with cols[1]:
-                                        st.write(analysis['분석'])
+                                    show_thumbnail_analysis(analysis)
                             else:
                                 st.write(st.session_state.longform_thumbnail_analysis_channel)
             else:
@@ -879,37 +903,7 @@ with tab_channel:
     
     try:
         st.subheader("쇼츠, 롱폼 동영상 분석 리스트")
-        
-        conn = connect_postgres()
-        cur = conn.cursor()
-
-        cur.execute("""
-        SELECT 
-            search_unique_id, is_shorts, channel_result, created_at
-        FROM 
-            analysis_channel
-        ORDER BY 
-            created_at DESC
-        """)
-
-        channel_results = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        channel_columns = ['검색ID', '쇼츠', '분석 내용', '생성일시']
-        channel_df = pd.DataFrame(channel_results, columns=channel_columns)
-        st.dataframe(
-            channel_df,
-            column_config={
-                "검색ID": st.column_config.Column(width="small"),
-                "쇼츠": st.column_config.Column(width="small"),
-                "분석 내용": st.column_config.TextColumn(width="large"),
-                "생성일시": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm")
-            },
-            hide_index=True,
-            use_container_width=True
-        )
+        show_video_analysis_list('analysis_channel', key='channel_analysis_list')
     except Exception as e:
         st.error(f"분석된 채널 리스트 조회 중 오류가 발생했습니다: {str(e)}")
 
@@ -1020,46 +1014,51 @@ with tab_keyword:
     if st.session_state.keyword_status == 'confirmed' and st.session_state.current_keyword:
         with st.spinner("키워드 정보를 가져오는 중..."):
             try:
+                run_mode = check_quota(estimate_keyword_run(max_results))
+                
                 # 검색 고유 ID 생성
                 pk_id = search_unique_id()
 
-                df = fetch_youtube_data(query, max_results)
+                # 자막, 쇼츠 여부, 댓글을 동영상별로 동시에 수집
+                progress_bar = st.progress(0)
+                df, timings = fetch_youtube_data_concurrent(
+                    query, max_results,
+                    include_comments=run_mode == 'full',
+                    on_progress=lambda done, total: progress_bar.progress(done / total)
+                )
+                st.caption(" / ".join(f"{stage} {seconds:.1f}초" for stage, seconds in timings.items()))
+                
+                engagement = summarize(df, FETCH_COLUMNS)
                 
                 st.subheader("📊 기본 통계")
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     st.metric("총 조회수", f"{df['views'].sum():,}")
                 with col2:
-                    st.metric("평균 좋아요", f"{int(df['likes'].mean()):,}")
+                    st.metric("평균 좋아요", f"{int(engagement['mean_likes']):,}")
                 with col3:
-                    st.metric("평균 댓글", f"{int(df['comments'].mean()):,}")
+                    st.metric("평균 댓글", f"{int(engagement['mean_comments']):,}")
                 
                 # 검색 결과를 데이터베이스에 저장
-                progress_bar = st.progress(0)
                 st.text("검색 결과를 데이터베이스에 저장 중...")
                 
-                # YouTube API 객체 생성 (댓글 정보를 가져오기 위함)
-                analyzer = YouTubeAnalyzer(YOUTUBE_API_KEY)
-                
-                # 각 동영상 정보 처리 및 저장
-                for i, (_, video) in enumerate(df.iterrows()):
+                # 각 동영상 정보 처리
+                records = []
+                for _, video in df.iterrows():
                     video_id = video['url'].split('v=')[1] if 'v=' in video['url'] else video['url'].split('/')[-1]
                     
-                    # 댓글 정보 가져오기
-                    comments = analyzer.get_top_comments(video_id, 3)
-                    
                     # channel_url 생성 (채널 이름으로부터)
                     channel_url = f"https://www.youtube.com/channel/{video_id}"
                     
-                    # 데이터베이스에 저장
-                    save_info(
-                        'info_keyword', pk_id, query, channel_url, video['channel'], video['subscribers'],
-                        video_id, video['title'], video['thumbnail'], video['views'], video['likes'], video['comments'], video['view_sub_ratio'],
-                        video['is_shorts'], video['1min_script'], video['publishedAt'], comments
-                    )
-                    
-                    # 진행 상황 업데이트
-                    progress_bar.progress((i + 1) / len(df))
+                    records.append(dict(
+                        search_unique_id=pk_id, keyword=query, channel_url=channel_url, channel_name=video['channel'], channel_subscribers=video['subscribers'],
+                        video_id=video_id, video_title=video['title'], video_thumbnail=video['thumbnail'], video_view_count=video['views'], video_like_count=video['likes'], 
+                        video_comment_count=video['comments'], video_view_subscriber_ratio=video['view_sub_ratio'],
+                        is_shorts=video['is_shorts'], transcript=video['1min_script'], published_at=video['publishedAt'], top_comments=video['top_comments']
+                    ))
+                
+                # 데이터베이스에 한 번에 저장
+                save_info_bulk('info_keyword', records)
                 
                 st.success(f"성공적으로 키워드 '{query}'에 대한 {len(df)}개의 동영상 데이터를 저장했습니다! (검색 ID: {pk_id})")
                 
@@ -1075,13 +1074,12 @@ with tab_keyword:
                 display_videos['쇼츠'] = display_videos['쇼츠'].map({True: '쇼츠', False: '롱폼'})
                 st.markdown(display_videos.to_html(escape=False, index=False), unsafe_allow_html=True)
                 
-                df['engagement_rate'] = (df['likes'] + df['comments']) / df['views'] * 100
                 st.subheader("📈 참여도 분석")
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.metric("평균 참여율", f"{df['engagement_rate'].mean():.2f}%")
+                    st.metric("평균 참여율", f"{engagement['mean_engagement_rate']:.2f}%")
                 with col2:
-                    st.metric("최고 참여율", f"{df['engagement_rate'].max():.2f}%")
+                    st.metric("최고 참여율", f"{engagement['max_engagement_rate']:.2f}%")
             except Exception as e:
                 st.error(f"오류가 발생했습니다: {str(e)}")
     
@@ -1111,12 +1109,13 @@ with tab_keyword:
     st.info("키워드별 조회수/구독자 수 비율이 가장 높은 동영상입니다. 아래 목록에서 분석하고 싶은 키워드의 '분석' 버튼을 클릭하세요.")
     
     try:
-        top_videos_df = get_top_videos_by_search_id('info_keyword')
+        top_videos_df = load_top_videos('info_keyword', 'keyword_top_videos', ['search_keyword_kw', 'search_channel_kw', 'search_date_kw'])
         
         if not top_videos_df.empty:
             search_keyword = st.text_input("조회할 키워드를 입력하세요.", key='search_keyword_kw')
             search_channel = st.text_input("조회할 채널명을 입력하세요.", key='search_channel_kw')
             search_date = st.text_input("업로드 시점을 입력하세요. 연도-월-일 형태로 입력하세요. (예 2025-01-01)", key='search_date_kw')
+            top_videos_pager(top_videos_df, 'keyword_top_videos', ['search_keyword_kw', 'search_channel_kw', 'search_date_kw'])
             
             filtered_df = top_videos_df.copy()
             
@@ -1270,21 +1269,24 @@ with tab_keyword:
                 # 쇼츠와 롱폼 영상 분리해서 통계 표시
                 shorts_df = display_df[display_df['쇼츠'] == True]
                 longform_df = display_df[display_df['쇼츠'] == False]
+                split_stats = split_summary(display_df)
                 
                 col1, col2 = st.columns(2)
                 with col1:
                     st.subheader("쇼츠 영상")
-                    st.write(f"영상 수: {len(shorts_df)}")
-                    if not shorts_df.empty:
-                        st.write(f"평균 조회수: {shorts_df['조회수'].mean():.1f}")
-                        st.write(f"평균 좋아요: {shorts_df['좋아요'].mean():.1f}")
+                    st.write(f"영상 수: {split_stats['shorts']['count']}")
+                    if split_stats['shorts']['count']:
+                        st.write(f"평균 조회수: {split_stats['shorts']['mean_views']:.1f}")
+                        st.write(f"평균 좋아요: {split_stats['shorts']['mean_likes']:.1f}")
+                        st.write(f"평균 참여율: {split_stats['shorts']['mean_engagement_rate']:.2f}%")
                 
                 with col2:
                     st.subheader("롱폼 영상")
-                    st.write(f"영상 수: {len(longform_df)}")
-                    if not longform_df.empty:
-                        st.write(f"평균 조회수: {longform_df['조회수'].mean():.1f}")
-                        st.write(f"평균 좋아요: {longform_df['좋아요'].mean():.1f}")
+                    st.write(f"영상 수: {split_stats['longform']['count']}")
+                    if split_stats['longform']['count']:
+                        st.write(f"평균 조회수: {split_stats['longform']['mean_views']:.1f}")
+                        st.write(f"평균 좋아요: {split_stats['longform']['mean_likes']:.1f}")
+                        st.write(f"평균 참여율: {split_stats['longform']['mean_engagement_rate']:.2f}%")
                 
                 # 분석 섹션
                 st.subheader("키워드 데이터 분석하기")
@@ -1417,36 +1419,31 @@ with tab_keyword:
                         # 분석 수행 및 결과 표시
                         if st.session_state.shorts_analyzed_keyword:
                             if st.session_state.shorts_analysis_result_keyword is None:
-                                with st.spinner("쇼츠 영상 분석 중..."):
-                                    # 쇼츠 분석 수행
-                                    shorts_analysis = analyze_keyword_video(openai_client, llm_option, display_df, is_shorts=True)
-                                    st.session_state.shorts_analysis_result_keyword = shorts_analysis
+                                # 쇼츠 분석 수행 (생성되는 대로 표시)
+                                shorts_analysis = st.write_stream(analyze_keyword_video_stream(openai_client, llm_option, display_df, is_shorts=True))
+                                st.session_state.shorts_analysis_result_keyword = shorts_analysis
 
-                                    thumbnail_analysis_shorts = analyze_thumbnails(openai_client, display_df, is_shorts=True)
+                                with st.spinner("쇼츠 썸네일 분석 중..."):
+                                    thumbnail_analysis_shorts = run_thumbnail_analysis(display_df, is_shorts=True)
                                     st.session_state.shorts_thumbnail_analysis_keyword = thumbnail_analysis_shorts
                                     
                                     # 분석 내용 저장
                                     save_video_analysis_keyword('analysis_keyword', st.session_state.selected_search_id_keyword, True, shorts_analysis)  # save_video_analysis('keyword_analysis', search_id_input, True, shorts_analysis)
                                     save_thumbnail_analysis(thumbnail_analysis_shorts, st.session_state.selected_search_id_keyword, True, display_df['채널URL'].iloc[0])  # save_thumbnail_analysis(thumbnail_analysis_shorts, search_id_input, True, display_df['채널URL'].iloc[0])
-                                    
-                                    st.success("쇼츠 영상 분석 완료 및 저장되었습니다!")
+                                
+                                st.success("쇼츠 영상 분석 완료 및 저장되었습니다!")
 
-                                    # 분석 완료 후 상태 초기화
-                                    st.session_state.shorts_analysis_status = 'initial'
-                            
-                            # 저장된 분석 결과 표시
-                            st.write(st.session_state.shorts_analysis_result_keyword)
+                                # 분석 완료 후 상태 초기화
+                                st.session_state.shorts_analysis_status = 'initial'
+                            else:
+                                # 저장된 분석 결과 표시
+                                st.write(st.session_state.shorts_analysis_result_keyword)
 
                             # 썸네일 분석 결과 표시
                             st.write("### 인기 썸네일 분석")
                             if isinstance(st.session_state.shorts_thumbnail_analysis_keyword, list):
                                 for analysis in st.session_state.shorts_thumbnail_analysis_keyword:
-                                    st.write(f"#### {analysis['제목']}")
-                                    cols = st.columns([1, 2])
-                                    with cols[0]:
-                                        st.image(analysis['썸네일'])
-                                    with cols[1]:
-                                        st.write(analysis['분석'])
+                                    show_thumbnail_analysis(analysis)
                             else:
                                 st.write(st.session_state.shorts_thumbnail_analysis_keyword)
                 
@@ -1579,36 +1576,31 @@ with tab_keyword:
                         # 분석 수행 및 결과 표시
                         if st.session_state.longform_analyzed_keyword:
                             if st.session_state.longform_analysis_result_keyword is None:
-                                with st.spinner("롱폼 영상 분석 중..."):
-                                    # 롱폼 분석 수행
-                                    longform_analysis = analyze_keyword_video(openai_client, llm_option, display_df, is_shorts=False)
-                                    st.session_state.longform_analysis_result_keyword = longform_analysis
+                                # 롱폼 분석 수행 (생성되는 대로 표시)
+                                longform_analysis = st.write_stream(analyze_keyword_video_stream(openai_client, llm_option, display_df, is_shorts=False))
+                                st.session_state.longform_analysis_result_keyword = longform_analysis
 
-                                    thumbnail_analysis_long = analyze_thumbnails(openai_client, display_df, is_shorts=False)
+                                with st.spinner("롱폼 썸네일 분석 중..."):
+                                    thumbnail_analysis_long = run_thumbnail_analysis(display_df, is_shorts=False)
                                     st.session_state.longform_thumbnail_analysis_keyword = thumbnail_analysis_long
                                     
                                     # 분석 내용 저장
                                     save_video_analysis_keyword('analysis_keyword', st.session_state.selected_search_id_keyword, False, longform_analysis)  # save_video_analysis('keyword_analysis', search_id_input, False, longform_analysis)
                                     save_thumbnail_analysis(thumbnail_analysis_long, st.session_state.selected_search_id_keyword, False, display_df['채널URL'].iloc[0])  # save_thumbnail_analysis(thumbnail_analysis_long, search_id_input, False, display_df['채널URL'].iloc[0])
-                                    
-                                    st.success("롱폼 영상 분석 완료 및 저장되었습니다!")
+                                
+                                st.success("롱폼 영상 분석 완료 및 저장되었습니다!")
 
-                                    # 분석 완료 후 상태 초기화
-                                    st.session_state.longform_analysis_status = 'initial'
-                            
-                            # 저장된 분석 결과 표시
-                            st.write(st.session_state.longform_analysis_result_keyword)
+                                # 분석 완료 후 상태 초기화
+                                st.session_state.longform_analysis_status = 'initial'
+                            else:
+                                # 저장된 분석 결과 표시
+                                st.write(st.session_state.longform_analysis_result_keyword)
 
                             # 썸네일 분석 결과 표시
                             st.write("### 인기 썸네일 분석")
                             if isinstance(st.session_state.longform_thumbnail_analysis_keyword, list):
                                 for analysis in st.session_state.longform_thumbnail_analysis_keyword:
-                                    st.write(f"#### {analysis['제목']}")
-                                    cols = st.columns([1, 2])
-                                    with cols[0]:
-                                        st.image(analysis['썸네일'])
-                                    with cols[1]:
-                                        st.write(analysis['분석'])
+                                    show_thumbnail_analysis(analysis)
                             else:
                                 st.write(st.session_state.longform_thumbnail_analysis_keyword)
             else:
@@ -1623,37 +1615,7 @@ with tab_keyword:
 
     try:
         st.subheader("쇼츠, 롱폼 동영상 분석 리스트")
-        
-        conn = connect_postgres()
-        cur = conn.cursor()
-
-        cur.execute("""
-        SELECT 
-            search_unique_id, is_shorts, keyword_result, created_at
-        FROM 
-            analysis_keyword
-        ORDER BY
-            created_at DESC
-        """)
-
-        keyword_results = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        keyword_columns = ['검색ID', '쇼츠', '분석 내용', '생성일시']
-        keyword_df = pd.DataFrame(channel_results, columns=keyword_columns)
-        st.dataframe(
-            keyword_df,
-            column_config={
-                "검색ID": st.column_config.Column(width="small"),
-                "쇼츠": st.column_config.Column(width="small"),
-                "분석 내용": st.column_config.TextColumn(width="large"),
-                "생성일시": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm")
-            },
-            hide_index=True,
-            use_container_width=True
-        )
+        show_video_analysis_list('analysis_keyword', key='keyword_analysis_list')
     except Exception as e:
         st.error(f"분석된 키워드 리스트 조회 중 오류가 발생했습니다: {str(e)}")
 
@@ -1710,45 +1672,24 @@ with tab_blog:
         failed_urls = []
         saved_ids = []
         
-        # 각 URL 처리
-        for i, url in enumerate(valid_urls):
-            try:
-                with st.spinner(f"블로그 요약 중... ({i+1}/{len(valid_urls)})"):
-                    extracted_data = blog_content(url)  # 블로그 내용 추출
-                    
-                    blog_summary = blog_summarizer(openai_client, llm_option, extracted_data['content'])  # 블로그 요약
-                    
-                    # DB에 저장
-                    conn = connect_postgres()
-                    cur = conn.cursor()
-                    
-                    cur.execute("""INSERT INTO blog_summary (keyword, url, summary) VALUES (%s, %s, %s) RETURNING id""", (analysis_keyword, url, blog_summary))
-                    
-                    inserted_id = cur.fetchone()[0]
-                    saved_ids.append(inserted_id)
-                    
-                    conn.commit()
-                    cur.close()
-                    conn.close()
-                    
-                    # 성공 카운트 증가
-                    success_count += 1
-                
-            except Exception as e:
-                # 실패한 URL 기록
-                failed_urls.append((url, str(e)))
-                
-                # 에러 발생 시 DB 연결 닫기
-                try:
-                    if 'conn' in locals() and conn:
-                        conn.rollback()
-                        cur.close()
-                        conn.close()
-                except:
-                    pass
-            
-            # 진행 상황 업데이트
-            progress_bar.progress((i + 1) / len(valid_urls))
+        # 모든 URL을 동시에 추출/요약 (요약 요청 수는 제한됨)
+        summaries = [None] * len(valid_urls)
+        with st.spinner(f"블로그 {len(valid_urls)}개 요약 중..."):
+            for done, (i, result) in enumerate(iter_blog_summaries(openai_client, llm_option, valid_urls), 1):
+                summaries[i] = result
+                progress_bar.progress(done / len(valid_urls))  # 진행 상황 업데이트
+        
+        for result in summaries:
+            if result['error'] is not None:
+                failed_urls.append((result['url'], result['error']))  # 실패한 URL 기록
+        
+        # 성공한 요약을 한 번에 DB에 저장
+        succeeded = [(result['url'], result['summary']) for result in summaries if result['error'] is None]
+        try:
+            saved_ids = save_blog_summaries(analysis_keyword, succeeded)
+            success_count = len(saved_ids)
+        except Exception as e:
+            failed_urls.extend((url, f"DB 저장 실패: {str(e)}") for url, _ in succeeded)
         
         # 분석 완료 후 결과 표시
         with results_container:
@@ -1793,34 +1734,10 @@ with tab_blog:
     
     # 모든 키워드별 블로그 요약 데이터 조회
     try:
-        conn = connect_postgres()
-        cur = conn.cursor()
+        # 키워드별로 그룹화하여 첫 번째 블로그 요약만 가져오기 (요약은 미리보기만, 전체 내용은 선택 시 조회)
+        df = list_first_blog_summaries()
         
-        # 키워드별로 그룹화하여 첫 번째 블로그 요약만 가져오기
-        cur.execute("""
-        WITH RankedSummaries AS (
-            SELECT id, keyword, summary, url, ROW_NUMBER() OVER (PARTITION BY keyword ORDER BY id) as rn
-            FROM blog_summary
-        )
-        SELECT id, keyword, summary, url FROM RankedSummaries
-        WHERE rn = 1
-        ORDER BY keyword
-        """)
-        
-        keyword_summaries = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        if keyword_summaries:
-            # 테이블용 데이터 준비
-            table_data = []
-            for summary_id, keyword, summary, url in keyword_summaries:
-                # 요약 텍스트가 너무 길면 잘라내기
-                short_summary = summary[:100] + "..." if len(summary) > 100 else summary
-                table_data.append({"ID": summary_id, "키워드": keyword, "요약 미리보기": short_summary, "URL": url})
-            
-            # 데이터프레임으로 변환
-            df = pd.DataFrame(table_data)
+        if not df.empty:
 
             col1, col2 = st.columns([1, 7])
             
@@ -1832,18 +1749,8 @@ with tab_blog:
                         # 세션 상태 설정
                         st.session_state.current_blog_keyword = load_keyword
                         
-                        # 데이터베이스 확인
-                        conn = connect_postgres()
-                        cur = conn.cursor()
-                        
-                        cur.execute("""SELECT COUNT(*) FROM blog_int_summary WHERE keyword = %s """, (load_keyword,))
-                        count = cur.fetchone()[0]
-                        
-                        cur.close()
-                        conn.close()
-                        
-                        # 결과에 따라 상태 설정
-                        if count > 0:
+                        # 통합 요약된 적 있는지 확인
+                        if any(keyword == load_keyword for _, keyword in list_blog_int_summaries()):
                             st.session_state.blog_keyword_status = 'confirm_needed'
                         else:
                             st.session_state.blog_keyword_status = 'confirmed'
@@ -1869,13 +1776,13 @@ with tab_blog:
             # 상세 내용 보기 섹션
             selected_id = st.selectbox(
                 "상세 내용을 확인할 키워드 ID를 선택하세요:",
-                options=[row[0] for row in keyword_summaries],
+                options=[int(summary_id) for summary_id in df['ID']],
                 format_func=lambda x: f"ID: {x} - 키워드: {df[df['ID']==x]['키워드'].values[0]}"
             )
             
             if selected_id:
                 # 선택한 ID의 요약 내용 표시
-                selected_summary = next((s for s_id, k, s, u in keyword_summaries if s_id == selected_id), None)
+                selected_summary = get_blog_summary(selected_id)
                 if selected_summary:
                     with st.expander("블로그 요약 내용", expanded=True):
                         st.markdown(selected_summary)
@@ -1919,19 +1826,11 @@ with tab_blog:
     # 기존 분석 결과 표시
     if st.session_state.blog_keyword_status == 'show_existing':
         try:
-            conn = connect_postgres()
-            cur = conn.cursor()
-            
-            cur.execute("""
-            SELECT search_unique_id, int_summary
-            FROM blog_int_summary 
-            WHERE keyword = %s 
-            """, (st.session_state.current_blog_keyword,))
-            
-            existing_results = cur.fetchall()
-            
-            cur.close()
-            conn.close()
+            existing_results = [
+                (search_id, get_blog_int_summary(search_id))
+                for search_id, keyword in list_blog_int_summaries()
+                if keyword == st.session_state.current_blog_keyword
+            ]
             
             if existing_results:
                 st.subheader(f"키워드 '{st.session_state.current_blog_keyword}'의 기존 통합 분석 결과")
@@ -2022,6 +1921,7 @@ with tab_blog:
                     """, (search_id, load_keyword, integrated_summary))
                     
                     conn.commit()
+                    invalidate('blog_int_summary')
                     
                     # 성공 메시지 표시
                     st.success(f"{len(summaries)}개의 블로그 요약이 성공적으로 통합 분석되었습니다.")
@@ -2058,15 +1958,8 @@ with tab_content:
         
         # 블로그 키워드 리스트
         try:
-            conn = connect_postgres()
-            cur = conn.cursor()
-            
-            # 모든 통합 블로그 요약 데이터 조회
-            cur.execute("""SELECT search_unique_id, keyword FROM blog_int_summary""")
-            
-            blog_summaries = cur.fetchall()
-            cur.close()
-            conn.close()
+            # 모든 통합 블로그 요약 데이터 조회 (ID, 키워드만)
+            blog_summaries = list_blog_int_summaries()
             
             # 데이터 표시
             if blog_summaries:
@@ -2095,17 +1988,11 @@ with tab_content:
                 
                 if selected_id:
                     # 선택한 ID의 통합 분석 내용 가져오기
-                    conn = connect_postgres()
-                    cur = conn.cursor()
-                    cur.execute("""SELECT int_summary FROM blog_int_summary WHERE search_unique_id = %s""", (selected_id,))
-                    
-                    summary_result = cur.fetchone()
-                    cur.close()
-                    conn.close()
+                    summary_result = get_blog_int_summary(selected_id)
                     
                     if summary_result:
                         with st.expander("블로그 통합 분석 내용", expanded=True):
-                            st.markdown(summary_result[0])
+                            st.markdown(summary_result)
             else:
                 st.info("저장된 블로그 통합 분석 내용이 없습니다.")
         
@@ -2127,6 +2014,7 @@ with tab_content:
         yt_button = st.button("유튜브 콘텐츠 만들기", type="primary")
         insta_button = st.button("인스타 콘텐츠 만들기", type="primary")
         thrd_button = st.button("쓰레드 콘텐츠 만들기", type="primary")
+        all_button = st.button("전체 플랫폼 콘텐츠 한 번에 만들기", type="primary")
 
         # 유튜브 콘텐츠 생성
         if yt_button and blog_id:
@@ -2222,26 +2110,6 @@ with tab_content:
                     # 블로그 통합 요약 내용 불러오기
                     cur.execute("""SELECT int_summary, keyword FROM blog_int_summary WHERE search_unique_id = %s""", (blog_id,))
                     result = cur.fetchone()
-
-                    # 긍정적인 평가 내용 불러오기
-                    cur.execute("""
-                    SELECT score, feedback, title, thumbnail, script
-                    FROM feedback_yt
-                    WHERE platform = 'YouTube' AND score >= 7
-                    ORDER BY score DESC
-                    LIMIT 3
-                    """)
-                    high_feedback = cur.fetchall()
-
-                    # 부정적인 평가 내용 불러오기
-                    cur.execute("""
-                    SELECT score, feedback, title, thumbnail, script
-                    FROM feedback_yt
-                    WHERE platform = 'YouTube' AND score <= 4
-                    ORDER BY score ASC
-                    LIMIT 3
-                    """)
-                    low_feedback = cur.fetchall()
                     
                     cur.close()
                     conn.close()
@@ -2254,26 +2122,7 @@ with tab_content:
                         st.stop()
 
                     # 피드백 데이터 요약 및 통합
-                    high_feedback_summary = "좋은 평가를 받은 콘텐츠의 특징:\n"
-                    if high_feedback:
-                        # 높은 점수 피드백의 주요 내용 통합
-                        for i, (score, feedback, title, _, _) in enumerate(high_feedback):
-                            high_feedback_summary += f"{i+1}. 점수 {score}/10: {feedback}\n"
-                            
-                        # 좋은 예시 제목 추가
-                        high_feedback_summary += "\n좋은 평가를 받은 제목 예시:\n"
-                        for i, (_, _, title, _, _) in enumerate(high_feedback[:3]):  # 상위 3개만
-                            high_feedback_summary += f"- {title}\n"
-                    else:
-                        high_feedback_summary += "아직 충분한 데이터가 없습니다.\n"
-                    
-                    low_feedback_summary = "개선이 필요한 콘텐츠의 특징 (피해야 할 점):\n"
-                    if low_feedback:
-                        # 낮은 점수 피드백의 주요 내용 통합
-                        for i, (score, feedback, _, _, _) in enumerate(low_feedback):
-                            low_feedback_summary += f"{i+1}. 점수 {score}/10: {feedback}\n"
-                    else:
-                        low_feedback_summary += "아직 충분한 데이터가 없습니다.\n"
+                    high_feedback_summary, low_feedback_summary = youtube_feedback_summaries()
 
                     prompt = f"""
     새로 만들 유튜브 동영상을 위한 제목, 썸네일 이미지 내용, 첫 2분 스크립트 내용을 생성해야 합니다.
@@ -2310,79 +2159,16 @@ with tab_content:
     [스크립트]
     첫 2분 스크립트 내용
     """
-                    content = openai_client.chat.completions.create(
-                        model=llm_option, 
-                        messages=[
-                            {"role": "system", "content": "당신은 카피라이팅 법칙을 따라 수집된 데이터에 기반하여 유튜브 동영상 컨텐츠를 만드는 전문가입니다."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.3, 
-                        max_tokens=1500, 
-                        # n=3, 
-                    )
-                    
-                    result_yt = content.choices[0].message.content.strip()
+                    print("유튜브 콘텐츠 프롬프트 내용\n\n", prompt)
+                    result_yt, content_yt = stream_blog_content('youtube', blog_id, keyword, [
+                        {"role": "system", "content": "당신은 카피라이팅 법칙을 따라 수집된 데이터에 기반하여 유튜브 동영상 컨텐츠를 만드는 전문가입니다."},
+                        {"role": "user", "content": prompt}
+                    ])
                     
                     # 세션 상태에 결과 저장 (화면 표시용)
                     st.session_state.generated_content_yt = result_yt
                     st.session_state.content_generated_yt = True
-
-                    try:
-                        print("유튜브 콘텐츠 프롬프트 내용\n\n", prompt)
-                        parts = result_yt.split("\n\n")
-                        
-                        # 섹션의 시작 인덱스 찾기
-                        title_start = result_yt.find("[제목]")
-                        thumbnail_start = result_yt.find("[썸네일]")
-                        script_start = result_yt.find("[스크립트]")
-                
-                        # 각 섹션의 끝 인덱스 결정
-                        title_end = thumbnail_start if thumbnail_start != -1 else script_start if script_start != -1 else len(result_yt)
-                        thumbnail_end = script_start if script_start != -1 else len(result_yt)
-                        script_end = len(result_yt)
-                        
-                        # 섹션 내용 추출
-                        title = ""
-                        thumbnail = ""
-                        script = ""
-                
-                        if title_start != -1:
-                            title_section = result_yt[title_start:title_end].strip()
-                            title_lines = title_section.split('\n')[1:]  # 첫 줄([제목]) 제외
-                            title = '\n'.join(title_lines).strip()
-                        
-                        if thumbnail_start != -1:
-                            thumbnail_section = result_yt[thumbnail_start:thumbnail_end].strip()
-                            thumbnail_lines = thumbnail_section.split('\n')[1:]  # 첫 줄([썸네일]) 제외
-                            thumbnail = '\n'.join(thumbnail_lines).strip()
-                        
-                        if script_start != -1:
-                            script_section = result_yt[script_start:script_end].strip()
-                            script_lines = script_section.split('\n')[1:]  # 첫 줄([스크립트]) 제외
-                            script = '\n'.join(script_lines).strip()
-                        
-                        # 생성한 유튜브 컨텐츠 정보를 DB에 저장
-                        try:
-                            conn = connect_postgres()
-                            cur = conn.cursor()
-                                
-                            # 생성된 콘텐츠 저장
-                            cur.execute("""
-                                INSERT INTO content_youtube (blog_id, keyword, title, thumbnail, script)
-                                VALUES (%s, %s, %s, %s, %s)
-                                """, (blog_id, keyword, title, thumbnail, script))
-                            
-                            conn.commit()
-                            cur.close()
-                            conn.close()
-                            
-                            st.success("유튜브 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
-
-                        except Exception as e:
-                            st.error(f"유튜브 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
-                    
-                    except Exception as e:
-                        st.error(f"유튜브 생성된 콘텐츠 파싱 중 오류가 발생했습니다: {str(e)}")
+                    report_sections(content_yt, 'youtube', '유튜브')
                 
                 except Exception as e:
                     st.error(f"유튜브 콘텐츠 생성 중 오류가 발생했습니다: {str(e)}")
@@ -2528,63 +2314,15 @@ with tab_content:
 
         [해시 태그]
         """
-                    content_ig = openai_client.chat.completions.create(
-                        model=llm_option, 
-                        messages=[
-                            {"role": "system", "content": "당신은 카피라이팅 법칙을 따라 수집된 데이터에 기반하여 인스타그램 컨텐츠를 만드는 전문가입니다."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.3,
-                        max_tokens=1500
-                    )
-                    
-                    result_ig = content_ig.choices[0].message.content.strip()
+                    result_ig, content_ig = stream_blog_content('instagram', blog_id, keyword, [
+                        {"role": "system", "content": "당신은 카피라이팅 법칙을 따라 수집된 데이터에 기반하여 인스타그램 컨텐츠를 만드는 전문가입니다."},
+                        {"role": "user", "content": prompt}
+                    ])
                     
                     # 세션 상태에 결과 저장 (화면 표시용)
                     st.session_state.generated_content_ig = result_ig
                     st.session_state.content_generated_ig = True
-
-                    try:
-                        parts = result_ig.split("\n\n")
-                        
-                        pics = ""
-                        caption = ""
-                        hashtags = ""
-                            
-                        # 각 부분 추출
-                        for i, part in enumerate(parts):
-                            if part.startswith("[사진]"):
-                                pics_lines = part.split("\n")[1:]
-                                pics = "\n".join(pics_lines).strip()
-                            elif part.startswith("[게시글]"):
-                                caption_lines = part.split("\n")[1:]
-                                caption = "\n".join(caption_lines).strip()
-                            elif part.startswith("[해시 태그]"):
-                                hashtags_lines = part.split("\n")[1:]
-                                hashtags = "\n".join(hashtags_lines).strip()
-                        
-                        # 생성한 인스타그램 컨텐츠 정보를 DB에 저장
-                        try:
-                            conn = connect_postgres()
-                            cur = conn.cursor()
-                                
-                            # 생성된 콘텐츠 저장
-                            cur.execute("""
-                                INSERT INTO content_instagram (blog_id, keyword, pics, caption, hashtags)
-                                VALUES (%s, %s, %s, %s, %s)
-                                """, (blog_id, keyword, pics, caption, hashtags))
-                            
-                            conn.commit()
-                            cur.close()
-                            conn.close()
-                            
-                            st.success("인스타그램 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
-
-                        except Exception as e:
-                            st.error(f"인스타그램 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
-                    
-                    except Exception as e:
-                        st.error(f"생성된 인스타그램 콘텐츠 파싱 중 오류가 발생했습니다: {str(e)}")
+                    report_sections(content_ig, 'instagram', '인스타그램')
                 
                 except Exception as e:
                     st.error(f"인스타그램 콘텐츠 생성 중 오류가 발생했습니다: {str(e)}")
@@ -2719,66 +2457,61 @@ with tab_content:
     [태그]
     """
                     
-                    content_th = openai_client.chat.completions.create(
-                        model=llm_option, 
-                        messages=[
-                            {"role": "system", "content": "당신은 수집된 데이터에 기반하여 쓰레드 콘텐츠를 만드는 전문가입니다."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.3,
-                        max_tokens=1500
-                    )
-                    
-                    result_th = content_th.choices[0].message.content.strip()
+                    result_th, content_th = stream_blog_content('threads', blog_id, keyword, [
+                        {"role": "system", "content": "당신은 수집된 데이터에 기반하여 쓰레드 콘텐츠를 만드는 전문가입니다."},
+                        {"role": "user", "content": prompt}
+                    ])
                     
                     # 세션 상태에 결과 저장 (화면 표시용)
                     st.session_state.generated_content_th = result_th
                     st.session_state.content_generated_th = True
-
-                    try:
-                        parts = result_th.split("\n\n")
+                    report_sections(content_th, 'threads', '스레드')
+                except Exception as e:
+                    st.error(f"콘텐츠 생성 중 오류가 발생했습니다: {str(e)}")
+        
+        
+        # 유튜브/인스타그램/스레드 콘텐츠를 한 번의 요청으로 생성
+        if all_button and blog_id:
+            with st.spinner('유튜브, 인스타그램, 스레드 콘텐츠를 한 번에 생성하는 중입니다...'):
+                try:
+                    conn = connect_postgres()
+                    cur = conn.cursor()
+                    cur.execute("""SELECT int_summary, keyword FROM blog_int_summary WHERE search_unique_id = %s""", (blog_id,))
+                    
+                    result = cur.fetchone()
+                    cur.close()
+                    conn.close()
+                    
+                    if result:
+                        blog_summary = result[0]
+                        keyword = result[1]
                         
-                        post = ""
-                        pics = ""
-                        tags = ""
-                            
-                        # 각 부분 추출
-                        for i, part in enumerate(parts):
-                            if part.startswith("[게시글]"):  # 제목 문자열 추출 (첫 줄은 [게시글]이므로 제외)
-                                post_lines = part.split("\n")[1:]
-                                post = "\n".join(post_lines).strip()
-                            elif part.startswith("[사진]"):  # 썸네일 문자열 추출 (첫 줄은 [사진]이므로 제외)
-                                pics_lines = part.split("\n")[1:]
-                                pics = "\n".join(pics_lines).strip()
-                            elif part.startswith("[태그]"):  # 스크립트 문자열 추출 (첫 줄은 [태그]이므로 제외)
-                                tags_lines = part.split("\n")[1:]
-                                tags = "\n".join(tags_lines).strip()
+                        high_feedback_summary, low_feedback_summary = youtube_feedback_summaries()
+                        contents = generate_all_platforms(
+                            openai_client, "블로그 통합 요약 내용", blog_summary, keyword, llm_option,
+                            notes=f"유튜브 콘텐츠 사용자 피드백 분석:\n{high_feedback_summary}\n{low_feedback_summary}"
+                        )
+                        
+                        # 세션 상태에 결과 저장 (화면 표시용)
+                        st.session_state.generated_content_yt = format_content(contents['youtube'], 'youtube')
+                        st.session_state.generated_content_ig = format_content(contents['instagram'], 'instagram')
+                        st.session_state.generated_content_th = format_content(contents['threads'], 'threads')
+                        st.session_state.content_generated_yt = True
+                        st.session_state.content_generated_ig = True
+                        st.session_state.content_generated_th = True
                         
-                        # 생성한 쓰레드 컨텐츠 정보를 DB에 저장
                         try:
-                            conn = connect_postgres()
-                            cur = conn.cursor()
-                            
-                            # 생성된 콘텐츠 저장
-                            cur.execute("""
-                                INSERT INTO content_threads (blog_id, keyword, post, pics, tags)
-                                VALUES (%s, %s, %s, %s, %s)
-                                """, (blog_id, keyword, post, pics, tags))
-                            
-                            conn.commit()
-                            cur.close()
-                            conn.close()
-                            
-                            st.success("콘텐츠가 성공적으로 생성되고 저장되었습니다!")
-
+                            save_generated_contents('blog', blog_id, keyword, contents)
+                            st.success("유튜브, 인스타그램, 스레드 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
                         except Exception as e:
                             st.error(f"콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
-                    
-                    except Exception as e:
-                        st.error(f"생성된 콘텐츠 파싱 중 오류가 발생했습니다: {str(e)}")
+                    else:
+                        st.error(f"입력한 블로그 ID '{blog_id}'를 찾을 수 없습니다.")
+                
                 except Exception as e:
                     st.error(f"콘텐츠 생성 중 오류가 발생했습니다: {str(e)}")
-        
+        elif all_button and not blog_id:
+            st.warning("블로그 요약 ID를 입력해주세요.")
         
         # 생성된 유튜브 콘텐츠 표시
         if st.session_state.get('content_generated_yt', False):
@@ -2815,22 +2548,11 @@ with tab_content:
         with st.expander("유튜브 콘텐츠 품질 평가"):
             st.subheader("유튜브 콘텐츠 품질 평가")
             try:
-                conn = connect_postgres()
-                cur = conn.cursor()
-                
-                # 모든 유튜브 콘텐츠 조회
-                cur.execute("""
-                SELECT id, keyword, title, thumbnail, script 
-                FROM content_youtube 
-                ORDER BY created_at DESC
-                """)
-                
-                youtube_contents = cur.fetchall()
-                cur.close()
-                conn.close()
+                # 유튜브 콘텐츠 조회 (페이지 단위, 스크립트는 미리보기만)
+                page = select_page('content_youtube', key='youtube_contents_page')
+                df_contents = list_content_youtube(page)
                 
-                if youtube_contents:
-                    df_contents = pd.DataFrame(youtube_contents, columns=['ID', '키워드', '제목', '썸네일', '스크립트'])
+                if not df_contents.empty:
                     st.dataframe(
                         df_contents,
                         column_config={
@@ -2838,7 +2560,7 @@ with tab_content:
                             "키워드": st.column_config.Column(width="small"),
                             "제목": st.column_config.Column(width="large"),
                             "썸네일": st.column_config.Column(width="large"),
-                            "스크립트": st.column_config.Column(width="large"),
+                            "스크립트 미리보기": st.column_config.Column(width="large"),
                         },
                         hide_index=True,
                         use_container_width=True
@@ -3069,200 +2791,63 @@ with tab_content:
         yt_button = st.button("유튜브 콘텐츠 만들기", type="primary", key='pdf_yt')
         insta_button = st.button("인스타 콘텐츠 만들기", type="primary", key='pdf_ig')
         thrd_button = st.button("쓰레드 콘텐츠 만들기", type="primary", key='pdf_th')
+        all_button = st.button("전체 플랫폼 콘텐츠 한 번에 만들기", type="primary", key='pdf_all')
 
         if pdf_file is not None:
-            if yt_button:
-                with st.spinner("유튜브 콘텐츠 생성 중..."):
-                    gen_content = generate_from_pdf2youtube(openai_client, pdf_text, keyword, llm_option)
-                
-                st.markdown("### 생성된 유튜브 콘텐츠")
-                st.text(gen_content)
-
+            if yt_button or insta_button or thrd_button:
+                platform, label, generate = (
+                    ('youtube', '유튜브', generate_from_pdf2youtube) if yt_button else
+                    ('instagram', '인스타그램', generate_from_pdf2instagram) if insta_button else
+                    ('threads', '스레드', generate_from_pdf2threads)
+                )
                 try:
-                    # 섹션의 시작 인덱스 찾기
-                    title_start = gen_content.find("[제목]")
-                    thumbnail_start = gen_content.find("[썸네일]")
-                    script_start = gen_content.find("[스크립트]")
-                    
-                    # 각 섹션의 끝 인덱스 결정
-                    title_end = thumbnail_start if thumbnail_start != -1 else script_start if script_start != -1 else len(gen_content)
-                    thumbnail_end = script_start if script_start != -1 else len(gen_content)
-                    script_end = len(gen_content)
-                        
-                    title = ""
-                    thumbnail = ""
-                    script = ""
-
-                    if title_start != -1:
-                        title_section = gen_content[title_start:title_end].strip()
-                        title_lines = title_section.split('\n')[1:]  # 첫 줄([제목]) 제외
-                        title = '\n'.join(title_lines).strip()
+                    with st.spinner(f"{label} 콘텐츠 생성 중..."):
+                        content = generate(openai_client, pdf_text, keyword, llm_option)
                     
-                    if thumbnail_start != -1:
-                        thumbnail_section = gen_content[thumbnail_start:thumbnail_end].strip()
-                        thumbnail_lines = thumbnail_section.split('\n')[1:]  # 첫 줄([썸네일]) 제외
-                        thumbnail = '\n'.join(thumbnail_lines).strip()
+                    st.markdown(f"### 생성된 {label} 콘텐츠")
+                    st.text(format_content(content, platform))
                     
-                    if script_start != -1:
-                        script_section = gen_content[script_start:script_end].strip()
-                        script_lines = script_section.split('\n')[1:]  # 첫 줄([스크립트]) 제외
-                        script = '\n'.join(script_lines).strip()
-
-                    # 생성한 유튜브 컨텐츠 정보를 DB에 저장
+                    # 생성한 콘텐츠 정보를 DB에 저장
                     try:
-                        conn = connect_postgres()
-                        cur = conn.cursor()
-                            
-                        # 생성된 콘텐츠 저장
-                        cur.execute("""
-                            INSERT INTO pdf2youtube (pdf_name, keyword, title, thumbnail, script)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """, (pdf_name, keyword, title, thumbnail, script))
-                        
-                        conn.commit()
-                        cur.close()
-                        conn.close()
-                        
-                        st.success("유튜브 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
-
+                        save_generated_content('pdf', platform, pdf_name, keyword, content)
+                        report_sections(content, platform, label)
                     except Exception as e:
-                            st.error(f"유튜브 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
-                    
-                except Exception as e:
-                    st.error(f"유튜브 생성된 콘텐츠 파싱 중 오류가 발생했습니다: {str(e)}")
-            
-            elif insta_button:
-                with st.spinner("인스타 콘텐츠 생성 중..."):
-                    gen_content = generate_from_pdf2instagram(openai_client, pdf_text, keyword, llm_option)
+                        st.error(f"{label} 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
                 
-                st.markdown("### 생성된 인스타그램 콘텐츠")
-                st.text(gen_content)
-
-                try:
-                    # 섹션의 시작 인덱스 찾기
-                    pics_start = gen_content.find("[사진]")
-                    caption_start = gen_content.find("[게시글]")
-                    hashtags_start = gen_content.find("[해시 태그]")
-                    
-                    # 각 섹션의 끝 인덱스 결정
-                    pics_end = caption_start if caption_start != -1 else hashtags_start if hashtags_start != -1 else len(gen_content)
-                    caption_end = hashtags_start if hashtags_start != -1 else len(gen_content)
-                    hashtags_end = len(gen_content)
-                    
-                    pics = ""
-                    caption = ""
-                    hashtags = ""
-
-                    if pics_start != -1:
-                        pics_section = gen_content[pics_start:pics_end].strip()
-                        pics_lines = pics_section.split('\n')[1:]  # 첫 줄([제목]) 제외
-                        pics = '\n'.join(pics_lines).strip()
-                    
-                    if caption_start != -1:
-                        caption_section = gen_content[caption_start:caption_end].strip()
-                        caption_lines = caption_section.split('\n')[1:]  # 첫 줄([썸네일]) 제외
-                        caption = '\n'.join(caption_lines).strip()
-                    
-                    if hashtags_start != -1:
-                        hashtags_section = gen_content[hashtags_start:hashtags_end].strip()
-                        hashtags_lines = hashtags_section.split('\n')[1:]  # 첫 줄([스크립트]) 제외
-                        hashtags = '\n'.join(hashtags_lines).strip()
-
-                    # 생성한 유튜브 컨텐츠 정보를 DB에 저장
-                    try:
-                        conn = connect_postgres()
-                        cur = conn.cursor()
-                            
-                        # 생성된 콘텐츠 저장
-                        cur.execute("""
-                            INSERT INTO pdf2instagram (pdf_name, keyword, pics, caption, hashtags)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """, (pdf_name, keyword, pics, caption, hashtags))
-                        
-                        conn.commit()
-                        cur.close()
-                        conn.close()
-                        
-                        st.success("인스타그램 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
-
-                    except Exception as e:
-                            st.error(f"인스타그램 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
-                    
                 except Exception as e:
-                    st.error(f"인스타그램 콘텐츠 파싱 중 오류가 발생했습니다: {str(e)}")
+                    st.error(f"{label} 콘텐츠 생성 중 오류가 발생했습니다: {str(e)}")
             
-            elif thrd_button:
-                with st.spinner("스레드 콘텐츠 생성 중..."):
-                    gen_content = generate_from_pdf2threads(openai_client, pdf_text, keyword, llm_option)
-                
-                st.markdown("### 생성된 스레드 콘텐츠")
-                st.text(gen_content)
-                
+            elif all_button:
                 try:
-                    # 섹션의 시작 인덱스 찾기
-                    post_start = gen_content.find("[게시글]")
-                    pics_start = gen_content.find("[사진]")
-                    tags_start = gen_content.find("[태그]")
+                    with st.spinner("유튜브, 인스타그램, 스레드 콘텐츠 생성 중..."):
+                        contents = generate_from_pdf2all(openai_client, pdf_text, keyword, llm_option)
                     
-                    # 각 섹션의 끝 인덱스 결정
-                    post_end = pics_start if pics_start != -1 else tags_start if tags_start != -1 else len(gen_content)
-                    pics_end = tags_start if tags_start != -1 else len(gen_content)
-                    tags_end = len(gen_content)
+                    for platform, label in (('youtube', '유튜브'), ('instagram', '인스타그램'), ('threads', '스레드')):
+                        st.markdown(f"### 생성된 {label} 콘텐츠")
+                        st.text(format_content(contents[platform], platform))
                     
-                    post = ""
-                    pics = ""
-                    tags = ""
-
-                    if post_start != -1:
-                        post_section = gen_content[post_start:post_end].strip()
-                        post_lines = post_section.split('\n')[1:]  # 첫 줄([제목]) 제외
-                        post = '\n'.join(post_lines).strip()
-                    
-                    if pics_start != -1:
-                        pics_section = gen_content[pics_start:pics_end].strip()
-                        pics_lines = pics_section.split('\n')[1:]  # 첫 줄([썸네일]) 제외
-                        pics = '\n'.join(pics_lines).strip()
-                    
-                    if tags_start != -1:
-                        tags_section = gen_content[tags_start:tags_end].strip()
-                        tags_lines = tags_section.split('\n')[1:]  # 첫 줄([스크립트]) 제외
-                        tags = '\n'.join(tags_lines).strip()
-
-                    # 생성한 유튜브 컨텐츠 정보를 DB에 저장
                     try:
-                        conn = connect_postgres()
-                        cur = conn.cursor()
-                        
-                        # 생성된 콘텐츠 저장
-                        cur.execute("""
-                            INSERT INTO pdf2threads (pdf_name, keyword, post, pics, tags)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """, (pdf_name, keyword, post, pics, tags))
-                        
-                        conn.commit()
-                        cur.close()
-                        conn.close()
-                        
-                        st.success("스레드 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
-
+                        save_generated_contents('pdf', pdf_name, keyword, contents)
+                        st.success("유튜브, 인스타그램, 스레드 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
                     except Exception as e:
-                            st.error(f"스레드 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
-                    
+                        st.error(f"콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
+                
                 except Exception as e:
-                    st.error(f"스레드 콘텐츠 파싱 중 오류가 발생했습니다: {str(e)}")
+                    st.error(f"콘텐츠 생성 중 오류가 발생했습니다: {str(e)}")
         else:
             # 파일 없이 버튼 클릭 시 경고
-            if yt_button or insta_button or thrd_button:
+            if yt_button or insta_button or thrd_button or all_button:
                 st.warning("먼저 PDF 파일을 업로드해주세요.")
 
     with channel2content:
         st.subheader("채널 정보로 유튜브 콘텐츠 생성하기")
 
-        top_videos_df = get_top_videos_by_search_id('info_channel')
+        top_videos_df = load_top_videos('info_channel', 'channel2content_top_videos', ['keyword_ch', 'channel_ch'])
         
         if not top_videos_df.empty:
             search_keyword = st.text_input("조회할 키워드를 입력하세요.", key='keyword_ch')
             search_channel = st.text_input("조회할 채널명을 입력하세요.", key='channel_ch')
+            top_videos_pager(top_videos_df, 'channel2content_top_videos', ['keyword_ch', 'channel_ch'])
             
             filtered_df = top_videos_df.copy()
             
@@ -3376,11 +2961,12 @@ with tab_content:
     with keyword2content:
         st.subheader("키워드 정보로 유튜브 콘텐츠 생성하기")
         
-        top_videos_df = get_top_videos_by_search_id('info_keyword')
+        top_videos_df = load_top_videos('info_keyword', 'keyword2content_top_videos', ['keyword_kw', 'channel_kw'])
         
         if not top_videos_df.empty:
             search_keyword = st.text_input("조회할 키워드를 입력하세요.", key='keyword_kw')
             search_channel = st.text_input("조회할 채널명을 입력하세요.", key='channel_kw')
+            top_videos_pager(top_videos_df, 'keyword2content_top_videos', ['keyword_kw', 'channel_kw'])
             
             filtered_df = top_videos_df.copy()
             
@@ -3483,23 +3069,24 @@ with tab_content:
                 )
                 
                 # 쇼츠와 롱폼 영상 분리해서 통계 표시
-                shorts_df = display_df[display_df['쇼츠'] == True]
-                longform_df = display_df[display_df['쇼츠'] == False]
+                split_stats = split_summary(display_df)
                 
                 col1, col2 = st.columns(2)
                 with col1:
                     st.subheader("쇼츠 영상")
-                    st.write(f"영상 수: {len(shorts_df)}")
-                    if not shorts_df.empty:
-                        st.write(f"평균 조회수: {shorts_df['조회수'].mean():.1f}")
-                        st.write(f"평균 좋아요: {shorts_df['좋아요'].mean():.1f}")
+                    st.write(f"영상 수: {split_stats['shorts']['count']}")
+                    if split_stats['shorts']['count']:
+                        st.write(f"평균 조회수: {split_stats['shorts']['mean_views']:.1f}")
+                        st.write(f"평균 좋아요: {split_stats['shorts']['mean_likes']:.1f}")
+                        st.write(f"평균 참여율: {split_stats['shorts']['mean_engagement_rate']:.2f}%")
                 
                 with col2:
                     st.subheader("롱폼 영상")
-                    st.write(f"영상 수: {len(longform_df)}")
-                    if not longform_df.empty:
-                        st.write(f"평균 조회수: {longform_df['조회수'].mean():.1f}")
-                        st.write(f"평균 좋아요: {longform_df['좋아요'].mean():.1f}")
+                    st.write(f"영상 수: {split_stats['longform']['count']}")
+                    if split_stats['longform']['count']:
+                        st.write(f"평균 조회수: {split_stats['longform']['mean_views']:.1f}")
+                        st.write(f"평균 좋아요: {split_stats['longform']['mean_likes']:.1f}")
+                        st.write(f"평균 참여율: {split_stats['longform']['mean_engagement_rate']:.2f}%")
             
 
             # 해당 키워드에 대한 상위 3개 동영상으로 콘텐츠 생성하기
@@ -3541,65 +3128,17 @@ with tab_content:
                     with st.spinner(f"'{keyword}' 키워드에 대한 유튜브 콘텐츠 생성 중..."):
                         try:
                             # 함수 호출하여 콘텐츠 생성
-                            gen_content = generate_from_keyword(openai_client, keyword, video_info, llm_option)
+                            content = generate_from_keyword(openai_client, keyword, video_info, llm_option)
                             
                             st.markdown("### 생성된 유튜브 콘텐츠")
-                            st.text_area("전체 콘텐츠", gen_content, height=300)
+                            st.text_area("전체 콘텐츠", format_content(content, 'youtube'), height=300)
                             
+                            # 생성한 유튜브 컨텐츠 정보를 DB에 저장
                             try:
-                                # 섹션의 시작 인덱스 찾기
-                                title_start = gen_content.find("[제목]")
-                                thumbnail_start = gen_content.find("[썸네일]")
-                                script_start = gen_content.find("[스크립트]")
-                                
-                                # 각 섹션의 끝 인덱스 결정
-                                title_end = thumbnail_start if thumbnail_start != -1 else script_start if script_start != -1 else len(gen_content)
-                                thumbnail_end = script_start if script_start != -1 else len(gen_content)
-                                script_end = len(gen_content)
-                                
-                                # 섹션 내용 추출
-                                title = ""
-                                thumbnail = ""
-                                script = ""
-                                
-                                if title_start != -1:
-                                    title_section = gen_content[title_start:title_end].strip()
-                                    title_lines = title_section.split('\n')[1:]  # 첫 줄([제목]) 제외
-                                    title = '\n'.join(title_lines).strip()
-                                
-                                if thumbnail_start != -1:
-                                    thumbnail_section = gen_content[thumbnail_start:thumbnail_end].strip()
-                                    thumbnail_lines = thumbnail_section.split('\n')[1:]  # 첫 줄([썸네일]) 제외
-                                    thumbnail = '\n'.join(thumbnail_lines).strip()
-                                
-                                if script_start != -1:
-                                    script_section = gen_content[script_start:script_end].strip()
-                                    script_lines = script_section.split('\n')[1:]  # 첫 줄([스크립트]) 제외
-                                    script = '\n'.join(script_lines).strip()
-                                
-                                # 생성한 유튜브 컨텐츠 정보를 DB에 저장
-                                try:
-                                    conn = connect_postgres()
-                                    cur = conn.cursor()
-                                        
-                                    # 생성된 콘텐츠 저장
-                                    cur.execute("""
-                                        INSERT INTO keyword2content (id, keyword, title, thumbnail, script)
-                                        VALUES (%s, %s, %s, %s, %s)
-                                        """, (st.session_state.selected_search_id_keyword, keyword, title, thumbnail, script))
-                                    
-                                    conn.commit()
-                                    cur.close()
-                                    conn.close()
-                                    
-                                    st.success("유튜브 콘텐츠가 성공적으로 생성되고 저장되었습니다!")
-
-                                except Exception as e:
-                                    st.error(f"유튜브 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
-                
+                                save_generated_content('keyword', 'youtube', st.session_state.selected_search_id_keyword, keyword, content)
+                                report_sections(content, 'youtube', '유튜브')
                             except Exception as e:
-                                st.error(f"생성된 콘텐츠 파싱 중 오류가 발생했습니다: {str(e)}")
-                                st.write(f"오류 상세: {str(e)}")
+                                st.error(f"유튜브 콘텐츠 저장 중 오류가 발생했습니다: {str(e)}")
                         except Exception as e:
                             st.error(f"콘텐츠 생성 중 오류가 발생했습니다: {str(e)}")
 
@@ -3609,39 +3148,33 @@ with tab_result:
     try:
         st.subheader("썸네일 분석 결과")
         
-        conn = connect_postgres()
-        cur = conn.cursor()
-
-        cur.execute("""
-        SELECT 
-            video_thumbnail, search_unique_id, keyword, channel_url, channel_name, video_id, video_title, is_shorts, thumbnail_result
-        FROM 
-            analysis_thumbnail
-        ORDER BY
-            created_at DESC
-        """)
-
-        thumbnail_results = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-
-        # 키워드도 조회해야
-        columns = ['썸네일', '검색ID', '키워드', '채널URL', '채널명', 'video_id', '제목', '쇼츠', '썸네일 분석']
-        
-        thumbnail_df = pd.DataFrame(thumbnail_results, columns=columns)
+        # 썸네일 분석은 미리보기만 조회하고, 전체 내용은 선택한 항목만 조회
+        page = select_page('analysis_thumbnail', key='thumbnail_results_page')
+        thumbnail_df = list_thumbnail_analyses(page)
         st.dataframe(
             thumbnail_df,
             column_config={
+                "ID": st.column_config.Column(width="small"),
                 "썸네일": st.column_config.ImageColumn(width="medium"),
                 "채널명": st.column_config.Column(width="small"),
                 "제목": st.column_config.Column(width="medium"),
-                "썸네일 분석": st.column_config.TextColumn(width="large"),
-                "생성일시": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm")
+                "분석 미리보기": st.column_config.TextColumn(width="large"),
             },
             hide_index=True,
             use_container_width=True
         )
+
+        if not thumbnail_df.empty:
+            selected_thumbnail = st.selectbox(
+                "전체 썸네일 분석을 볼 항목",
+                options=[int(analysis_id) for analysis_id in thumbnail_df['ID']],
+                format_func=lambda x: f"ID: {x} - {thumbnail_df[thumbnail_df['ID']==x]['제목'].values[0]}",
+                index=None,
+                key='thumbnail_result_detail'
+            )
+            if selected_thumbnail:
+                selected_row = thumbnail_df[thumbnail_df['ID']==selected_thumbnail].iloc[0]
+                show_thumbnail_analysis({'제목': selected_row['제목'], '썸네일': selected_row['썸네일'], '분석': get_thumbnail_result(selected_thumbnail)})
     
     except Exception as e:
         st.error(f"데이터 조회 중 오류가 발생했습니다: {str(e)}")
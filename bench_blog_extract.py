@@ -0,0 +1,80 @@
+import argparse
+import io
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+import blog_extract
+from blog import extract_blog_soup
+
+
+# # 블로그 본문 추출 속도 비교 (BeautifulSoup vs lxml 트리 vs lxml 스트리밍) # #
+# 사용법: python bench_blog_extract.py [HTML 폴더] --repeat 20
+# 기본 폴더는 fixtures/blog (네이버 PostView/티스토리 마크업 구조를 본뜬 샘플 페이지)
+# 플랫폼 판별용 URL은 파일 이름 앞부분(naver_, tistory_)으로 정하고, --url을 주면 모든 파일에 그 URL 사용
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'blog'
+
+FIXTURE_URLS = {
+    'naver': 'https://blog.naver.com/',
+    'tistory': 'https://sample.tistory.com/',
+}
+
+def _soup(content):
+    return extract_blog_soup(BeautifulSoup(content, 'html.parser'))
+
+
+def _tree(content, url):
+    return blog_extract.extract_tree(blog_extract.parse(content), url)
+
+
+def _stream(content, url):
+    stream = io.BytesIO(content)
+    return blog_extract.extract_stream(iter(lambda: stream.read(blog_extract.STREAM_CHUNK_SIZE), b''), url)
+
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('fixtures', type=Path, nargs='?', default=FIXTURES_DIR)
+    parser.add_argument('--url', default=None, help='플랫폼 판별용 URL (예: https://blog.naver.com/)')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    if not blog_extract.is_available():
+        raise SystemExit('lxml이 설치되어 있지 않습니다. (pip install lxml)')
+
+    files = sorted(args.fixtures.glob('*.html'))
+    if not files:
+        raise SystemExit(f'{args.fixtures}에 .html 파일이 없습니다.')
+
+    totals = {'soup': 0.0, 'tree': 0.0, 'stream': 0.0}
+    print(f"{'파일':<40} {'KB':>7} {'bs4(ms)':>9} {'tree(ms)':>9} {'stream(ms)':>10} {'본문 일치':>8}")
+    for path in files:
+        content = path.read_bytes()
+        url = args.url if args.url is not None else FIXTURE_URLS.get(path.name.split('_')[0], '')
+        soup_time, soup_result = _time(lambda: _soup(content), args.repeat)
+        tree_time, tree_result = _time(lambda: _tree(content, url), args.repeat)
+        stream_time, _ = _time(lambda: _stream(content, url), args.repeat)
+
+        totals['soup'] += soup_time
+        totals['tree'] += tree_time
+        totals['stream'] += stream_time
+
+        # 공백 처리 방식이 달라 공백을 뺀 본문으로 비교
+        same = bool(tree_result) and ''.join(soup_result['content'].split()) == ''.join(tree_result['content'].split())
+        print(f"{path.name[:40]:<40} {len(content) / 1024:>7.0f} {soup_time * 1000:>9.1f} {tree_time * 1000:>9.1f} {stream_time * 1000:>10.1f} {'O' if same else 'X':>8}")
+
+    print(f"\n합계: bs4 {totals['soup'] * 1000:.1f}ms, tree {totals['tree'] * 1000:.1f}ms "
+          f"(x{totals['soup'] / totals['tree']:.1f}), stream {totals['stream'] * 1000:.1f}ms "
+          f"(x{totals['soup'] / totals['stream']:.1f})")
+
+
+if __name__ == '__main__':
+    main()
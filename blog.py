@@ -1,81 +1,133 @@
-import requests
 from bs4 import BeautifulSoup
 import re
+import threading
 
-def blog_content(url):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+import blog_cache
+import blog_extract
+import http_client
+from llm_cache import cached_completion
+from llm_scheduler import create_completion, run_concurrently, OPENAI_MAX_WORKERS
+
+# 블로그 제목과 본문 추출 (요청/파싱 실패 시 예외 발생)
+def extract_blog(url):
+    """
+    lxml이 있으면 플랫폼별 XPath로 추출하고 (큰 페이지는 스트리밍 파싱),
+    lxml이 없거나 본문을 찾지 못하면 BeautifulSoup으로 추출
+    """
+    response = http_client.get(url, stream=True)
     try:
-        response = requests.get(url, headers=headers)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # iframe 찾기 (네이버 블로그는 iframe 내에 실제 콘텐츠가 있음)
-        if 'blog.naver.com' in url:
-            iframe_url = None
+        if not blog_extract.is_available():
+            soup = BeautifulSoup(response.text, 'html.parser')
             
-            # 메인 프레임 찾기
-            frame_tag = soup.select_one('iframe#mainFrame')
+            # iframe 찾기 (네이버 블로그는 iframe 내에 실제 콘텐츠가 있음)
+            frame_tag = soup.select_one('iframe#mainFrame') if 'blog.naver.com' in url else None
             if frame_tag and 'src' in frame_tag.attrs:
-                relative_url = frame_tag['src']
-                iframe_url = f"https://blog.naver.com{relative_url}"
-            
-            if iframe_url:
-                response = requests.get(iframe_url, headers=headers)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 블로그 제목 추출
-        title = soup.select_one('div.se-module-text h3.se-title-text') or \
-                soup.select_one('div.se-title-text') or \
-                soup.select_one('h3.se-title') or \
-                soup.select_one('h3.title') or \
-                soup.select_one('div.title h3') or \
-                soup.select_one('title')
+                return extract_blog(f"https://blog.naver.com{frame_tag['src']}")
+            return extract_blog_soup(soup)
         
-        if title:
-            title = title.get_text(strip=True)
+        # 헤더에 charset이 없으면 lxml이 <meta charset>으로 판단하도록 둠 (requests 기본값 ISO-8859-1 방지)
+        encoding = response.encoding if 'charset=' in response.headers.get('Content-Type', '').lower() else None
+        if int(response.headers.get('Content-Length') or 0) > blog_extract.STREAM_THRESHOLD:
+            received = []
+            
+            def chunks():
+                for chunk in response.iter_content(blog_extract.STREAM_CHUNK_SIZE):
+                    received.append(chunk)
+                    yield chunk
+            
+            result = blog_extract.extract_stream(chunks(), url, encoding)
+            if result:
+                return result
+            content = b''.join(received)
         else:
-            title = "제목을 찾을 수 없습니다."
+            content = response.content
         
-        # 본문 내용 추출
-        content_elements = soup.select('div.se-main-container div.se-text p') or \
-                           soup.select('div.se-main-container div.se-module-text') or \
-                           soup.select('div.post-view') or \
-                           soup.select('div.post_content') or \
-                           soup.select('div#content div.story')
+        tree = blog_extract.parse(content, encoding)
         
-        content = ""
-        for element in content_elements:
-            content += element.get_text(strip=True) + "\n"
+        # 네이버 블로그 바깥 페이지면 mainFrame 주소로 다시 요청
+        frame_url = blog_extract.naver_frame_url(tree) if 'blog.naver.com' in url else None
+        if frame_url:
+            return extract_blog(frame_url)
         
-        # 내용이 없을 경우 다른 방법으로 시도
-        if not content:
-            paragraphs = soup.select('p') or soup.select('div.paragraph')
-            for p in paragraphs:
-                if p.get_text(strip=True):
-                    content += p.get_text(strip=True) + "\n"
-        
-        # HTML 태그 및 특수 문자 제거
-        content = re.sub(r'<[^>]+>', '', content)
-        content = re.sub(r'\s+', ' ', content).strip()
-        
-        return {"title": title, "content": content}
+        return blog_extract.extract_tree(tree, url) or extract_blog_soup(BeautifulSoup(content, 'html.parser', from_encoding=encoding))
+    finally:
+        response.close()
+
+
+# BeautifulSoup으로 제목과 본문 추출 (lxml이 없거나 XPath로 본문을 찾지 못했을 때)
+def extract_blog_soup(soup):
+    # 블로그 제목 추출
+    title = soup.select_one('div.se-module-text h3.se-title-text') or \
+            soup.select_one('div.se-title-text') or \
+            soup.select_one('h3.se-title') or \
+            soup.select_one('h3.title') or \
+            soup.select_one('div.title h3') or \
+            soup.select_one('title')
+    
+    if title:
+        title = title.get_text(strip=True)
+    else:
+        title = "제목을 찾을 수 없습니다."
+    
+    # 본문 내용 추출
+    content_elements = soup.select('div.se-main-container div.se-text p') or \
+                       soup.select('div.se-main-container div.se-module-text') or \
+                       soup.select('div.post-view') or \
+                       soup.select('div.post_content') or \
+                       soup.select('div#content div.story')
+    
+    content = ""
+    for element in content_elements:
+        content += element.get_text(strip=True) + "\n"
+    
+    # 내용이 없을 경우 다른 방법으로 시도
+    if not content:
+        paragraphs = soup.select('p') or soup.select('div.paragraph')
+        for p in paragraphs:
+            if p.get_text(strip=True):
+                content += p.get_text(strip=True) + "\n"
+    
+    # HTML 태그 및 특수 문자 제거
+    content = re.sub(r'<[^>]+>', '', content)
+    content = re.sub(r'\s+', ' ', content).strip()
+    
+    return {"title": title, "content": content}
+
+
+def blog_content(url):
+    try:
+        page = load_blog(url)
+        return {"title": page['title'], "content": page['content']}
     
     except Exception as e:
         print(f"오류 발생: {e}")
         return {"title": "오류 발생", "content": f"콘텐츠를 추출하는 도중 오류가 발생했습니다: {str(e)}"}
 
-def blog_summarizer(client, llm, text):
+# 캐시를 거쳐 블로그 페이지 가져오기 (캐시 키는 정규화된 URL, 내려받는 주소는 fetch_url)
+def load_blog(url):
+    """
+    blog_cache 페이지 딕셔너리({'url', 'title', 'content', 'content_hash', 'summary', 'summary_model'}) 반환
+    PAGE_TTL 안에 가져온 페이지는 다시 내려받지 않고, 다시 가져왔을 때 해시가 같으면 기존 요약이 유지됨
+    """
+    normalized = blog_cache.normalize_url(url)
+    page = blog_cache.get_page(normalized)
+    if page is not None:
+        return page
+    
+    extracted = extract_blog(blog_cache.fetch_url(url, normalized))
+    return blog_cache.save_page(normalized, extracted['title'], extracted['content'])
+
+
+def blog_summarizer(client, llm, text, use_cache=True):
     try:
         # 입력 텍스트가 너무 길 경우 제한 (API 제한을 고려)
         if len(text) > 15000:
             text = text[:15000] + "..."
     
-        summary = client.chat.completions.create(
+        return cached_completion(
+            client,
             model=llm,  # 'gpt-4o-2024-08-06'
             messages=[
                 {"role": "system", "content": "다음 블로그 포스트를 명확하고 간결하게 요약해주세요. 핵심 내용과 주요 포인트를 포함시켜야 합니다."},
@@ -83,9 +135,37 @@ def blog_summarizer(client, llm, text):
             ],
             temperature=0.3, 
             max_tokens=500,
+            use_cache=use_cache,
+            create=lambda **kwargs: create_completion(client, **kwargs),  # 분당 요청/토큰 한도 적용
         )
-        
-        return summary.choices[0].message.content.strip()
     
     except Exception as e:
         return {"블로그 내용 요약 중 오류가 발생했습니다.": str(e)}
+
+
+# 여러 블로그를 동시에 추출/요약하고 끝나는 순서대로 결과 반환
+def iter_blog_summaries(client, llm, urls, llm_workers=OPENAI_MAX_WORKERS):
+    """
+    (입력 순서 index, {'url', 'title', 'summary', 'error'})를 하나씩 반환
+    성공하면 error는 None, 실패하면 summary는 None
+    페이지 추출은 URL 수만큼 동시에, 요약 요청은 llm_workers개까지만 동시에 실행
+    본문 해시가 그대로이고 같은 모델로 만든 요약이 캐시에 있으면 요약 요청을 생략
+    """
+    llm_slots = threading.BoundedSemaphore(llm_workers)
+    
+    def summarize(url):
+        try:
+            page = load_blog(url)
+            summary = page['summary'] if page['summary_model'] == llm else None
+            if summary is None:
+                with llm_slots:
+                    summary = blog_summarizer(client, llm, page['content'])
+                if not isinstance(summary, str):  # blog_summarizer는 실패 시 딕셔너리를 반환
+                    raise RuntimeError(next(iter(summary.values())))
+                blog_cache.save_summary(page['url'], llm, summary)
+            return {'url': url, 'title': page['title'], 'summary': summary, 'error': None}
+        except Exception as e:
+            return {'url': url, 'title': None, 'summary': None, 'error': str(e)}
+    
+    jobs = [(i, lambda url=url: summarize(url)) for i, url in enumerate(urls)]
+    yield from run_concurrently(jobs, max_workers=max(len(jobs), 1))
@@ -0,0 +1,155 @@
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from cache import TTLCache
+from db import get_connection, register_migration
+
+
+# # 블로그 페이지 캐시 (정규화된 URL → 추출된 제목/본문 + 해시 + 요약) # #
+PAGE_TTL = 24 * 60 * 60  # 이 시간 안에 가져온 페이지는 다시 내려받지 않음(초)
+
+_memory = TTLCache(maxsize=512, ttl=PAGE_TTL)
+
+register_migration('blog_pages_table', """
+CREATE TABLE IF NOT EXISTS blog_pages (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    content TEXT,
+    content_hash TEXT NOT NULL,
+    summary TEXT,
+    summary_model TEXT,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    summarized_at TIMESTAMP
+)
+""")
+
+# 네이버 블로그 글 본문 주소 (mainFrame이 가리키는 주소)
+NAVER_POST_VIEW = 'https://blog.naver.com/PostView.naver'
+
+# URL 정규화 시 제거할 추적용 파라미터
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'trackingCode')
+
+
+# 같은 글을 가리키는 URL을 하나로 정규화 (blog_pages 캐시 키 용도, 이 주소로 내려받지는 않음)
+def normalize_url(url):
+    """
+    네이버 블로그는 blog.naver.com/{blogId}/{logNo}, m.blog.naver.com, PostView.nhn 형태를 모두
+    mainFrame이 가리키는 https://blog.naver.com/PostView.naver?blogId=...&logNo=... 로 변환
+    그 외에는 호스트 소문자화, fragment/추적 파라미터/끝 슬래시 제거
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = 'https://' + url
+
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = dict(parse_qsl(parts.query))
+
+    if host in ('blog.naver.com', 'm.blog.naver.com'):
+        segments = [segment for segment in parts.path.split('/') if segment]
+        blog_id = query.get('blogId')
+        log_no = query.get('logNo')
+        if not (blog_id and log_no) and len(segments) >= 2 and segments[1].isdigit():
+            blog_id, log_no = segments[0], segments[1]
+        if blog_id and log_no:
+            return f"{NAVER_POST_VIEW}?{urlencode({'blogId': blog_id, 'logNo': log_no})}"
+
+    params = [
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.startswith(_TRACKING_PARAMS)
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(params), ''))
+
+
+# 실제로 내려받을 URL (네이버 글은 mainFrame이 가리키는 PostView 주소, 그 외에는 입력한 URL 그대로)
+def fetch_url(url, normalized=None):
+    normalized = normalized or normalize_url(url)
+    if normalized.startswith(NAVER_POST_VIEW + '?'):
+        return normalized
+    return url.strip()
+
+
+# 추출한 제목/본문의 해시
+def content_hash(title, content):
+    return hashlib.sha256(f"{title}\n{content}".encode('utf-8')).hexdigest()
+
+
+# 캐시된 페이지 조회 (정규화된 URL 기준, PAGE_TTL 안에 가져온 것만)
+def get_page(url):
+    """
+    {'url', 'title', 'content', 'content_hash', 'summary', 'summary_model'} 딕셔너리 또는 None 반환
+    """
+    cached = _memory.get(url)
+    if cached is not None:
+        return cached
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            SELECT url, title, content, content_hash, summary, summary_model
+            FROM blog_pages
+            WHERE url = %s AND fetched_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+            """, (url, PAGE_TTL))
+            row = cur.fetchone()
+            cur.close()
+    except Exception as e:
+        print(f'블로그 캐시 조회 중 오류 발생: {str(e)}')
+        return None
+
+    if row is None:
+        return None
+
+    page = dict(zip(('url', 'title', 'content', 'content_hash', 'summary', 'summary_model'), row))
+    _memory.set(url, page)
+    return page
+
+
+# 가져온 페이지 저장 (해시가 바뀌었으면 기존 요약은 삭제), 저장된 페이지 딕셔너리 반환
+def save_page(url, title, content):
+    page_hash = content_hash(title, content)
+    page = {'url': url, 'title': title, 'content': content, 'content_hash': page_hash, 'summary': None, 'summary_model': None}
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            INSERT INTO blog_pages (url, title, content, content_hash)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (url) DO UPDATE SET
+                title = EXCLUDED.title,
+                content = EXCLUDED.content,
+                fetched_at = CURRENT_TIMESTAMP,
+                summary = CASE WHEN blog_pages.content_hash = EXCLUDED.content_hash THEN blog_pages.summary END,
+                summary_model = CASE WHEN blog_pages.content_hash = EXCLUDED.content_hash THEN blog_pages.summary_model END,
+                content_hash = EXCLUDED.content_hash
+            RETURNING summary, summary_model
+            """, (url, title, content, page_hash))
+            page['summary'], page['summary_model'] = cur.fetchone()
+            cur.close()
+    except Exception as e:
+        print(f'블로그 캐시 저장 중 오류 발생: {str(e)}')
+
+    _memory.set(url, page)
+    return page
+
+
+# 요약 저장
+def save_summary(url, model, summary):
+    page = _memory.get(url)
+    if page is not None:
+        _memory.set(url, dict(page, summary=summary, summary_model=model))
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            UPDATE blog_pages SET summary = %s, summary_model = %s, summarized_at = CURRENT_TIMESTAMP
+            WHERE url = %s
+            """, (summary, model, url))
+            cur.close()
+    except Exception as e:
+        print(f'블로그 요약 캐시 저장 중 오류 발생: {str(e)}')
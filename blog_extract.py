@@ -0,0 +1,229 @@
+import re
+from urllib.parse import urlsplit
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # lxml이 없으면 blog.py의 BeautifulSoup 경로만 사용
+    etree = None
+    lxml_html = None
+
+
+# # 블로그 본문 추출 엔진 (lxml + 플랫폼별로 미리 컴파일한 XPath) # #
+STREAM_THRESHOLD = 1024 * 1024  # 이보다 큰 페이지는 트리를 만들지 않고 스트리밍 파싱(바이트)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_whitespace = re.compile(r'\s+')
+
+
+# class 속성에 name이 들어있는지 검사하는 XPath 조건
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _compile(expressions):
+    return [etree.XPath(expression) for expression in expressions] if etree is not None else []
+
+
+class Extractor:
+    """
+    플랫폼별 추출 규칙
+    title_xpaths / content_xpaths: 트리 파싱용 XPath (앞에서부터 시도해 결과가 있는 첫 번째를 사용)
+    hosts: 이 호스트(또는 하위 도메인)면 이 규칙을 먼저 시도
+    stream_title / stream_containers / stream_blocks: 스트리밍 파싱용 (태그, class) 규칙
+    """
+    def __init__(self, name, title_xpaths, content_xpaths, hosts=(),
+                 stream_title=(), stream_containers=None, stream_blocks=('p',)):
+        self.name = name
+        self.hosts = tuple(hosts)
+        self.title_xpaths = _compile(title_xpaths)
+        self.content_xpaths = _compile(content_xpaths)
+        self.stream_title = tuple(stream_title)
+        self.stream_containers = frozenset(stream_containers) if stream_containers else None
+        self.stream_blocks = frozenset(stream_blocks)
+
+    def matches(self, url):
+        host = urlsplit(url).netloc.lower()
+        return any(host == h or host.endswith('.' + h) for h in self.hosts)
+
+    # 트리에서 (제목, 본문 블록 리스트) 추출
+    def extract_tree(self, tree):
+        title = None
+        for xpath in self.title_xpaths:
+            found = xpath(tree)
+            if found:
+                title = _text(found[0])
+                if title:
+                    break
+
+        blocks = []
+        for xpath in self.content_xpaths:
+            blocks = [text for text in (_text(element) for element in xpath(tree)) if text]
+            if blocks:
+                break
+
+        return title, blocks
+
+    def is_stream_title(self, element):
+        return any(element.tag == tag and (not cls or cls in _classes(element)) for tag, cls in self.stream_title)
+
+    def is_stream_container(self, element):
+        return self.stream_containers is not None and not self.stream_containers.isdisjoint(_classes(element))
+
+    def is_stream_block(self, element):
+        return element.tag in self.stream_blocks or self.is_stream_title(element)
+
+    def in_stream_container(self, element):
+        if self.stream_containers is None:
+            return True
+        return any(self.is_stream_container(ancestor) for ancestor in element.iterancestors())
+
+
+def _classes(element):
+    return (element.get('class') or '').split()
+
+
+# 요소(또는 XPath 문자열 결과)의 텍스트를 공백 하나로 정리
+def _text(node):
+    text = node if isinstance(node, str) else ''.join(node.itertext())  # 스트리밍 파싱 요소(etree)에는 text_content가 없음
+    return _whitespace.sub(' ', text).strip()
+
+
+NAVER = Extractor(
+    'naver',
+    hosts=('blog.naver.com',),
+    title_xpaths=[
+        f"//div[{_has_class('se-module-text')}]//h3[{_has_class('se-title-text')}]",
+        f"//div[{_has_class('se-title-text')}]",
+        f"//h3[{_has_class('se-title')}]",
+        f"//h3[{_has_class('title')}]",
+        "//meta[@property='og:title']/@content",
+        "//title",
+    ],
+    content_xpaths=[
+        f"//div[{_has_class('se-main-container')}]//div[{_has_class('se-text')}]//p",
+        f"//div[{_has_class('se-main-container')}]//div[{_has_class('se-module-text')}]",
+        "//div[@id='postViewArea']//p",
+        f"//div[{_has_class('post-view')}]",
+    ],
+    stream_title=(('h3', 'se-title-text'), ('div', 'se-title-text'), ('h3', 'se-title')),
+    stream_containers=('se-main-container', 'post-view'),
+)
+
+TISTORY = Extractor(
+    'tistory',
+    hosts=('tistory.com',),
+    title_xpaths=[
+        "//meta[@property='og:title']/@content",
+        f"//h2[{_has_class('title-article')}]",
+        f"//div[{_has_class('title')}]//h3",
+        "//title",
+    ],
+    content_xpaths=[
+        f"//div[{_has_class('tt_article_useless_p_margin')}]",
+        f"//div[{_has_class('entry-content')}]",
+        f"//div[{_has_class('article-view')}]",
+        f"//div[{_has_class('post_content')}]",
+        f"//div[@id='content']//div[{_has_class('story')}]",
+    ],
+    stream_title=(('h2', 'title-article'), ('title', None)),
+    stream_containers=('tt_article_useless_p_margin', 'entry-content', 'article-view', 'post_content'),
+    stream_blocks=('p', 'h2', 'h3', 'li'),
+)
+
+GENERIC = Extractor(
+    'generic',
+    title_xpaths=[
+        "//meta[@property='og:title']/@content",
+        "//h1",
+        "//title",
+    ],
+    content_xpaths=[
+        "//article//p",
+        "//p",
+        f"//div[{_has_class('paragraph')}]",
+    ],
+    stream_title=(('title', None),),
+)
+
+# 시도 순서 (URL이 일치하는 규칙을 먼저, 나머지는 이 순서대로)
+EXTRACTORS = [NAVER, TISTORY, GENERIC]
+
+
+# 추출 규칙 추가 (GENERIC보다 앞에 넣음)
+def register_extractor(extractor):
+    EXTRACTORS.insert(len(EXTRACTORS) - 1 if GENERIC in EXTRACTORS else len(EXTRACTORS), extractor)
+
+
+def _ordered(url):
+    matched = [extractor for extractor in EXTRACTORS if extractor.matches(url)]
+    return matched + [extractor for extractor in EXTRACTORS if extractor not in matched]
+
+
+def is_available():
+    return etree is not None
+
+
+# HTML 바이트를 트리로 파싱
+def parse(content, encoding=None):
+    return lxml_html.document_fromstring(content, parser=lxml_html.HTMLParser(encoding=encoding))
+
+
+# 네이버 블로그 바깥 페이지의 mainFrame 주소 (없으면 None)
+def naver_frame_url(tree):
+    src = tree.xpath("//iframe[@id='mainFrame']/@src")
+    return f"https://blog.naver.com{src[0]}" if src else None
+
+
+# 트리에서 제목과 본문 추출 (본문을 찾지 못하면 None)
+def extract_tree(tree, url=''):
+    title = None
+    for extractor in _ordered(url):
+        found_title, blocks = extractor.extract_tree(tree)
+        title = title or found_title
+        if blocks:
+            return {"title": found_title or title or "제목을 찾을 수 없습니다.", "content": ' '.join(blocks)}
+    return None
+
+
+# 청크 단위로 파싱하며 제목과 본문 추출 (본문 영역이 닫히면 나머지는 읽지 않음)
+def extract_stream(chunks, url='', encoding=None):
+    """
+    chunks: bytes 이터러블 (response.iter_content 등)
+    처리한 요소는 바로 비워서 큰 페이지도 메모리를 적게 사용. 본문을 찾지 못하면 None
+    URL과 일치하는 규칙(없으면 GENERIC) 하나만 사용
+    """
+    matched = [extractor for extractor in EXTRACTORS if extractor.matches(url)]
+    extractor = matched[0] if matched else GENERIC
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+
+    title = None
+    blocks = []
+    open_blocks = 0  # 열려 있는 제목/본문 블록 수 (블록 안쪽 요소는 블록 텍스트를 읽을 때까지 비우지 않음)
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if not isinstance(element.tag, str):  # 주석 등
+                continue
+            if extractor.is_stream_block(element):
+                open_blocks += 1 if event == 'start' else -1
+            if event == 'start':
+                continue
+
+            if title is None and extractor.is_stream_title(element):
+                title = _text(element) or None
+            elif element.tag in extractor.stream_blocks and not open_blocks and extractor.in_stream_container(element):  # 다른 블록 안쪽 블록은 바깥 블록 텍스트에 포함됨
+                text = _text(element)
+                if text:
+                    blocks.append(text)
+
+            done = blocks and extractor.is_stream_container(element)
+            if not open_blocks:
+                element.clear(keep_tail=True)
+            if done:
+                parser.close()
+                return {"title": title or "제목을 찾을 수 없습니다.", "content": ' '.join(blocks)}
+
+    parser.close()
+    if not blocks:
+        return None
+    return {"title": title or "제목을 찾을 수 없습니다.", "content": ' '.join(blocks)}
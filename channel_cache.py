@@ -0,0 +1,78 @@
+from psycopg2.extras import execute_values
+
+from cache import TTLCache
+from db import get_connection, register_migration
+
+
+# # 채널 핸들(@handle) → 채널 ID 캐시 (메모리 LRU + PostgreSQL) # #
+# 핸들과 채널 ID의 연결은 거의 바뀌지 않으므로 만료 없이 보관
+_memory = TTLCache(maxsize=2048)
+
+register_migration('channel_handles_table', """
+CREATE TABLE IF NOT EXISTS channel_handles (
+    handle TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+""")
+
+
+# 캐시된 채널 ID 조회 (핸들은 소문자, @ 제외)
+def get_channel_ids(handles):
+    """
+    {handle: channel_id} 딕셔너리 반환. 캐시에 없는 핸들은 결과에서 빠짐
+    """
+    found = {}
+    missing = []
+    for handle in set(handles):
+        channel_id = _memory.get(handle)
+        if channel_id is not None:
+            found[handle] = channel_id
+        else:
+            missing.append(handle)
+
+    if not missing:
+        return found
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT handle, channel_id FROM channel_handles WHERE handle = ANY(%s)", (missing,))
+            rows = cur.fetchall()
+            cur.close()
+    except Exception as e:
+        print(f'채널 ID 캐시 조회 중 오류 발생: {str(e)}')
+        return found
+
+    for handle, channel_id in rows:
+        _memory.set(handle, channel_id)
+        found[handle] = channel_id
+
+    return found
+
+
+# 채널 ID 저장
+def save_channel_ids(mapping):
+    """
+    mapping: {handle: channel_id}
+    """
+    if not mapping:
+        return
+
+    for handle, channel_id in mapping.items():
+        _memory.set(handle, channel_id)
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            execute_values(
+                cur,
+                """
+                INSERT INTO channel_handles (handle, channel_id) VALUES %s
+                ON CONFLICT (handle) DO UPDATE SET channel_id = EXCLUDED.channel_id, resolved_at = CURRENT_TIMESTAMP
+                """,
+                list(mapping.items())
+            )
+            cur.close()
+    except Exception as e:
+        print(f'채널 ID 캐시 저장 중 오류 발생: {str(e)}')
@@ -0,0 +1,233 @@
+import json
+import re
+
+
+# # 생성 콘텐츠 파서 (JSON 구조화 출력 검증 + [섹션] 텍스트 포맷 토크나이저 + 스트리밍 증분 파싱) # #
+# 플랫폼별 필드와 기존 텍스트 포맷의 섹션 이름
+PLATFORM_FIELDS = {
+    'youtube': (('title', '제목'), ('thumbnail', '썸네일'), ('script', '스크립트')),
+    'instagram': (('pics', '사진'), ('caption', '게시글'), ('hashtags', '해시 태그')),
+    'threads': (('post', '게시글'), ('pics', '사진'), ('tags', '태그')),
+}
+
+# 필드 설명 (JSON 스키마 description, 프롬프트 안내에 사용)
+FIELD_DESCRIPTIONS = {
+    'youtube': {'title': '제목 3가지 (줄바꿈으로 구분)', 'thumbnail': '썸네일 이미지 내용 3가지 (줄바꿈으로 구분)', 'script': '첫 2분 스크립트'},
+    'instagram': {'pics': '사진 구성', 'caption': '게시글(캡션)', 'hashtags': '해시 태그'},
+    'threads': {'post': '게시글', 'pics': '게시글을 돋보이게 할 이미지 내용', 'tags': '태그'},
+}
+
+# json_schema 구조화 출력을 지원하는 모델 (그 외 모델은 json_object로 요청)
+STRUCTURED_OUTPUT_MODELS = ('gpt-4o-2024-08-06', 'gpt-4o-2024-11-20', 'gpt-4o-mini', 'gpt-4.1', 'o1-2024-12-17', 'o3', 'o4')
+
+
+class ContentParseError(ValueError):
+    pass
+
+
+def _platforms(platforms):
+    return (platforms,) if isinstance(platforms, str) else tuple(platforms)
+
+
+def _platform_schema(platform):
+    return {
+        'type': 'object',
+        'properties': {
+            field: {'type': 'string', 'description': FIELD_DESCRIPTIONS[platform][field]}
+            for field, _ in PLATFORM_FIELDS[platform]
+        },
+        'required': [field for field, _ in PLATFORM_FIELDS[platform]],
+        'additionalProperties': False,
+    }
+
+
+# 요청에 넣을 response_format (플랫폼 하나면 필드 객체, 여러 개면 {platform: 필드 객체})
+def response_format(model, platforms):
+    platforms = _platforms(platforms)
+    if not model.startswith(STRUCTURED_OUTPUT_MODELS):
+        return {'type': 'json_object'}
+
+    if len(platforms) == 1:
+        schema = _platform_schema(platforms[0])
+    else:
+        schema = {
+            'type': 'object',
+            'properties': {platform: _platform_schema(platform) for platform in platforms},
+            'required': list(platforms),
+            'additionalProperties': False,
+        }
+    return {
+        'type': 'json_schema',
+        'json_schema': {'name': '_'.join(platforms) + '_content', 'strict': True, 'schema': schema},
+    }
+
+
+# 프롬프트에 넣을 JSON 응답 안내 (json_object 모드는 프롬프트에 JSON 언급이 있어야 함)
+def json_instruction(platforms):
+    platforms = _platforms(platforms)
+
+    def fields(platform):
+        return '{' + ', '.join(f'"{field}": "{FIELD_DESCRIPTIONS[platform][field]}"' for field, _ in PLATFORM_FIELDS[platform]) + '}'
+
+    if len(platforms) == 1:
+        shape = fields(platforms[0])
+    else:
+        shape = '{' + ', '.join(f'"{platform}": {fields(platform)}' for platform in platforms) + '}'
+    return f"반드시 아래 키를 가진 JSON 객체 하나로만 응답해주세요 (각 값은 문자열, 여러 항목은 줄바꿈으로 구분):\n    {shape}"
+
+
+# 항목 값을 문자열로 (리스트로 오면 줄바꿈으로 연결)
+def _field_text(value):
+    if isinstance(value, list):
+        return '\n'.join(_field_text(item) for item in value)
+    if value is None:
+        return ''
+    if isinstance(value, (dict, bool)):
+        raise ContentParseError(f'문자열이 아닌 값입니다: {value!r}')
+    return str(value).strip()
+
+
+# JSON 객체를 {field: text}로 검증 (모든 필드가 비어 있으면 ContentParseError)
+def validate(data, platform):
+    if isinstance(data, dict) and isinstance(data.get(platform), dict):
+        data = data[platform]
+    if not isinstance(data, dict):
+        raise ContentParseError('JSON 객체가 아닙니다.')
+
+    content = {field: _field_text(data.get(field)) for field, _ in PLATFORM_FIELDS[platform]}
+    if not any(content.values()):
+        raise ContentParseError('생성된 콘텐츠의 모든 항목이 비어 있습니다.')
+    return content
+
+
+_fence = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+
+def load_json(text):
+    return json.loads(_fence.sub('', text))
+
+
+def _normalize_label(label):
+    return re.sub(r'\s+', '', label)
+
+
+# 섹션 제목 줄 패턴: [제목], **[제목]**, ### 제목, 제목:, 【제목】 등
+# 괄호 없는 형태(제목:)는 본문 줄과 헷갈리므로 #/** 꾸밈이 없으면 뒤에 내용이 없을 때만 제목으로 봄 (_header_field)
+def _header_pattern(platform):
+    labels = '|'.join(
+        r'\s*'.join(re.escape(char) for char in _normalize_label(label))
+        for _, label in sorted(PLATFORM_FIELDS[platform], key=lambda item: -len(item[1]))
+    )
+    return re.compile(
+        rf'^\s*(?P<hashes>#{{1,6}}\s*)?(?P<bold>\*\*\s*)?'
+        rf'(?:[\[【]\s*(?P<bracketed>{labels})\s*[\]】]|(?P<plain>{labels})\s*(?=[:：*]|$))'
+        rf'\s*(?:\*\*)?\s*[:：]?\s*(?:\*\*)?\s*(?P<rest>.*)$'
+    )
+
+
+# [섹션] 텍스트 포맷 증분 파서 (조각을 받을 때마다 줄 단위로 한 번만 훑음)
+class SectionStreamParser:
+    """
+    feed(delta)로 스트리밍 조각을 넣으면 다음 섹션 제목이 나올 때 앞 섹션이 완료된 것으로 보고
+    on_section(field, text)를 호출. close()로 마지막 섹션까지 완료하고 {field: text} 반환
+    첫 섹션 제목 앞의 텍스트는 버림
+    """
+    def __init__(self, platform, on_section=None):
+        self.platform = platform
+        self.on_section = on_section
+        self.completed = []
+        self._header = _header_pattern(platform)
+        self._fields = {_normalize_label(label): field for field, label in PLATFORM_FIELDS[platform]}
+        self._lines = {field: [] for field, _ in PLATFORM_FIELDS[platform]}
+        self._current = None
+        self._buffer = ''
+
+    def feed(self, delta):
+        self._buffer += delta
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self._line(line)
+
+    # 섹션 제목 줄이면 (field, 같은 줄의 내용), 아니면 None
+    def _header_field(self, line):
+        match = self._header.match(line)
+        if not match:
+            return None
+        if match.group('plain') and match.group('rest').strip() and not (match.group('hashes') or match.group('bold')):
+            return None  # "제목: ..." 같은 본문 줄
+        field = self._fields[_normalize_label(match.group('bracketed') or match.group('plain'))]
+        if field == self._current or field in self.completed:
+            return None  # 이미 나온 섹션 이름이 다시 나오면 본문으로 취급 (저장된 내용과 결과가 달라지지 않도록)
+        return field, match.group('rest')
+
+    def _line(self, line):
+        header = self._header_field(line)
+        if header:
+            self._finish()
+            self._current, line = header
+            if not line.strip():
+                return
+        if self._current is not None:
+            self._lines[self._current].append(line)
+
+    def _finish(self):
+        if self._current is None or self._current in self.completed:
+            return
+        self.completed.append(self._current)
+        if self.on_section:
+            self.on_section(self._current, self.text(self._current))
+
+    def text(self, field):
+        return '\n'.join(self._lines[field]).strip()
+
+    def close(self):
+        if self._buffer:
+            self._line(self._buffer)
+            self._buffer = ''
+        self._finish()
+        return {field: self.text(field) for field, _ in PLATFORM_FIELDS[self.platform]}
+
+
+# [섹션] 텍스트 포맷 파싱
+def parse_sections(text, platform):
+    parser = SectionStreamParser(platform)
+    parser.feed(text)
+    return parser.close()
+
+
+# 생성 결과 파싱 (JSON이면 검증, 아니면 [섹션] 포맷으로), {field: text} 반환
+def parse_content(text, platform):
+    """
+    어느 쪽으로도 내용을 찾지 못하면 ContentParseError
+    """
+    if text.lstrip().startswith(('{', '```')):
+        try:
+            return validate(load_json(text), platform)
+        except (json.JSONDecodeError, ContentParseError):
+            pass
+
+    content = parse_sections(text, platform)
+    if not any(content.values()):
+        raise ContentParseError('생성된 콘텐츠에서 섹션을 찾을 수 없습니다.')
+    return content
+
+
+# 여러 플랫폼 JSON 응답 파싱, {platform: {field: text}} 반환
+def parse_platforms(text, platforms):
+    try:
+        data = load_json(text)
+    except json.JSONDecodeError as e:
+        raise ContentParseError(f'JSON 형식이 아닙니다: {str(e)}')
+    if not isinstance(data, dict):
+        raise ContentParseError('JSON 객체가 아닙니다.')
+    return {platform: validate(data.get(platform) or {}, platform) for platform in _platforms(platforms)}
+
+
+# 비어 있는 섹션 이름 리스트
+def missing_sections(content, platform):
+    return [label for field, label in PLATFORM_FIELDS[platform] if not content.get(field)]
+
+
+# {field: text}를 기존 "[섹션]\n내용" 텍스트 포맷으로 (화면 표시용)
+def format_content(content, platform):
+    return '\n\n'.join(f"[{label}]\n{content[field]}" for field, label in PLATFORM_FIELDS[platform])
@@ -0,0 +1,200 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+
+# # PostgreSQL 커넥션 풀 모듈 # #
+DB_CONFIG = {
+    'host': os.getenv('PG_HOST', "15.164.112.237"),
+    'database': os.getenv('PG_DATABASE', "dify"),
+    'user': os.getenv('PG_USER', "difyuser"),
+    'password': os.getenv('PG_PASSWORD', "bico0218"),
+}
+
+POOL_MIN_SIZE = int(os.getenv('PG_POOL_MIN', 1))
+POOL_MAX_SIZE = int(os.getenv('PG_POOL_MAX', 10))
+POOL_TIMEOUT = float(os.getenv('PG_POOL_TIMEOUT', 30))  # 빈 커넥션을 기다리는 최대 시간(초)
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = None
+_stats = {'checkouts': 0, 'reconnects': 0, 'in_use': 0, 'max_in_use': 0}
+_stats_lock = threading.Lock()
+
+
+# 풀 생성 (최초 1회)
+def get_pool():
+    global _pool, _slots
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _slots = threading.BoundedSemaphore(POOL_MAX_SIZE)
+                _pool = pool.ThreadedConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE, **DB_CONFIG)
+
+    return _pool
+
+
+# 커넥션이 살아있는지 확인
+def _is_healthy(conn):
+    if conn.closed:
+        return False
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.close()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _update_stats(**delta):
+    with _stats_lock:
+        for key, value in delta.items():
+            _stats[key] += value
+        _stats['max_in_use'] = max(_stats['max_in_use'], _stats['in_use'])
+
+
+# 풀에서 커넥션 꺼내기 (상태 확인 후 끊긴 커넥션은 교체)
+def acquire():
+    db_pool = get_pool()
+    if not _slots.acquire(timeout=POOL_TIMEOUT):
+        raise pool.PoolError(f"{POOL_TIMEOUT}초 동안 사용 가능한 DB 커넥션이 없습니다.")
+
+    try:
+        conn = db_pool.getconn()
+        if not _is_healthy(conn):
+            db_pool.putconn(conn, close=True)
+            conn = db_pool.getconn()
+            _update_stats(reconnects=1)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    except Exception:
+        _slots.release()
+        raise
+
+    _update_stats(checkouts=1, in_use=1)
+    return conn
+
+
+# 커넥션을 풀에 반납
+def release(conn):
+    try:
+        get_pool().putconn(conn, close=conn.closed != 0)
+    finally:
+        _update_stats(in_use=-1)
+        _slots.release()
+
+
+# with 문으로 쓰는 커넥션
+@contextmanager
+def get_connection():
+    conn = acquire()
+    try:
+        yield conn
+    finally:
+        release(conn)
+
+
+# 풀 상태 정보
+def pool_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+
+    stats['min_size'] = POOL_MIN_SIZE
+    stats['max_size'] = POOL_MAX_SIZE
+    if _pool is not None:
+        stats['idle'] = len(_pool._pool)
+        stats['opened'] = len(_pool._pool) + len(_pool._used)
+    else:
+        stats['idle'] = 0
+        stats['opened'] = 0
+
+    return stats
+
+
+# close() 하면 실제로 끊지 않고 풀에 반납하는 커넥션
+class PooledConnection:
+    def __init__(self, conn):
+        self._conn = conn
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            release(self._conn)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# 기존 코드 호환용 (conn.close() 시 풀로 반납됨)
+def connect_postgres():
+    return PooledConnection(acquire())
+
+
+# 여러 쿼리를 하나의 트랜잭션으로 묶어서 실행 (예외 발생 시 롤백)
+@contextmanager
+def transaction():
+    with get_connection() as conn:
+        conn.autocommit = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = True
+
+
+# # 스키마 마이그레이션 # #
+_migrations = []
+_applied_migrations = set()
+_migration_lock = threading.Lock()
+
+
+# 마이그레이션 등록 (이름은 고유해야 하며, 한 번 적용된 이름은 다시 실행되지 않음)
+def register_migration(name, sql):
+    if name not in (registered for registered, _ in _migrations):
+        _migrations.append((name, sql))
+
+
+# 등록된 마이그레이션 중 아직 적용되지 않은 것을 순서대로 실행
+def run_migrations():
+    with _migration_lock:
+        pending = [(name, sql) for name, sql in _migrations if name not in _applied_migrations]
+        if not pending:
+            return []
+
+        applied = []
+        with transaction() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                name TEXT PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+            cur.execute("SELECT name FROM schema_migrations")
+            _applied_migrations.update(row[0] for row in cur.fetchall())
+
+            for name, sql in pending:
+                if name in _applied_migrations:
+                    continue
+                cur.execute(sql)
+                cur.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+                applied.append(name)
+            cur.close()
+
+        _applied_migrations.update(applied)
+        return applied
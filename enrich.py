@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from youtube import is_youtubeshorts, youtube_transcript, NO_TRANSCRIPT_MESSAGE, NO_COMMENTS
+
+
+# # 동영상별 부가 정보(쇼츠 여부, 자막, 댓글)를 병렬로 수집하는 모듈 # #
+
+# 단계별 최대 동시 실행 수
+DEFAULT_STAGE_LIMITS = {
+    'shorts': 8,
+    'transcript': 4,
+    'comments': 8,
+}
+
+
+# 스레드마다 별도의 객체를 만들어 쓰는 함수 생성 (googleapiclient 객체는 스레드 간 공유 불가)
+def per_thread(factory):
+    local = threading.local()
+
+    def get():
+        if not hasattr(local, 'value'):
+            local.value = factory()
+        return local.value
+
+    return get
+
+
+# 동영상 목록의 쇼츠 여부, 자막, 댓글을 병렬로 수집
+def enrich_videos(video_ids, fetch_comments, stage_limits=None, max_comments=3, on_progress=None):
+    """
+    video_ids: 처리할 동영상 ID 리스트
+    fetch_comments: (video_id, max_results)를 받아 댓글 리스트를 반환하는 함수
+    stage_limits: 단계별 동시 실행 수 ({'shorts': n, 'transcript': n, 'comments': n})
+    on_progress: (완료된 동영상 수, 전체 동영상 수)를 받는 콜백. 호출한 스레드에서 실행됨
+
+    입력 순서 그대로 {'is_shorts', 'transcript', 'comments'} 딕셔너리 리스트를 반환
+    단계가 실패하면 오류를 출력하고 기본값(False, NO_TRANSCRIPT_MESSAGE, NO_COMMENTS)을 사용
+    """
+    limits = dict(DEFAULT_STAGE_LIMITS)
+    if stage_limits:
+        limits.update(stage_limits)
+
+    semaphores = {stage: threading.BoundedSemaphore(limit) for stage, limit in limits.items()}
+
+    stages = {
+        'shorts': lambda video_id: is_youtubeshorts(video_id),
+        'transcript': lambda video_id: youtube_transcript(video_id),
+        'comments': lambda video_id: fetch_comments(video_id, max_comments),
+    }
+    result_keys = {'shorts': 'is_shorts', 'transcript': 'transcript', 'comments': 'comments'}
+    defaults = {
+        'shorts': lambda: False,
+        'transcript': lambda: NO_TRANSCRIPT_MESSAGE,
+        'comments': lambda: [dict(comment) for comment in NO_COMMENTS],
+    }
+
+    # 단계 하나 실행 (실패해도 다른 단계/동영상은 계속 진행)
+    def run(stage, video_id):
+        with semaphores[stage]:
+            try:
+                return stages[stage](video_id)
+            except Exception as e:
+                print(f'{video_id} {stage} 단계 실패: {str(e)}')
+                return defaults[stage]()
+
+    results = [{} for _ in video_ids]
+    remaining = [len(stages) for _ in video_ids]
+    done_count = 0
+
+    if not video_ids:
+        return results
+
+    max_workers = sum(limits[stage] for stage in stages)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for i, video_id in enumerate(video_ids):
+            for stage in stages:
+                futures[executor.submit(run, stage, video_id)] = (i, stage)
+
+        for future in as_completed(futures):
+            i, stage = futures[future]
+            results[i][result_keys[stage]] = future.result()
+
+            remaining[i] -= 1
+            if remaining[i] == 0:
+                done_count += 1
+                if on_progress:
+                    on_progress(done_count, len(video_ids))
+
+    return results
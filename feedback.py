@@ -1,50 +1,36 @@
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import streamlit as st
 
+from db import get_connection
 
-# PostgreSQL에 접속
-def connect_postgres():
-    conn = psycopg2.connect(
-        host="15.164.112.237", 
-        database="dify", 
-        user="difyuser", 
-        password="bico0218"
-    )
-    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    
-    return conn
 
 # 피드백 저장 함수를 수정
 def save_feedback_yt(search_unique_id, title, thumbnail, script, score, feedback_text, platform):
     try:
-        conn = connect_postgres()
-        cur = conn.cursor()
+        with get_connection() as conn:
+            cur = conn.cursor()
         
-        # 피드백 테이블 생성 (없는 경우)
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS feedback_yt (
-            id SERIAL PRIMARY KEY,
-            search_unique_id INTEGER NOT NULL,
-            title TEXT NOT NULL, 
-            thumbnail TEXT NOT NULL,
-            script TEXT NOT NULL,
-            score INTEGER NOT NULL, 
-            feedback TEXT NOT NULL,
-            platform VARCHAR(15), 
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
+            # 피드백 테이블 생성 (없는 경우)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS feedback_yt (
+                id SERIAL PRIMARY KEY,
+                search_unique_id INTEGER NOT NULL,
+                title TEXT NOT NULL, 
+                thumbnail TEXT NOT NULL,
+                script TEXT NOT NULL,
+                score INTEGER NOT NULL, 
+                feedback TEXT NOT NULL,
+                platform VARCHAR(15), 
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
         
-        # 피드백 저장
-        cur.execute("""
-        INSERT INTO feedback_yt (search_unique_id, title, thumbnail, script, score, feedback, platform)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, (search_unique_id, title, thumbnail, script, score, feedback_text, platform))
+            # 피드백 저장
+            cur.execute("""
+            INSERT INTO feedback_yt (search_unique_id, title, thumbnail, script, score, feedback, platform)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (search_unique_id, title, thumbnail, script, score, feedback_text, platform))
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            cur.close()
         
         return True
     except Exception as e:
@@ -53,32 +39,30 @@ def save_feedback_yt(search_unique_id, title, thumbnail, script, score, feedback
 
 def save_feedback_ig(search_unique_id, pics, caption, hashtags, score, feedback_text):
     try:
-        conn = connect_postgres()
-        cur = conn.cursor()
+        with get_connection() as conn:
+            cur = conn.cursor()
         
-        # 피드백 테이블 생성 (없는 경우)
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS feedback_ig (
-            id SERIAL PRIMARY KEY,
-            search_unique_id INTEGER NOT NULL,
-            pics TEXT NOT NULL, 
-            caption TEXT NOT NULL,
-            hashtags TEXT NOT NULL,
-            score INTEGER NOT NULL, 
-            feedback TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
+            # 피드백 테이블 생성 (없는 경우)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS feedback_ig (
+                id SERIAL PRIMARY KEY,
+                search_unique_id INTEGER NOT NULL,
+                pics TEXT NOT NULL, 
+                caption TEXT NOT NULL,
+                hashtags TEXT NOT NULL,
+                score INTEGER NOT NULL, 
+                feedback TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
         
-        # 피드백 저장
-        cur.execute("""
-        INSERT INTO feedback_ig (search_unique_id, pics, caption, hashtags, score, feedback)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """, (search_unique_id, pics, caption, hashtags, score, feedback_text))
+            # 피드백 저장
+            cur.execute("""
+            INSERT INTO feedback_ig (search_unique_id, pics, caption, hashtags, score, feedback)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """, (search_unique_id, pics, caption, hashtags, score, feedback_text))
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            cur.close()
         
         return True
     except Exception as e:
@@ -87,34 +71,83 @@ def save_feedback_ig(search_unique_id, pics, caption, hashtags, score, feedback_
 
 def save_feedback_th(search_unique_id, post, pics, tags, score, feedback_text):
     try:
-        conn = connect_postgres()
-        cur = conn.cursor()
+        with get_connection() as conn:
+            cur = conn.cursor()
         
-        # 피드백 테이블 생성 (없는 경우)
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS feedback_th (
-            id SERIAL PRIMARY KEY,
-            search_unique_id INTEGER NOT NULL,
-            post TEXT NOT NULL, 
-            pics TEXT NOT NULL,
-            tags TEXT NOT NULL,
-            score INTEGER NOT NULL, 
-            feedback TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
+            # 피드백 테이블 생성 (없는 경우)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS feedback_th (
+                id SERIAL PRIMARY KEY,
+                search_unique_id INTEGER NOT NULL,
+                post TEXT NOT NULL, 
+                pics TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                score INTEGER NOT NULL, 
+                feedback TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
         
-        # 피드백 저장
-        cur.execute("""
-        INSERT INTO feedback_th (search_unique_id, post, pics, tags, score, feedback)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """, (search_unique_id, post, pics, tags, score, feedback_text))
+            # 피드백 저장
+            cur.execute("""
+            INSERT INTO feedback_th (search_unique_id, post, pics, tags, score, feedback)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """, (search_unique_id, post, pics, tags, score, feedback_text))
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            cur.close()
         
         return True
     except Exception as e:
         st.error(f"피드백 저장 중 오류가 발생했습니다: {str(e)}")
         return False
+
+
+# 유튜브 콘텐츠 피드백 요약 (점수 7 이상 / 4 이하 각 3개), (좋은 평가 요약, 개선 필요 요약) 반환
+def youtube_feedback_summaries():
+    with get_connection() as conn:
+        cur = conn.cursor()
+
+        # 긍정적인 평가 내용 불러오기
+        cur.execute("""
+        SELECT score, feedback, title, thumbnail, script
+        FROM feedback_yt
+        WHERE platform = 'YouTube' AND score >= 7
+        ORDER BY score DESC
+        LIMIT 3
+        """)
+        high_feedback = cur.fetchall()
+
+        # 부정적인 평가 내용 불러오기
+        cur.execute("""
+        SELECT score, feedback, title, thumbnail, script
+        FROM feedback_yt
+        WHERE platform = 'YouTube' AND score <= 4
+        ORDER BY score ASC
+        LIMIT 3
+        """)
+        low_feedback = cur.fetchall()
+
+        cur.close()
+
+    high_feedback_summary = "좋은 평가를 받은 콘텐츠의 특징:\n"
+    if high_feedback:
+        # 높은 점수 피드백의 주요 내용 통합
+        for i, (score, feedback, title, _, _) in enumerate(high_feedback):
+            high_feedback_summary += f"{i+1}. 점수 {score}/10: {feedback}\n"
+
+        # 좋은 예시 제목 추가
+        high_feedback_summary += "\n좋은 평가를 받은 제목 예시:\n"
+        for i, (_, _, title, _, _) in enumerate(high_feedback[:3]):  # 상위 3개만
+            high_feedback_summary += f"- {title}\n"
+    else:
+        high_feedback_summary += "아직 충분한 데이터가 없습니다.\n"
+
+    low_feedback_summary = "개선이 필요한 콘텐츠의 특징 (피해야 할 점):\n"
+    if low_feedback:
+        # 낮은 점수 피드백의 주요 내용 통합
+        for i, (score, feedback, _, _, _) in enumerate(low_feedback):
+            low_feedback_summary += f"{i+1}. 점수 {score}/10: {feedback}\n"
+    else:
+        low_feedback_summary += "아직 충분한 데이터가 없습니다.\n"
+
+    return high_feedback_summary, low_feedback_summary
@@ -1,20 +1,25 @@
-def generate_from_channel(client, keyword, info, llm):
+from content_parser import PLATFORM_FIELDS, json_instruction, response_format, parse_content, parse_platforms
+from llm_cache import cached_completion
+
+
+def generate_from_channel(client, keyword, info, llm, use_cache=True):
     prompt = f""""""
 
-    response = client.chat.completions.create(
+    return cached_completion(
+        client,
         model=llm, 
         messages=[
             {'role': 'system', 'content': f"당신은 카피라이팅 법칙을 따라 {keyword} 주제의 유튜브 동영상 컨텐츠를 만드는 전문가입니다."}, 
             {'role': 'user', 'content': prompt}, 
         ], 
         max_tokens=1500, 
-        temperature=0.3, 
+        temperature=0.3,
+        use_cache=use_cache,
     )
 
-    return response.choices[0].message.content.strip()
 
-
-def generate_from_keyword(client, keyword, info, llm):
+# 키워드 동영상 정보로 유튜브 콘텐츠 생성, {'title', 'thumbnail', 'script'} 반환
+def generate_from_keyword(client, keyword, info, llm, use_cache=True):
     prompt = f"""새로 만들 유튜브 동영상을 위한 제목, 썸네일 이미지 내용, 첫 2분 스크립트 내용을 생성해야 합니다.
 
     제목 및 썸네일 이미지 내용은 다음 카피라이팅 법칙 5가지를 꼭 지켜서 생성해주세요:
@@ -33,25 +38,88 @@ def generate_from_keyword(client, keyword, info, llm):
     참고할 동영상 정보:
     {info}
 
-    위 정보들을 토대로 '{keyword}'를 주제로 하고, pdf 파일 내용에 관한 동영상 제목 및 썸네일 이미지 내용 각각 3가지, 스크립트 하나를 아래 포맷대로로 생성해주세요:
-    [제목]
-    제목 3가지
-
-    [썸네일]
-    썸네일 3가지
+    위 정보들을 토대로 '{keyword}'를 주제로 하고, pdf 파일 내용에 관한 동영상 제목 및 썸네일 이미지 내용 각각 3가지, 스크립트 하나를 생성해주세요.
 
-    [스크립트]
-    첫 2분 스크립트 내용
+    {json_instruction('youtube')}
 """
 
-    response = client.chat.completions.create(
+    text = cached_completion(
+        client,
         model=llm, 
         messages=[
             {'role': 'system', 'content': "당신은 카피라이팅 법칙을 따라 유튜브 동영상 컨텐츠를 만드는 전문가입니다."}, 
             {'role': 'user', 'content': prompt}, 
         ], 
         max_tokens=1500, 
-        temperature=0.3, 
+        temperature=0.3,
+        use_cache=use_cache,
+        response_format=response_format(llm, 'youtube'),
     )
+    return parse_content(text, 'youtube')
+
+
+# # 한 번의 요청으로 유튜브/인스타그램/스레드 콘텐츠를 함께 생성 (JSON 응답) # #
+ALL_PLATFORMS_MAX_TOKENS = 4000  # 플랫폼별 요청(각 1500)보다 작게, 세 가지 결과가 모두 들어갈 만큼
+
+
+def all_platforms_messages(source_label, source_text, keyword, notes=None):
+    prompt = f"""아래 {source_label}을 토대로 '{keyword}'를 주제로 한 유튜브, 인스타그램, 스레드 콘텐츠를 한 번에 생성해야 합니다.
+
+    [공통 글쓰기 법칙]
+    1. SHORT & SIMPLE (짧고 간결하게, 핵심 먼저)
+    2. HOOK & FLOW (후킹 → 자연스러운 흐름)
+    3. YOU-FOCUSED (독자 중심, 독자의 이익 강조)
+    4. CREDIBILITY & ACTION (신뢰도 확보 + 행동 유도)
+
+    [유튜브]
+    동영상 제목 3가지, 썸네일 이미지 내용 3가지, 첫 2분 스크립트 하나를 생성해주세요.
+    제목 및 썸네일은 다음 카피라이팅 법칙 5가지를 꼭 지켜주세요:
+    1. NUMBERS (구체적 숫자 / 전후 비교)
+    2. ONE & ONLY (하나만 지키면 된다 / 단 하나의 비밀)
+    3. SHOCK & HOOK (충격·호기심 + 짧고 강렬한 표현)
+    4. AUTHORITY (전문가·유명인 인용, 권위 부여)
+    5. URGENCY (시급성·즉시성)
+
+    [인스타그램]
+    사진 구성, 게시글(캡션), 해시태그를 생성해주세요.
+    - 비주얼 중심: 선명하고 매력적인 사진, 통일된 스타일
+    - 간결하고 강렬한 캡션: 첫 문장에 질문, 도발적인 문구, 놀라운 사실로 후킹
+    - 해시태그: 관련 인기 해시태그와 브랜딩 해시태그
+    - 댓글/질문을 유도하는 콜 투 액션(CTA) 포함, 일관된 톤 유지
+
+    [스레드]
+    게시글, 게시글을 돋보이게 할 이미지 내용, 태그를 생성해주세요.
+    - 짧은 글로 강렬한 핵심 메시지, 첫 문장은 질문/도발적인 주장/놀라운 사실로 시작
+    - 불필요한 단어 없이 간결하게, 이모지 등 시각적 요소 활용
+    - 독자에게 질문을 던지거나 의견을 유도하는 CTA 포함
 
-    return response.choices[0].message.content.strip()
+    {notes or ''}
+
+    {source_label}:
+    {source_text}
+
+    {json_instruction(tuple(PLATFORM_FIELDS))}
+"""
+
+    return [
+        {'role': 'system', 'content': "당신은 카피라이팅 법칙을 따라 주어진 자료에 기반하여 유튜브, 인스타그램, 스레드 콘텐츠를 만드는 전문가입니다."},
+        {'role': 'user', 'content': prompt},
+    ]
+
+
+# 세 플랫폼 콘텐츠를 한 번의 요청으로 생성 (원본 자료는 한 번만 전송)
+def generate_all_platforms(client, source_label, source_text, keyword, llm, notes=None, use_cache=True):
+    """
+    {'youtube': {'title', 'thumbnail', 'script'}, 'instagram': {'pics', 'caption', 'hashtags'},
+     'threads': {'post', 'pics', 'tags'}} 반환. JSON이 아니거나 비어 있는 플랫폼이 있으면 ContentParseError
+    """
+    text = cached_completion(
+        client,
+        model=llm,
+        messages=all_platforms_messages(source_label, source_text, keyword, notes),
+        max_tokens=ALL_PLATFORMS_MAX_TOKENS,
+        temperature=0.3,
+        use_cache=use_cache,
+        response_format=response_format(llm, tuple(PLATFORM_FIELDS)),
+    )
+    return parse_platforms(text, tuple(PLATFORM_FIELDS))
@@ -0,0 +1,77 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import TTLCache
+
+
+# # 외부 웹 요청용 공용 HTTP 클라이언트 (커넥션 재사용 + 타임아웃 + 재시도 + 조건부 요청) # #
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_session = None
+_session_lock = threading.Lock()
+
+# URL별 마지막 응답 (ETag/Last-Modified 조건부 요청에 사용)
+_responses = TTLCache(maxsize=256, ttl=24 * 60 * 60)
+
+
+# 공용 세션 (호스트별 keep-alive 커넥션 풀)
+def get_session():
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=3,
+                    connect=3,
+                    read=2,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'HEAD']),
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+
+                session = requests.Session()
+                session.headers['User-Agent'] = USER_AGENT
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+
+    return _session
+
+
+# GET 요청 (conditional=True면 이전 응답의 ETag/Last-Modified로 재검증하고, 304면 이전 응답을 그대로 반환)
+def get(url, headers=None, timeout=DEFAULT_TIMEOUT, conditional=True, **kwargs):
+    request_headers = dict(headers or {})
+
+    cached = _responses.get(url) if conditional else None
+    if cached is not None:
+        if cached.headers.get('ETag'):
+            request_headers['If-None-Match'] = cached.headers['ETag']
+        if cached.headers.get('Last-Modified'):
+            request_headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+    response = get_session().get(url, headers=request_headers, timeout=timeout, **kwargs)
+
+    if response.status_code == 304 and cached is not None:
+        return cached
+
+    if conditional and response.ok and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+        response.content  # 본문을 읽어둬야 나중에 다시 반환할 수 있음
+        _responses.set(url, response)
+
+    return response
+
+
+# HEAD 요청
+def head(url, headers=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return get_session().head(url, headers=headers, timeout=timeout, **kwargs)
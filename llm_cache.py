@@ -0,0 +1,170 @@
+import hashlib
+import json
+import threading
+
+from cache import TTLCache
+from db import get_connection, register_migration
+
+
+# # LLM 응답 캐시 (메모리 LRU + PostgreSQL) # #
+# 같은 (model, messages, temperature, max_tokens) 요청은 API를 다시 호출하지 않고 저장된 응답을 반환
+LLM_CACHE_TTL = 30 * 24 * 60 * 60  # 응답 보관 기간(초)
+
+_memory = TTLCache(maxsize=1024, ttl=LLM_CACHE_TTL)
+_stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'saved_tokens': 0}
+_stats_lock = threading.Lock()
+
+register_migration('llm_cache_table', """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    total_tokens INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+""")
+
+
+# 요청 내용으로 캐시 키 생성
+def cache_key(model, messages, temperature, max_tokens, response_format=None):
+    request = {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens}
+    if response_format is not None:  # 기존 캐시 키가 바뀌지 않도록 있을 때만 포함
+        request['response_format'] = response_format
+    payload = json.dumps(request, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _count(key, tokens=0):
+    with _stats_lock:
+        _stats[key] += 1
+        _stats['saved_tokens'] += tokens
+
+
+def _load(key):
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            SELECT response, total_tokens FROM llm_cache
+            WHERE cache_key = %s AND created_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+            """, (key, LLM_CACHE_TTL))
+            row = cur.fetchone()
+            cur.close()
+            return row
+    except Exception as e:
+        print(f'LLM 캐시 조회 중 오류 발생: {str(e)}')
+        return None
+
+
+def _store(key, model, response, total_tokens):
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            INSERT INTO llm_cache (cache_key, model, response, total_tokens)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (cache_key)
+            DO UPDATE SET response = EXCLUDED.response, total_tokens = EXCLUDED.total_tokens, created_at = CURRENT_TIMESTAMP
+            """, (key, model, response, total_tokens))
+            cur.close()
+    except Exception as e:
+        print(f'LLM 캐시 저장 중 오류 발생: {str(e)}')
+
+
+# chat.completions 요청 후 응답 텍스트 반환 (캐시 우선)
+def cached_completion(client, model, messages, temperature, max_tokens, use_cache=True, create=None, response_format=None):
+    """
+    use_cache: False면 캐시를 읽지 않고 새로 요청 (결과는 캐시에 갱신)
+    create: 실제 요청 함수 (기본값 client.chat.completions.create, 속도 제한이 필요하면 llm_scheduler.create_completion 등)
+    response_format: JSON 응답이 필요하면 {'type': 'json_object'} 등
+    """
+    key = cache_key(model, messages, temperature, max_tokens, response_format)
+
+    if use_cache:
+        cached = _memory.get(key)
+        if cached is not None:
+            _count('memory_hits', cached[1])
+            return cached[0]
+
+        row = _load(key)
+        if row is not None:
+            _memory.set(key, row)
+            _count('db_hits', row[1])
+            return row[0]
+
+    _count('misses')
+
+    create = create or client.chat.completions.create
+    kwargs = {'response_format': response_format} if response_format is not None else {}
+    response = create(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+    text = response.choices[0].message.content.strip()
+    usage = getattr(response, 'usage', None)
+    total_tokens = usage.total_tokens if usage else 0
+
+    _memory.set(key, (text, total_tokens))
+    _store(key, model, text, total_tokens)
+    return text
+
+
+# stream=True로 요청해 응답 텍스트를 조각 단위로 반환 (캐시에 있으면 한 번에 반환)
+def stream_completion(client, model, messages, temperature, max_tokens, use_cache=True):
+    """
+    스트림이 끝까지 읽히면 전체 텍스트를 cached_completion과 같은 키로 저장
+    중간에 중단된 응답은 저장하지 않음
+    """
+    key = cache_key(model, messages, temperature, max_tokens)
+
+    if use_cache:
+        cached = _memory.get(key)
+        if cached is None:
+            cached = _load(key)
+            if cached is not None:
+                _memory.set(key, cached)
+                _count('db_hits', cached[1])
+        else:
+            _count('memory_hits', cached[1])
+
+        if cached is not None:
+            yield cached[0]
+            return
+
+    _count('misses')
+
+    stream = client.chat.completions.create(
+        model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+        stream=True, stream_options={'include_usage': True}
+    )
+
+    chunks = []
+    total_tokens = 0
+    for chunk in stream:
+        if chunk.usage:
+            total_tokens = chunk.usage.total_tokens
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            # 앞쪽 공백은 cached_completion의 strip()과 맞추기 위해 제거
+            if not chunks:
+                delta = delta.lstrip()
+                if not delta:
+                    continue
+            chunks.append(delta)
+            yield delta
+
+    text = ''.join(chunks).strip()
+    _memory.set(key, (text, total_tokens))
+    _store(key, model, text, total_tokens)
+
+
+# 캐시 적중/미적중 횟수와 절약한 토큰 수
+def cache_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['memory_size'] = len(_memory)
+    return stats
+
+
+# 메모리 캐시 비우기 (DB에 저장된 응답은 유지)
+def clear_memory_cache():
+    _memory.clear()
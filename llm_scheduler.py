@@ -0,0 +1,144 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import openai
+
+
+# # OpenAI 요청 동시 실행 스케줄러 (분당 요청 수/토큰 수 제한 + 재시도) # #
+OPENAI_RPM = int(os.getenv('OPENAI_RPM', 500))  # 분당 최대 요청 수
+OPENAI_TPM = int(os.getenv('OPENAI_TPM', 30000))  # 분당 최대 토큰 수
+OPENAI_MAX_WORKERS = int(os.getenv('OPENAI_MAX_WORKERS', 4))  # 동시에 보내는 요청 수
+
+IMAGE_TOKENS = 765  # 이미지 1장당 예상 토큰 수 (gpt-4o, 512px 타일 기준)
+MAX_RETRIES = 5
+BASE_DELAY = 1.0  # 재시도 대기 시간 기준값(초)
+MAX_DELAY = 30.0
+
+
+# 1분 구간 안의 요청 수와 토큰 수를 제한
+class RateLimiter:
+    def __init__(self, rpm=OPENAI_RPM, tpm=OPENAI_TPM, window=60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self._events = deque()  # [요청 시각, 토큰 수]
+        self._tokens = 0
+        self._cond = threading.Condition()
+
+    def _expire(self, now):
+        while self._events and now - self._events[0][0] >= self.window:
+            self._tokens -= self._events.popleft()[1]
+
+    # 요청 1건과 tokens만큼의 예산이 생길 때까지 대기 후 예약. 예약 항목 반환
+    def acquire(self, tokens):
+        tokens = min(tokens, self.tpm)  # 한도보다 큰 요청도 언젠가는 보낼 수 있도록
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if len(self._events) < self.rpm and self._tokens + tokens <= self.tpm:
+                    event = [now, tokens]
+                    self._events.append(event)
+                    self._tokens += tokens
+                    return event
+                wait = self._events[0][0] + self.window - now if self._events else 0.1
+                self._cond.wait(timeout=max(wait, 0.05))
+
+    # 실제 사용한 토큰 수로 예약량 보정
+    def settle(self, event, actual_tokens):
+        with self._cond:
+            if event in self._events:
+                self._tokens += actual_tokens - event[1]
+                event[1] = actual_tokens
+            self._cond.notify_all()
+
+
+_default_limiter = None
+_limiter_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 기본 RateLimiter
+def get_limiter():
+    global _default_limiter
+
+    if _default_limiter is None:
+        with _limiter_lock:
+            if _default_limiter is None:
+                _default_limiter = RateLimiter()
+
+    return _default_limiter
+
+
+# 메시지와 max_tokens로 요청 토큰 수 추정 (한글은 글자당 1토큰 정도로 계산)
+def estimate_tokens(messages, max_tokens):
+    tokens = max_tokens
+    for message in messages:
+        content = message['content']
+        if isinstance(content, str):
+            tokens += len(content)
+        else:
+            for part in content:
+                if part.get('type') == 'image_url':
+                    tokens += IMAGE_TOKENS
+                else:
+                    tokens += len(part.get('text', ''))
+    return tokens
+
+
+# 재시도할 오류인지 (429, 5xx, 연결 오류)
+def _is_retryable(error):
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+# 재시도 대기 시간 (지수 백오프 + full jitter, 서버가 알려준 retry-after 우선)
+def _backoff(attempt, error):
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after) + random.uniform(0, BASE_DELAY)
+        except ValueError:
+            pass
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+
+
+# 한도 안에서 chat.completions 요청을 보내고, 429/5xx면 재시도
+def create_completion(client, limiter=None, max_retries=MAX_RETRIES, **kwargs):
+    limiter = limiter or get_limiter()
+    estimated = estimate_tokens(kwargs['messages'], kwargs.get('max_tokens', 0))
+
+    for attempt in range(max_retries + 1):
+        event = limiter.acquire(estimated)
+        try:
+            response = client.chat.completions.create(**kwargs)
+        except Exception as e:
+            limiter.settle(event, estimated)
+            if attempt == max_retries or not _is_retryable(e):
+                raise
+            time.sleep(_backoff(attempt, e))
+            continue
+
+        usage = getattr(response, 'usage', None)
+        limiter.settle(event, usage.total_tokens if usage else estimated)
+        return response
+
+
+# 여러 작업을 동시에 실행하고 끝나는 순서대로 (key, 결과) 반환
+def run_concurrently(jobs, max_workers=OPENAI_MAX_WORKERS):
+    """
+    jobs: (key, 인자 없는 함수) 리스트
+    각 함수는 별도 스레드에서 실행되며, 예외는 호출한 쪽에서 처리해야 함
+    """
+    if not jobs:
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(func): key for key, func in jobs}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+
+# # 동영상 참여도 지표 계산 모듈 (load_info DataFrame 기준) # #
+
+# load_info가 반환하는 컬럼 이름
+INFO_COLUMNS = {
+    'views': '조회수',
+    'likes': '좋아요',
+    'comments': '댓글수',
+    'ratio': '조회수/구독자 비율',
+    'shorts': '쇼츠',
+    'channel': '채널명',
+}
+
+# fetch_youtube_data가 반환하는 컬럼 이름
+FETCH_COLUMNS = {
+    'views': 'views',
+    'likes': 'likes',
+    'comments': 'comments',
+    'ratio': 'view_sub_ratio',
+    'shorts': 'is_shorts',
+    'channel': 'channel',
+}
+
+# add_video_metrics가 추가하는 컬럼 이름
+LIKE_RATE = '좋아요/조회수(%)'
+COMMENT_RATE = '댓글/조회수(%)'
+ENGAGEMENT_RATE = '참여율(%)'
+RATIO_PERCENTILE = '조회수/구독자 비율 백분위'  # 같은 쇼츠/롱폼 그룹 안에서의 백분위
+VIEWS_ZSCORE = '조회수 z-score'  # 같은 채널 영상 평균 대비 (채널 영상이 2개 미만이면 NaN)
+ENGAGEMENT_ZSCORE = '참여율 z-score'  # 같은 채널 영상 평균 대비 (채널 영상이 2개 미만이면 NaN)
+TYPE_VIEWS_ZSCORE = '쇼츠/롱폼 그룹 조회수 z-score'  # 같은 쇼츠/롱폼 그룹 전체 평균 대비 (키워드 검색 결과용)
+
+_ALL_METRICS = (LIKE_RATE, COMMENT_RATE, ENGAGEMENT_RATE, RATIO_PERCENTILE, VIEWS_ZSCORE, ENGAGEMENT_ZSCORE, TYPE_VIEWS_ZSCORE)
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+# 0으로 나누는 경우 0을 반환하는 나눗셈 (백분율)
+def _rate(numerator, denominator):
+    out = np.zeros_like(numerator, dtype=float)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out * 100
+
+
+# 그룹 평균/표준편차 대비 z-score. 그룹 영상이 2개 미만이면 비교 대상이 없으므로 NaN, 표준편차가 0이면 0
+def _zscore(values, groups):
+    grouped = pd.Series(values).groupby(groups.to_numpy())
+    mean = grouped.transform('mean').to_numpy()
+    std = grouped.transform('std', ddof=0).to_numpy()
+    comparable = grouped.transform('count').to_numpy() >= 2
+    out = np.where(comparable, 0.0, np.nan)
+    np.divide(values - mean, std, out=out, where=comparable & (std > 0))
+    return out
+
+
+# 동영상별 참여도 지표 컬럼을 추가한 복사본 반환
+def add_video_metrics(df, columns=INFO_COLUMNS):
+    """
+    좋아요/조회수, 댓글/조회수, 참여율((좋아요+댓글)/조회수)은 백분율,
+    조회수/구독자 비율 백분위는 같은 쇼츠/롱폼 그룹 안에서 0~100,
+    조회수/참여율 z-score는 같은 채널 영상들의 평균 대비 값 (채널 영상이 2개 미만이면 NaN),
+    쇼츠/롱폼 그룹 조회수 z-score는 같은 그룹 전체 평균 대비 값
+    """
+    df = df.copy()
+    if df.empty:
+        for column in _ALL_METRICS:
+            df[column] = pd.Series(dtype=float)
+        return df
+
+    views = df[columns['views']].to_numpy(dtype=float)
+    likes = df[columns['likes']].to_numpy(dtype=float)
+    comments = df[columns['comments']].to_numpy(dtype=float)
+    channels = df[columns['channel']]
+    is_shorts = (df[columns['shorts']] == True).to_numpy()
+
+    df[LIKE_RATE] = _rate(likes, views)
+    df[COMMENT_RATE] = _rate(comments, views)
+    df[ENGAGEMENT_RATE] = _rate(likes + comments, views)
+    df[RATIO_PERCENTILE] = df[columns['ratio']].groupby(is_shorts).rank(pct=True).to_numpy() * 100
+    df[VIEWS_ZSCORE] = _zscore(views, channels)
+    df[ENGAGEMENT_ZSCORE] = _zscore(df[ENGAGEMENT_RATE].to_numpy(), channels)
+    df[TYPE_VIEWS_ZSCORE] = _zscore(views, pd.Series(is_shorts))
+
+    return df
+
+
+# 영상 묶음 하나의 요약 통계
+def summarize(df, columns=INFO_COLUMNS):
+    """
+    add_video_metrics를 거치지 않은 DataFrame이면 지표를 먼저 계산
+    영상이 없으면 count만 0인 딕셔너리 반환
+    """
+    if df.empty:
+        return {'count': 0}
+
+    if ENGAGEMENT_RATE not in df.columns:
+        df = add_video_metrics(df, columns)
+
+    views = df[columns['views']]
+    likes = df[columns['likes']]
+    comments = df[columns['comments']]
+    ratio = df[columns['ratio']]
+
+    summary = {
+        'count': len(df),
+        'channel_count': df[columns['channel']].nunique(),
+        'mean_views': views.mean(),
+        'mean_likes': likes.mean(),
+        'mean_comments': comments.mean(),
+        'mean_ratio': ratio.mean(),
+        'max_views': views.max(),
+        'max_likes': likes.max(),
+        'max_comments': comments.max(),
+        'mean_like_rate': df[LIKE_RATE].mean(),
+        'mean_comment_rate': df[COMMENT_RATE].mean(),
+        'mean_engagement_rate': df[ENGAGEMENT_RATE].mean(),
+        'max_engagement_rate': df[ENGAGEMENT_RATE].max(),
+    }
+    for p, value in zip(PERCENTILES, np.percentile(ratio.to_numpy(dtype=float), PERCENTILES)):
+        summary[f'ratio_p{p}'] = value
+
+    return summary
+
+
+# 쇼츠/롱폼으로 나눈 요약 통계 {'shorts': {...}, 'longform': {...}}
+def split_summary(df, columns=INFO_COLUMNS):
+    df = add_video_metrics(df, columns)
+    is_shorts = df[columns['shorts']] == True
+    return {
+        'shorts': summarize(df[is_shorts], columns),
+        'longform': summarize(df[~is_shorts], columns),
+    }
+
+
+# 기준 컬럼 상위 n개 영상을 딕셔너리 리스트로 반환
+def top_videos(df, by, n=3, columns=INFO_COLUMNS):
+    if ENGAGEMENT_RATE not in df.columns:
+        df = add_video_metrics(df, columns)
+    return df.nlargest(n, by).to_dict('records')
@@ -0,0 +1,124 @@
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+from cache import TTLCache
+
+
+# # PDF 텍스트 추출 (페이지 단위 지연 추출 + 큰 문서는 프로세스 병렬 + SHA-256 캐시) # #
+PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', os.path.join('.cache', 'pdf_text'))  # 추출한 텍스트를 저장할 폴더
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', min(os.cpu_count() or 1, 4)))  # 병렬 추출 프로세스 수
+PARALLEL_MIN_PAGES = 40  # 이 페이지 수 이상이면 프로세스 병렬 추출
+
+_memory = TTLCache(maxsize=32, ttl=60 * 60)
+
+
+# 업로드 파일(또는 파일 객체/바이트)의 내용을 바이트로 읽기
+def read_bytes(pdf_file):
+    if isinstance(pdf_file, bytes):
+        return pdf_file
+    if hasattr(pdf_file, 'getvalue'):  # streamlit UploadedFile, BytesIO
+        return pdf_file.getvalue()
+
+    position = pdf_file.tell()
+    pdf_file.seek(0)
+    data = pdf_file.read()
+    pdf_file.seek(position)
+    return data
+
+
+def file_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# 페이지 텍스트를 하나씩 반환 (필요한 만큼만 추출)
+def iter_pages(data, start=0, stop=None):
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    for page in reader.pages[start:stop]:
+        yield page.extract_text() or ''
+
+
+# 프로세스 풀 작업 단위 (워커에서 바이트로 다시 열어서 구간 추출)
+def _extract_range(data, start, stop):
+    return list(iter_pages(data, start, stop))
+
+
+# 페이지 구간을 워커 수만큼 나눠 병렬 추출
+def _extract_parallel(data, page_count, workers):
+    size = -(-page_count // workers)
+    ranges = [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(_extract_range, data, start, stop) for start, stop in ranges]
+        return [text for future in futures for text in future.result()]
+
+
+def _cache_path(digest):
+    return os.path.join(PDF_CACHE_DIR, f'{digest}.txt')
+
+
+def _load_cached(digest):
+    text = _memory.get(digest)
+    if text is not None:
+        return text
+
+    try:
+        with open(_cache_path(digest), encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return None
+
+    _memory.set(digest, text)
+    return text
+
+
+def _save_cached(digest, text):
+    _memory.set(digest, text)
+    try:
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        path = _cache_path(digest)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f'PDF 텍스트 캐시 저장 중 오류 발생: {str(e)}')
+
+
+# PDF 전체(또는 max_chars까지) 텍스트 추출
+def extract_text(pdf_file, max_chars=None, workers=PDF_WORKERS):
+    """
+    같은 파일(SHA-256 기준)은 메모리/디스크 캐시에서 바로 반환
+    max_chars가 있으면 그 길이에 도달하는 페이지까지만 추출 (이 경우 결과는 캐시하지 않음)
+    max_chars 없이 PARALLEL_MIN_PAGES 이상이면 workers개 프로세스로 나눠 추출
+    """
+    data = read_bytes(pdf_file)
+    digest = file_hash(data)
+
+    text = _load_cached(digest)
+    if text is not None:
+        return text[:max_chars] if max_chars else text
+
+    if max_chars:
+        pages = []
+        length = 0
+        for page_text in iter_pages(data):
+            pages.append(page_text)
+            length += len(page_text)
+            if length >= max_chars:
+                return ''.join(pages)[:max_chars]
+        text = ''.join(pages)
+        _save_cached(digest, text)  # 끝까지 읽었으면 전체 텍스트이므로 캐시
+        return text
+
+    page_count = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+    if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+        pages = _extract_parallel(data, page_count, workers)
+    else:
+        pages = iter_pages(data)
+
+    text = ''.join(pages)
+    _save_cached(digest, text)
+    return text
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+
+from cache import TTLCache
+from pdf_extract import PDF_CACHE_DIR
+
+
+# # PDF 텍스트 검색 인덱스 (청크 + 문자 n-gram 해시 TF-IDF 벡터, 코사인 유사도 top-k) # #
+CHUNK_SIZE = 800  # 청크 길이(글자)
+CHUNK_OVERLAP = 100  # 앞 청크와 겹치는 길이(글자)
+VECTOR_DIM = 2 ** 12  # n-gram 해시 버킷 수
+NGRAM_SIZES = (2, 3)  # 한글은 띄어쓰기/조사 때문에 단어보다 글자 n-gram이 잘 맞음
+CONTEXT_TOKENS = 3000  # 프롬프트에 넣을 PDF 내용 예산 (llm_scheduler.estimate_tokens처럼 글자 수로 계산)
+
+_HASH_BASE = 1_000_003
+_whitespace = re.compile(r'\s+')
+_boundary = re.compile(r'[.!?。]\s|\n')
+
+_memory = TTLCache(maxsize=8, ttl=60 * 60)
+
+
+# 텍스트를 겹치는 청크로 나누고 (start, end) 위치 배열 반환 (가능하면 문장/줄 경계에서 자름)
+def chunk_offsets(text, size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    offsets = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            boundaries = [m.end() for m in _boundary.finditer(text, start + size // 2, end)]
+            if boundaries:
+                end = boundaries[-1]
+            else:
+                space = text.rfind(' ', start + size // 2, end)
+                end = space + 1 if space != -1 else end
+        offsets.append((start, end))
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return np.array(offsets, dtype=np.int64).reshape(-1, 2)
+
+
+# 문자 n-gram 해시 버킷 번호 (문자 코드로 다항식 해시, 프로세스가 달라도 같은 값)
+def _ngram_buckets(text):
+    codes = np.frombuffer(_whitespace.sub(' ', text.lower()).encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    buckets = []
+    for n in NGRAM_SIZES:
+        if len(codes) < n:
+            continue
+        h = np.zeros(len(codes) - n + 1, dtype=np.int64)
+        for i in range(n):
+            h = (h * _HASH_BASE + codes[i:len(codes) - n + 1 + i]) % (2 ** 31 - 1)
+        buckets.append(h % VECTOR_DIM)
+    return np.concatenate(buckets) if buckets else np.zeros(0, dtype=np.int64)
+
+
+def _counts(texts):
+    matrix = np.zeros((len(texts), VECTOR_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        matrix[row] = np.bincount(_ngram_buckets(text), minlength=VECTOR_DIM)
+    return matrix
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class PdfIndex:
+    def __init__(self, text, offsets, vectors, idf):
+        self.text = text
+        self.offsets = offsets
+        self.vectors = vectors
+        self.idf = idf
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def chunk(self, i):
+        start, end = self.offsets[i]
+        return self.text[start:end]
+
+    # 질의와 코사인 유사도가 높은 순서로 (청크 번호, 점수) top-k
+    def search(self, query, k=5):
+        q = _normalize(np.log1p(_counts([query])[0]) * self.idf)
+        if not len(self) or not q.any():
+            return []
+
+        scores = self.vectors @ q
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    # 예산 안에서 질의와 가까운 청크를 골라 문서 순서대로 이어붙인 텍스트
+    def select(self, query, max_tokens=CONTEXT_TOKENS):
+        """
+        질의가 비었거나 겹치는 n-gram이 없으면 문서 앞부분을 예산만큼 반환 (기존 [:3000]과 같음)
+        """
+        ranked = self.search(query, k=len(self))
+        if not ranked or ranked[0][1] <= 0:
+            return self.text[:max_tokens]
+
+        selected = []
+        used = 0
+        for i, score in ranked:
+            if score <= 0:
+                break
+            length = self.offsets[i][1] - self.offsets[i][0]
+            if used + length > max_tokens:
+                continue
+            selected.append(i)
+            used += length
+
+        if not selected:  # 가장 가까운 청크 하나도 예산보다 크면 잘라서 사용
+            return self.chunk(ranked[0][0])[:max_tokens]
+
+        return '\n...\n'.join(self.chunk(i).strip() for i in sorted(selected))
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _index_path(digest):
+    return os.path.join(PDF_CACHE_DIR, f'{digest}.npz')
+
+
+# 인덱스 생성
+def build_index(text):
+    offsets = chunk_offsets(text)
+    counts = _counts([text[start:end] for start, end in offsets])
+
+    df = np.count_nonzero(counts, axis=0)
+    idf = (np.log((1 + len(counts)) / (1 + df)) + 1).astype(np.float32)
+    vectors = _normalize(np.log1p(counts) * idf)
+
+    return PdfIndex(text, offsets, vectors, idf)
+
+
+# 텍스트의 인덱스 반환 (텍스트 해시 기준으로 메모리/디스크에 저장해 문서당 한 번만 생성)
+def get_index(text):
+    digest = text_hash(text)
+
+    index = _memory.get(digest)
+    if index is not None:
+        return index
+
+    path = _index_path(digest)
+    try:
+        with np.load(path) as data:
+            index = PdfIndex(text, data['offsets'], data['vectors'], data['idf'])
+    except (OSError, KeyError, ValueError):
+        index = build_index(text)
+        try:
+            os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                np.savez_compressed(f, offsets=index.offsets, vectors=index.vectors, idf=index.idf)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f'PDF 인덱스 저장 중 오류 발생: {str(e)}')
+
+    _memory.set(digest, index)
+    return index
+
+
+# 키워드와 관련된 PDF 내용을 예산 안에서 선택
+def select_context(text, keyword, max_tokens=CONTEXT_TOKENS):
+    if len(text) <= max_tokens:
+        return text
+    return get_index(text).select(keyword, max_tokens=max_tokens)
@@ -1,17 +1,16 @@
-import PyPDF2
+from content_parser import json_instruction, response_format, parse_content
+from generate_contents import generate_all_platforms
+from llm_cache import cached_completion
+from pdf_extract import extract_text
+from pdf_index import select_context
 
 
-def extract_text_from_pdf(pdf_file):
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    
-    for page_num in range(len(pdf_reader.pages)):
-        page = pdf_reader.pages[page_num]
-        text += page.extract_text()
-    
-    return text
+# PDF 텍스트 추출 (같은 파일은 캐시에서 반환, max_chars가 있으면 그만큼만 추출)
+def extract_text_from_pdf(pdf_file, max_chars=None):
+    return extract_text(pdf_file, max_chars=max_chars)
 
-def generate_from_pdf2youtube(client, pdf_text, keyword, llm):
+# PDF 내용으로 유튜브 콘텐츠 생성, {'title', 'thumbnail', 'script'} 반환
+def generate_from_pdf2youtube(client, pdf_text, keyword, llm, use_cache=True):
     prompt = f"""새로 만들 유튜브 동영상을 위한 제목, 썸네일 이미지 내용, 첫 2분 스크립트 내용을 생성해야 합니다.
 
     제목 및 썸네일 이미지 내용은 다음 카피라이팅 법칙 5가지를 꼭 지켜서 생성해주세요:
@@ -28,35 +27,30 @@ def generate_from_pdf2youtube(client, pdf_text, keyword, llm):
     4. CREDIBILITY & ACTION (신뢰도 확보 + 행동 유도)
 
     PDF 내용:
-    {pdf_text[:3000]}
+    {select_context(pdf_text, keyword)}
 
     위 정보들을 토대로 '{keyword}'를 주제로 하고, pdf 파일 내용에 관한 동영상 제목 및 썸네일 이미지 내용 각각 3가지, 스크립트 하나를 생성해주세요.
 
-    꼭 아래 포맷대로 생성 해주세요:
-    [제목]
-    제목 3가지
-
-    [썸네일]
-    썸네일 3가지
-
-    [스크립트]
-    첫 2분 스크립트 내용
+    {json_instruction('youtube')}
 """
 
-    response = client.chat.completions.create(
+    text = cached_completion(
+        client,
         model=llm, 
         messages=[
             {'role': 'system', 'content': "당신은 카피라이팅 법칙을 따라 pdf 내용에 기반하여 유튜브 동영상 컨텐츠를 만드는 전문가입니다."}, 
             {'role': 'user', 'content': prompt}
         ], 
         max_tokens=1500, 
-        temperature=0.3, 
+        temperature=0.3,
+        use_cache=use_cache,
+        response_format=response_format(llm, 'youtube'),
     )
+    return parse_content(text, 'youtube')
 
-    return response.choices[0].message.content.strip()
 
-
-def generate_from_pdf2instagram(client, pdf_text, keyword, llm):
+# PDF 내용으로 인스타그램 콘텐츠 생성, {'pics', 'caption', 'hashtags'} 반환
+def generate_from_pdf2instagram(client, pdf_text, keyword, llm, use_cache=True):
     prompt = f"""Instagram 콘텐츠를 작성하고자 합니다.
 
         인스타그램은 사진과 영상이 핵심인 시각적 플랫폼이지만, 게시글(캡션)과 해시태그 역시 매우 중요합니다. 아래 핵심 요소들을 게시글에 반영해 주세요:
@@ -87,30 +81,30 @@ def generate_from_pdf2instagram(client, pdf_text, keyword, llm):
         4. CREDIBILITY & ACTION (신뢰도 확보 + 행동 유도)
 
     PDF 내용:
-    {pdf_text[:3000]}
-
-    위 정보들을 토대로 '{keyword}'를 주제로 하고, pdf 파일 내용에 관한 인스타그램 게시물을 아래 포맷에 맞춰 생성해 주세요:
-    [사진]
+    {select_context(pdf_text, keyword)}
 
-    [게시글]
+    위 정보들을 토대로 '{keyword}'를 주제로 하고, pdf 파일 내용에 관한 인스타그램 게시물을 생성해 주세요.
 
-    [해시 태그]
+    {json_instruction('instagram')}
 """
 
-    response = client.chat.completions.create(
+    text = cached_completion(
+        client,
         model=llm, 
         messages=[
             {'role': 'system', 'content': "당신은 카피라이팅 법칙을 따라 pdf 내용에 기반하여 인스타그램 콘텐츠를 만드는 전문가입니다."}, 
             {'role': 'user', 'content': prompt}
         ], 
         max_tokens=1500, 
-        temperature=0.3, 
+        temperature=0.3,
+        use_cache=use_cache,
+        response_format=response_format(llm, 'instagram'),
     )
+    return parse_content(text, 'instagram')
 
-    return response.choices[0].message.content.strip()
 
-
-def generate_from_pdf2threads(client, pdf_text, keyword, llm):
+# PDF 내용으로 스레드 콘텐츠 생성, {'post', 'pics', 'tags'} 반환
+def generate_from_pdf2threads(client, pdf_text, keyword, llm, use_cache=True):
     prompt = f"""Threads 콘텐츠를 작성하고자 합니다.
 
     게시글에는 다음과 같은 핵심 요소가 반드시 포함되어야 합니다:
@@ -128,24 +122,28 @@ def generate_from_pdf2threads(client, pdf_text, keyword, llm):
     4. CREDIBILITY & ACTION (신뢰도 확보 + 행동 유도)
 
     PDF 내용:
-    {pdf_text[:3000]}
-
-    위 정보들을 토대로 '{keyword}'를 주제로 하고, pdf 파일 내용에 관한 Threads 게시물을 아래 포맷에 맞춰 생성해주세요:
-    [게시글]
+    {select_context(pdf_text, keyword)}
 
-    [사진]
+    위 정보들을 토대로 '{keyword}'를 주제로 하고, pdf 파일 내용에 관한 Threads 게시물을 생성해주세요.
 
-    [태그]
+    {json_instruction('threads')}
 """
 
-    response = client.chat.completions.create(
+    text = cached_completion(
+        client,
         model=llm, 
         messages=[
             {'role': 'system', 'content': "당신은 카피라이팅 법칙을 따라 pdf 내용에 기반하여 스레드 컨텐츠를 만드는 전문가입니다."}, 
             {'role': 'user', 'content': prompt}
         ], 
         max_tokens=1500, 
-        temperature=0.3, 
+        temperature=0.3,
+        use_cache=use_cache,
+        response_format=response_format(llm, 'threads'),
     )
+    return parse_content(text, 'threads')
+
 
-    return response.choices[0].message.content.strip()
+# 유튜브/인스타그램/스레드 콘텐츠를 한 번의 요청으로 생성
+def generate_from_pdf2all(client, pdf_text, keyword, llm, use_cache=True):
+    return generate_all_platforms(client, "PDF 내용", select_context(pdf_text, keyword), keyword, llm, use_cache=use_cache)
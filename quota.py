@@ -0,0 +1,208 @@
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from db import get_connection, register_migration
+
+
+# # YouTube Data API 할당량 계산 및 제한 # #
+DAILY_QUOTA = int(os.getenv('YOUTUBE_DAILY_QUOTA', 10000))  # 하루 할당량 (유닛)
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')  # 할당량은 태평양 시간 자정에 초기화됨
+SYNC_INTERVAL = 60  # 다른 프로세스 사용량을 DB에서 다시 읽어오는 간격(초)
+
+# 메서드별 비용 (https://developers.google.com/youtube/v3/determine_quota_cost), 없으면 1
+METHOD_COSTS = {
+    'search.list': 100,
+    'videos.insert': 1600,
+    'videos.update': 50,
+    'commentThreads.insert': 50,
+}
+
+register_migration('youtube_quota_usage_table', """
+CREATE TABLE IF NOT EXISTS youtube_quota_usage (
+    usage_date DATE NOT NULL,
+    method TEXT NOT NULL,
+    units BIGINT NOT NULL DEFAULT 0,
+    calls BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (usage_date, method)
+)
+""")
+
+
+class QuotaExceededError(Exception):
+    pass
+
+
+_state = {'date': None, 'used': 0, 'synced_at': 0.0}
+_lock = threading.Lock()
+
+
+# 할당량 기준 오늘 날짜
+def quota_date():
+    return datetime.now(QUOTA_TIMEZONE).date()
+
+
+def method_cost(method):
+    return METHOD_COSTS.get(method, 1)
+
+
+# 오늘 사용량을 DB에서 읽어오기 (_lock 안에서 호출)
+def _sync(today):
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COALESCE(SUM(units), 0) FROM youtube_quota_usage WHERE usage_date = %s", (today,))
+            used = int(cur.fetchone()[0])
+            cur.close()
+    except Exception as e:
+        print(f'할당량 사용량 조회 중 오류 발생: {str(e)}')
+        used = _state['used'] if _state['date'] == today else 0
+
+    _state.update(date=today, used=used, synced_at=time.monotonic())
+
+
+def _record(today, method, units):
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            INSERT INTO youtube_quota_usage (usage_date, method, units, calls)
+            VALUES (%s, %s, %s, 1)
+            ON CONFLICT (usage_date, method)
+            DO UPDATE SET units = youtube_quota_usage.units + EXCLUDED.units, calls = youtube_quota_usage.calls + 1
+            """, (today, method, units))
+            cur.close()
+    except Exception as e:
+        print(f'할당량 사용량 저장 중 오류 발생: {str(e)}')
+
+
+# 오늘 사용한 유닛 수
+def used_today():
+    today = quota_date()
+    with _lock:
+        if _state['date'] != today or time.monotonic() - _state['synced_at'] > SYNC_INTERVAL:
+            _sync(today)
+        return _state['used']
+
+
+# 오늘 남은 유닛 수
+def remaining_today():
+    return max(DAILY_QUOTA - used_today(), 0)
+
+
+# 요청 1건의 비용을 차감 (남은 할당량이 부족하면 QuotaExceededError)
+def charge(method):
+    units = method_cost(method)
+    today = quota_date()
+
+    with _lock:
+        if _state['date'] != today or time.monotonic() - _state['synced_at'] > SYNC_INTERVAL:
+            _sync(today)
+        if _state['used'] + units > DAILY_QUOTA:
+            raise QuotaExceededError(
+                f"YouTube API 할당량이 부족합니다. ({method}: {units} 유닛 필요, 남은 할당량 {DAILY_QUOTA - _state['used']} 유닛)"
+            )
+        _state['used'] += units
+
+    _record(today, method, units)
+
+
+# # googleapiclient 서비스 객체 래퍼 (execute() 할 때마다 비용 차감) # #
+class _MeteredRequest:
+    def __init__(self, request, method):
+        self._request = request
+        self._method = method
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+    def execute(self, *args, **kwargs):
+        charge(self._method)
+        return self._request.execute(*args, **kwargs)
+
+
+class _MeteredResource:
+    def __init__(self, resource, name):
+        self._resource = resource
+        self._name = name
+
+    def __getattr__(self, name):
+        attr = getattr(self._resource, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                return _MeteredRequest(result, f'{self._name}.{name}')
+            return result
+
+        return call
+
+
+class MeteredService:
+    def __init__(self, service):
+        self._service = service
+
+    def __getattr__(self, name):
+        attr = getattr(self._service, name)
+        if not callable(attr):
+            return attr
+
+        def resource(*args, **kwargs):
+            return _MeteredResource(attr(*args, **kwargs), name)
+
+        return resource
+
+
+# # 실행 전 예상 비용 # #
+def _pages(count, page_size=50):
+    return math.ceil(count / page_size) if count > 0 else 0
+
+
+# 채널 수집 예상 비용
+def estimate_channel_run(video_limit=10, include_comments=True, handle_cached=False):
+    """
+    {'항목': 유닛} 딕셔너리 반환 (합계는 'total')
+    handle_cached가 False면 핸들 조회(forHandle) 1유닛을 포함 (search 대체 경로는 제외)
+    """
+    estimate = {
+        'channel_id': 0 if handle_cached else 1,
+        'channel_stats': 1,
+        'playlist_items': max(_pages(video_limit), 1),
+        'video_details': _pages(video_limit),
+        'comments': video_limit if include_comments else 0,
+    }
+    estimate['total'] = sum(estimate.values())
+    return estimate
+
+
+# 키워드 수집 예상 비용
+def estimate_keyword_run(max_results=50, include_comments=True):
+    estimate = {
+        'search': method_cost('search.list'),
+        'video_details': _pages(max_results),
+        'channel_stats': 1,
+        'comments': max_results if include_comments else 0,
+    }
+    estimate['total'] = sum(estimate.values())
+    return estimate
+
+
+# 예상 비용과 남은 할당량으로 실행 방식 결정
+def plan_run(estimate):
+    """
+    'full': 그대로 실행, 'skip_comments': 댓글 수집 제외하면 실행 가능
+    댓글을 빼도 부족하면 QuotaExceededError
+    """
+    remaining = remaining_today()
+    if estimate['total'] <= remaining:
+        return 'full'
+    if estimate['total'] - estimate.get('comments', 0) <= remaining:
+        return 'skip_comments'
+    raise QuotaExceededError(
+        f"YouTube API 할당량이 부족합니다. (예상 {estimate['total']} 유닛, 남은 할당량 {remaining} 유닛)"
+    )
@@ -0,0 +1,155 @@
+import pandas as pd
+import streamlit as st
+
+from db import get_connection
+
+
+# # 화면 목록 조회용 읽기 모델 (st.cache_data 캐시 + 저장 시 무효화 + 페이지 단위 조회) # #
+# 목록은 미리보기 길이만큼만 가져오고, 긴 본문(분석 결과, 썸네일 분석 등)은 선택했을 때만 조회
+LIST_TTL = 5 * 60  # 목록 캐시 유지 시간(초)
+DETAIL_TTL = 30 * 60  # 본문 캐시 유지 시간(초)
+PAGE_SIZE = 20
+PREVIEW_CHARS = 200
+TRANSCRIPT_PREVIEW_CHARS = 500  # 동영상 목록에서 조회할 스크립트 길이 (콘텐츠 생성 프롬프트에도 이만큼만 사용)
+
+# 분석 테이블별 결과 컬럼
+ANALYSIS_RESULT_COLUMNS = {
+    'analysis_channel': 'channel_result',
+    'analysis_keyword': 'keyword_result',
+}
+
+# 목록 조회를 허용하는 테이블 (count_rows에서 테이블 이름을 쿼리에 직접 넣으므로 제한)
+LISTED_TABLES = ('analysis_channel', 'analysis_keyword', 'analysis_thumbnail', 'blog_summary', 'blog_int_summary', 'content_youtube')
+
+
+def _fetch(query, params=None):
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        cur.close()
+    return rows
+
+
+def _preview(column, chars=PREVIEW_CHARS):
+    return f"CASE WHEN LENGTH({column}) > {chars} THEN LEFT({column}, {chars}) || '...' ELSE {column} END"
+
+
+# 테이블 전체 행 수 (페이지 수 계산용)
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def count_rows(table_name):
+    if table_name not in LISTED_TABLES:
+        raise ValueError(f"목록 조회를 지원하지 않는 테이블입니다: {table_name}")
+    return _fetch(f"SELECT COUNT(*) FROM {table_name}")[0][0]
+
+
+# 쇼츠/롱폼 동영상 분석 목록 (analysis_channel, analysis_keyword)
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def list_video_analyses(table_name, page=0, page_size=PAGE_SIZE):
+    result_column = ANALYSIS_RESULT_COLUMNS[table_name]
+    rows = _fetch(f"""
+    SELECT search_unique_id, is_shorts, {_preview(result_column)}, created_at
+    FROM {table_name}
+    ORDER BY created_at DESC
+    LIMIT %s OFFSET %s
+    """, (page_size, page * page_size))
+    return pd.DataFrame(rows, columns=['검색ID', '쇼츠', '분석 미리보기', '생성일시'])
+
+
+# 동영상 분석 본문 (같은 검색ID/쇼츠 여부로 여러 번 분석했으면 가장 최근 것)
+@st.cache_data(ttl=DETAIL_TTL, show_spinner=False)
+def get_video_analysis(table_name, search_unique_id, is_shorts):
+    result_column = ANALYSIS_RESULT_COLUMNS[table_name]
+    rows = _fetch(f"""
+    SELECT {result_column} FROM {table_name}
+    WHERE search_unique_id = %s AND is_shorts = %s
+    ORDER BY created_at DESC
+    LIMIT 1
+    """, (search_unique_id, is_shorts))
+    return rows[0][0] if rows else None
+
+
+# 썸네일 분석 목록 (분석 내용은 미리보기만)
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def list_thumbnail_analyses(page=0, page_size=PAGE_SIZE):
+    rows = _fetch(f"""
+    SELECT
+        id, video_thumbnail, search_unique_id, keyword, channel_url, channel_name, video_id, video_title, is_shorts,
+        {_preview('thumbnail_result')}
+    FROM analysis_thumbnail
+    ORDER BY created_at DESC
+    LIMIT %s OFFSET %s
+    """, (page_size, page * page_size))
+    return pd.DataFrame(rows, columns=['ID', '썸네일', '검색ID', '키워드', '채널URL', '채널명', 'video_id', '제목', '쇼츠', '분석 미리보기'])
+
+
+# 썸네일 분석 본문
+@st.cache_data(ttl=DETAIL_TTL, show_spinner=False)
+def get_thumbnail_result(analysis_id):
+    rows = _fetch("SELECT thumbnail_result FROM analysis_thumbnail WHERE id = %s", (analysis_id,))
+    return rows[0][0] if rows else None
+
+
+# 키워드별 첫 번째 블로그 요약 목록 (요약은 100자 미리보기)
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def list_first_blog_summaries():
+    rows = _fetch(f"""
+    SELECT DISTINCT ON (keyword) id, keyword, {_preview('summary', 100)}, url
+    FROM blog_summary
+    ORDER BY keyword, id
+    """)
+    return pd.DataFrame(rows, columns=['ID', '키워드', '요약 미리보기', 'URL'])
+
+
+# 블로그 요약 본문
+@st.cache_data(ttl=DETAIL_TTL, show_spinner=False)
+def get_blog_summary(summary_id):
+    rows = _fetch("SELECT summary FROM blog_summary WHERE id = %s", (summary_id,))
+    return rows[0][0] if rows else None
+
+
+# 블로그 통합 요약 목록 (ID, 키워드)
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def list_blog_int_summaries():
+    return _fetch("SELECT search_unique_id, keyword FROM blog_int_summary")
+
+
+# 블로그 통합 요약 본문
+@st.cache_data(ttl=DETAIL_TTL, show_spinner=False)
+def get_blog_int_summary(search_unique_id):
+    rows = _fetch("SELECT int_summary FROM blog_int_summary WHERE search_unique_id = %s", (search_unique_id,))
+    return rows[0][0] if rows else None
+
+
+# 블로그로 만든 유튜브 콘텐츠 목록 (스크립트는 미리보기만)
+@st.cache_data(ttl=LIST_TTL, show_spinner=False)
+def list_content_youtube(page=0, page_size=PAGE_SIZE):
+    rows = _fetch(f"""
+    SELECT id, keyword, title, thumbnail, {_preview('script')}
+    FROM content_youtube
+    ORDER BY created_at DESC
+    LIMIT %s OFFSET %s
+    """, (page_size, page * page_size))
+    return pd.DataFrame(rows, columns=['ID', '키워드', '제목', '썸네일', '스크립트 미리보기'])
+
+
+# 테이블별로 비워야 할 캐시
+_READERS = {
+    'analysis_channel': (list_video_analyses, get_video_analysis),
+    'analysis_keyword': (list_video_analyses, get_video_analysis),
+    'analysis_thumbnail': (list_thumbnail_analyses, get_thumbnail_result),
+    'blog_summary': (list_first_blog_summaries, get_blog_summary),
+    'blog_int_summary': (list_blog_int_summaries, get_blog_int_summary),
+    'content_youtube': (list_content_youtube,),
+}
+
+
+# 저장 함수에서 호출: 해당 테이블을 읽는 캐시 비우기
+def invalidate(*table_names):
+    for table_name in table_names:
+        readers = _READERS.get(table_name)
+        if readers is None:
+            continue
+        count_rows.clear()
+        for reader in readers:
+            reader.clear()
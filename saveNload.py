@@ -1,77 +1,112 @@
 import pandas as pd
 import os
+import time
+import asyncio
 
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.extras import execute_values
 
-from youtube import is_youtubeshorts, youtube_transcript
-from googleapiclient.discovery import build
+from db import get_connection, transaction, register_migration
+from read_models import invalidate
+from youtube import build_youtube, is_youtubeshorts, youtube_transcript, list_video_details, YouTubeAnalyzer, NO_TRANSCRIPT_MESSAGE, NO_COMMENTS, SKIPPED_COMMENTS
+from enrich import DEFAULT_STAGE_LIMITS, per_thread, enrich_videos
+from video_stats import save_video_stats, rows_from_info_records
 
 
 # # 유튜브 동영상 정보를 저장하고 불러오는 모듈 # #
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
 
-# PostgreSQL에 접속
-def connect_postgres():
-    conn = psycopg2.connect(
-        host="15.164.112.237", 
-        database="dify", 
-        user="difyuser", 
-        password="bico0218"
+# 병렬 수집용 스레드별 YouTubeAnalyzer (googleapiclient 객체는 스레드 간 공유 불가)
+thread_analyzer = per_thread(lambda: YouTubeAnalyzer(YOUTUBE_API_KEY))
+
+# 검색 ID별 최고 비율 동영상 조회(get_top_videos_by_search_id)용 인덱스
+# 최신 검색 ID부터 키셋 페이지 단위로 읽으므로 (search_unique_id DESC, 비율 DESC) 순서와 같게 만듦
+for _table in ('info_channel', 'info_keyword'):
+    register_migration(
+        f'{_table}_search_desc_ratio_idx',
+        f"""
+        DROP INDEX IF EXISTS {_table}_search_ratio_idx;
+        CREATE INDEX IF NOT EXISTS {_table}_search_desc_ratio_idx ON {_table} (search_unique_id DESC, video_view_subscriber_ratio DESC)
+        """
     )
-    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    
-    return conn
 
+# 채널별 최근 저장 결과 조회(load_latest_channel_videos)용 인덱스
+register_migration(
+    'info_channel_url_search_idx',
+    "CREATE INDEX IF NOT EXISTS info_channel_url_search_idx ON info_channel (channel_url, search_unique_id DESC)"
+)
 
-# 채널 정보 저장
-def save_info(table_name, search_unique_id, keyword, channel_url, channel_name, channel_subscribers, 
+# 채널 정보 테이블 컬럼 (저장 순서)
+INFO_COLUMNS = (
+    'search_unique_id', 'keyword', 'channel_url', 'channel_name', 'channel_subscribers', 
+    'video_id', 'video_title', 'video_thumbnail', 'video_view_count', 'video_like_count', 'video_comment_count', 'video_view_subscriber_ratio', 
+    'is_shorts', 'transcript', 'published_at', 'comment_1', 'comment_2', 'comment_3'
+)
+
+# 저장할 한 행 만들기
+def _info_row(search_unique_id, keyword, channel_url, channel_name, channel_subscribers, 
               video_id, video_title, video_thumbnail, video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, 
               is_shorts, transcript, published_at, top_comments):
-    conn = connect_postgres()
-    cur = conn.cursor()
-    
-    # 댓글 정보 준비 (각 댓글을 별도 변수로)
-    comment_1 = ""
-    comment_2 = ""
-    comment_3 = ""
-    
     # 댓글 정보 준비 (내용만 저장)
     comment_1 = top_comments[0]['text'] if len(top_comments) > 0 else "내용 없음"
     comment_2 = top_comments[1]['text'] if len(top_comments) > 1 else "내용 없음"
     comment_3 = top_comments[2]['text'] if len(top_comments) > 2 else "내용 없음"
     
-    cur.execute(f"""
-    INSERT INTO {table_name} (
-        search_unique_id, keyword, channel_url, channel_name, channel_subscribers, 
-        video_id, video_title, video_thumbnail, video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, 
-        is_shorts, transcript, published_at, comment_1, comment_2, comment_3)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, 
-        (search_unique_id, keyword, channel_url, channel_name, channel_subscribers, 
-         video_id, video_title, video_thumbnail, video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, 
-         is_shorts, transcript, published_at, comment_1, comment_2, comment_3)
+    return (search_unique_id, keyword, channel_url, channel_name, channel_subscribers, 
+            video_id, video_title, video_thumbnail, video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, 
+            is_shorts, transcript, published_at, comment_1, comment_2, comment_3)
+
+# 채널 정보 저장
+def save_info(table_name, search_unique_id, keyword, channel_url, channel_name, channel_subscribers, 
+              video_id, video_title, video_thumbnail, video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, 
+              is_shorts, transcript, published_at, top_comments):
+    record = dict(
+        search_unique_id=search_unique_id, keyword=keyword, channel_url=channel_url, channel_name=channel_name, channel_subscribers=channel_subscribers, 
+        video_id=video_id, video_title=video_title, video_thumbnail=video_thumbnail, video_view_count=video_view_count, video_like_count=video_like_count, 
+        video_comment_count=video_comment_count, video_view_subscriber_ratio=video_view_subscriber_ratio, 
+        is_shorts=is_shorts, transcript=transcript, published_at=published_at, top_comments=top_comments
     )
     
-    conn.commit()
-    cur.close()
-    conn.close()
+    return save_info_bulk(table_name, [record])[0]
+
+# 여러 동영상 정보를 한 번의 트랜잭션으로 저장
+def save_info_bulk(table_name, records):
+    """
+    records: save_info의 인자 이름(table_name 제외)을 키로 갖는 딕셔너리 리스트
+    저장된 행의 id 리스트를 입력 순서대로 반환
+    """
+    if not records:
+        return []
+    
+    rows = [_info_row(**record) for record in records]
+    
+    with transaction() as conn:
+        cur = conn.cursor()
+        inserted = execute_values(
+            cur,
+            f"INSERT INTO {table_name} ({', '.join(INFO_COLUMNS)}) VALUES %s RETURNING id",
+            rows,
+            page_size=len(rows),
+            fetch=True
+        )
+        cur.close()
+    
+    return [row[0] for row in inserted]
 
 # 정보 불러오기
 def load_info(search_id, table_name):
-    conn = connect_postgres()
-    cur = conn.cursor()
-
-    cur.execute(f"""
-    SELECT 
-        keyword, channel_url, channel_name, video_id, video_title, video_thumbnail, video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, is_shorts, comment_1, comment_2, comment_3, transcript
-    FROM 
-        {table_name} 
-    WHERE 
-        search_unique_id = %s
-    """, (search_id,))
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"""
+        SELECT 
+            keyword, channel_url, channel_name, video_id, video_title, video_thumbnail, video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, is_shorts, comment_1, comment_2, comment_3, transcript
+        FROM 
+            {table_name} 
+        WHERE 
+            search_unique_id = %s
+        """, (search_id,))
 
-    results = cur.fetchall()
+        results = cur.fetchall()
+        cur.close()
 
     # 키워드도 조회해야
     columns = [
@@ -81,16 +116,209 @@ def load_info(search_id, table_name):
     
     df = pd.DataFrame(results, columns=columns)
     
-    cur.close()
-    conn.close()
-    
     return df
 
-# 키워드로 동영상 정보 불러오기
-def fetch_youtube_data(search_query, max_results=50):
-    youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+# 댓글 수집 함수 (include_comments가 False면 API 호출 없이 SKIPPED_COMMENTS 반환, 채널/키워드 분석 공통)
+def comment_fetcher(include_comments=True):
+    if include_comments:
+        return lambda video_id, n: thread_analyzer().get_top_comments(video_id, n)
+    return lambda video_id, n: [dict(comment) for comment in SKIPPED_COMMENTS]
+
+# 블로그 요약 여러 개를 한 번의 트랜잭션으로 저장
+def save_blog_summaries(keyword, summaries):
+    """
+    summaries: (url, summary) 리스트
+    저장된 행의 id 리스트를 입력 순서대로 반환
+    """
+    if not summaries:
+        return []
     
-    videos_data = []
+    with transaction() as conn:
+        cur = conn.cursor()
+        inserted = execute_values(
+            cur,
+            "INSERT INTO blog_summary (keyword, url, summary) VALUES %s RETURNING id",
+            [(keyword, url, summary) for url, summary in summaries],
+            page_size=len(summaries),
+            fetch=True
+        )
+        cur.close()
+    
+    invalidate('blog_summary')
+    return [row[0] for row in inserted]
+
+# 자료 종류별 생성 콘텐츠 저장 테이블 (테이블, 자료 키 컬럼, 내용 컬럼)
+CONTENT_TABLES = {
+    'blog': {
+        'youtube': ('content_youtube', 'blog_id', ('title', 'thumbnail', 'script')),
+        'instagram': ('content_instagram', 'blog_id', ('pics', 'caption', 'hashtags')),
+        'threads': ('content_threads', 'blog_id', ('post', 'pics', 'tags')),
+    },
+    'pdf': {
+        'youtube': ('pdf2youtube', 'pdf_name', ('title', 'thumbnail', 'script')),
+        'instagram': ('pdf2instagram', 'pdf_name', ('pics', 'caption', 'hashtags')),
+        'threads': ('pdf2threads', 'pdf_name', ('post', 'pics', 'tags')),
+    },
+    'keyword': {
+        'youtube': ('keyword2content', 'id', ('title', 'thumbnail', 'script')),
+    },
+}
+
+def _insert_content(cur, source, platform, source_key, keyword, content, returning=False):
+    table, key_column, columns = CONTENT_TABLES[source][platform]
+    cur.execute(
+        f"INSERT INTO {table} ({key_column}, keyword, {', '.join(columns)}) VALUES (%s, %s, {', '.join(['%s'] * len(columns))})"
+        + (" RETURNING id" if returning else ""),
+        (source_key, keyword, *(content.get(column, '') for column in columns))
+    )
+    return cur.fetchone()[0] if returning else None
+
+# 플랫폼 하나의 생성 콘텐츠 저장
+def save_generated_content(source, platform, source_key, keyword, content):
+    """
+    source: 'blog', 'pdf', 'keyword', source_key: blog_id, pdf_name, 검색 id
+    content: content_parser로 파싱한 {field: text}
+    """
+    with get_connection() as conn:
+        cur = conn.cursor()
+        _insert_content(cur, source, platform, source_key, keyword, content)
+        cur.close()
+    invalidate(CONTENT_TABLES[source][platform][0])
+
+# 한 번에 생성한 플랫폼별 콘텐츠를 각 테이블에 한 번의 트랜잭션으로 저장
+def save_generated_contents(source, source_key, keyword, contents):
+    """
+    contents: generate_all_platforms 결과 ({platform: {field: text}})
+    """
+    with transaction() as conn:
+        cur = conn.cursor()
+        for platform in CONTENT_TABLES[source]:
+            _insert_content(cur, source, platform, source_key, keyword, contents[platform])
+        cur.close()
+    invalidate(*(table for table, _, _ in CONTENT_TABLES[source].values()))
+
+# 스트리밍 생성 중 섹션이 완성될 때마다 저장 (첫 섹션에서 행을 만들고 이후 섹션은 같은 행을 UPDATE)
+class ContentWriter:
+    def __init__(self, source, platform, source_key, keyword):
+        self.source = source
+        self.platform = platform
+        self.source_key = source_key
+        self.keyword = keyword
+        self.row_id = None
+
+    def save(self, field, text):
+        table, _, columns = CONTENT_TABLES[self.source][self.platform]
+        if field not in columns:
+            raise ValueError(f"{table}에 없는 항목입니다: {field}")
+
+        with get_connection() as conn:
+            cur = conn.cursor()
+            if self.row_id is None:
+                self.row_id = _insert_content(cur, self.source, self.platform, self.source_key, self.keyword, {field: text}, returning=True)
+            else:
+                cur.execute(f"UPDATE {table} SET {field} = %s WHERE id = %s", (text, self.row_id))
+            cur.close()
+        invalidate(table)
+
+# 채널의 가장 최근 저장 결과 불러오기
+def load_latest_channel_videos(channel_url):
+    """
+    (search_unique_id, 동영상 리스트)를 반환. 저장된 결과가 없으면 (None, [])
+    동영상은 업로드 최신순이며 save_info_bulk에 그대로 넘길 수 있도록 댓글은 top_comments 형태로 변환
+    """
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+        SELECT 
+            search_unique_id, video_id, video_title, video_thumbnail, is_shorts, transcript, published_at, comment_1, comment_2, comment_3
+        FROM 
+            info_channel
+        WHERE 
+            channel_url = %s
+            AND search_unique_id = (SELECT MAX(search_unique_id) FROM info_channel WHERE channel_url = %s)
+        ORDER BY 
+            published_at DESC
+        """, (channel_url, channel_url))
+        
+        results = cur.fetchall()
+        cur.close()
+    
+    if not results:
+        return None, []
+    
+    videos = [
+        {
+            'video_id': video_id, 'title': title, 'thumbnail': thumbnail, 'is_shorts': is_shorts, 'transcript': transcript, 
+            'published_at': published_at, 'top_comments': [{'text': comment} for comment in (comment_1, comment_2, comment_3)]
+        }
+        for _, video_id, title, thumbnail, is_shorts, transcript, published_at, comment_1, comment_2, comment_3 in results
+    ]
+    
+    return results[0][0], videos
+
+# 이미 저장된 채널의 증분 업데이트 (새 동영상만 자막/댓글 수집, 기존 동영상은 통계만 갱신)
+def refresh_channel(analyzer, channel_url, keyword, search_unique_id, limit=10, on_progress=None, include_comments=True):
+    """
+    최근 저장 결과 이후에 올라온 동영상만 전체 수집하고, 기존 동영상은 저장된 자막/댓글/쇼츠 여부를 재사용해
+    새 search_unique_id로 최신 limit개 동영상의 스냅샷을 저장
+    삭제/비공개된 기존 동영상은 스냅샷에서 제외
+    include_comments: False면 새 동영상의 댓글을 수집하지 않음 (할당량 부족 시)
+    """
+    previous_search_id, stored_videos = load_latest_channel_videos(channel_url)
+    
+    channel_id = analyzer.get_channel_id(channel_url)
+    channel_stats = analyzer.get_channel_stats(channel_id)
+    subscribers = channel_stats['subscribers']
+    
+    # 새 동영상 (저장된 동영상을 만나면 목록 조회 중단)
+    new_videos = analyzer.get_new_videos(channel_id, [video['video_id'] for video in stored_videos], limit)
+    
+    # 스냅샷에 남는 기존 동영상은 통계만 다시 조회
+    kept_videos = stored_videos[:max(limit - len(new_videos), 0)]
+    stats = analyzer.get_video_stats([video['video_id'] for video in kept_videos])
+    
+    enriched = enrich_videos(
+        [video['video_id'] for video in new_videos],
+        comment_fetcher(include_comments),
+        on_progress=on_progress
+    )
+    
+    records = []
+    for video, extra in zip(new_videos, enriched):
+        view_subscriber_ratio = video['views'] / subscribers if subscribers > 0 else 0
+        records.append(dict(
+            search_unique_id=search_unique_id, keyword=keyword, channel_url=channel_url, channel_name=channel_stats['title'], channel_subscribers=subscribers, 
+            video_id=video['video_id'], video_title=video['title'], video_thumbnail=video['thumbnail'], video_view_count=video['views'], video_like_count=video['like_count'], 
+            video_comment_count=video['comment_count'], video_view_subscriber_ratio=view_subscriber_ratio,
+            is_shorts=extra['is_shorts'], transcript=extra['transcript'], published_at=video['published_at'], top_comments=extra['comments']
+        ))
+    
+    for video in kept_videos:
+        video_stats = stats.get(video['video_id'])
+        if video_stats is None:
+            continue
+        
+        view_subscriber_ratio = video_stats['views'] / subscribers if subscribers > 0 else 0
+        records.append(dict(
+            search_unique_id=search_unique_id, keyword=keyword, channel_url=channel_url, channel_name=channel_stats['title'], channel_subscribers=subscribers, 
+            video_id=video['video_id'], video_title=video['title'], video_thumbnail=video['thumbnail'], video_view_count=video_stats['views'], video_like_count=video_stats['like_count'], 
+            video_comment_count=video_stats['comment_count'], video_view_subscriber_ratio=view_subscriber_ratio,
+            is_shorts=video['is_shorts'], transcript=video['transcript'], published_at=video['published_at'], top_comments=video['top_comments']
+        ))
+    
+    save_info_bulk('info_channel', records)
+    save_video_stats(rows_from_info_records(records))  # 조회수 추이 기록
+    
+    return {
+        'channel_stats': channel_stats,
+        'previous_search_id': previous_search_id,
+        'new_count': len(new_videos),
+        'refreshed_count': len(records) - len(new_videos),
+        'removed_count': len(kept_videos) - (len(records) - len(new_videos)),
+    }
+
+# 키워드 검색 결과 중 조회수 1000 이상인 동영상의 기본 정보 (자막, 쇼츠 여부 제외)
+def search_keyword_videos(youtube, search_query, max_results=50):
     request = youtube.search().list(
         q=search_query,
         part='snippet',
@@ -100,11 +328,7 @@ def fetch_youtube_data(search_query, max_results=50):
     
     response = request.execute()
     video_ids = [item['id']['videoId'] for item in response['items']]
-    stats_request = youtube.videos().list(
-        part='statistics',
-        id=','.join(video_ids)
-    )
-    stats_response = stats_request.execute()
+    video_details = list_video_details(youtube, video_ids)  # 통계 + 쇼츠 판단용 길이/화면 비율
     channel_ids = [item['snippet']['channelId'] for item in response['items']]
     channels_request = youtube.channels().list(
         part='statistics',
@@ -117,16 +341,20 @@ def fetch_youtube_data(search_query, max_results=50):
         for channel in channels_response['items']
     }
     
-    for video, stats in zip(response['items'], stats_response['items']):
+    videos = []
+    for video in response['items']:
+        video_id = video['id']['videoId']
+        stats = video_details.get(video_id)
+        if stats is None:
+            continue
+        
         views = int(stats['statistics'].get('viewCount', 0))
         if views >= 1000:
-            video_id = video['id']['videoId']
             channel_id = video['snippet']['channelId']
             subscriber_count = channel_subscribers.get(channel_id, 0)
             view_sub_ratio = (views / subscriber_count) * 100 if subscriber_count > 0 else 0
-            script = youtube_transcript(video_id)
-            is_shorts = is_youtubeshorts(video_id)
-            videos_data.append({
+            videos.append({
+                'video_id': video_id,
                 'title': video['snippet']['title'], 
                 'channel': video['snippet']['channelTitle'], 
                 'publishedAt': video['snippet']['publishedAt'], 
@@ -138,43 +366,136 @@ def fetch_youtube_data(search_query, max_results=50):
                 'description': video['snippet']['description'], 
                 'url': f"https://www.youtube.com/watch?v={video_id}", 
                 'thumbnail': video['snippet']['thumbnails']['high']['url'], 
-                '1min_script': script,
-                'is_shorts': is_shorts
             })
     
-    return pd.DataFrame(videos_data)
+    # 조회수 추이 기록
+    save_video_stats([
+        {'video_id': video['video_id'], 'views': video['views'], 'likes': video['likes'], 'comments': video['comments'], 'subscribers': video['subscribers']}
+        for video in videos
+    ])
+    
+    return videos
 
-# 각 search_unique_id별로 가장 높은 비율의 동영상 하나씩 가져오는 함수
-def get_top_videos_by_search_id(table_name):
-    conn = connect_postgres()
-    cur = conn.cursor()
+# 키워드로 동영상 정보 불러오기
+def fetch_youtube_data(search_query, max_results=50):
+    youtube = build_youtube(YOUTUBE_API_KEY)
+    
+    videos_data = []
+    for video in search_keyword_videos(youtube, search_query, max_results):
+        video_id = video.pop('video_id')
+        video['1min_script'] = youtube_transcript(video_id)
+        video['is_shorts'] = is_youtubeshorts(video_id)
+        videos_data.append(video)
+    
+    return pd.DataFrame(videos_data)
 
-    # 모든 고유 search_unique_id 가져오기
-    cur.execute(f"SELECT DISTINCT search_unique_id FROM {table_name} ORDER BY search_unique_id DESC")
-    search_ids = [row[0] for row in cur.fetchall()]
+# 키워드 동영상 정보 비동기 수집 (자막, 쇼츠 여부, 댓글을 동시에)
+async def fetch_youtube_data_async(search_query, max_results=50, stage_limits=None, include_comments=True, on_progress=None):
+    """
+    fetch_youtube_data와 같은 DataFrame에 'top_comments' 컬럼을 더해서 (df, 단계별 소요 시간) 반환
+    stage_limits: 단계별 동시 실행 수 ({'transcript': n, 'shorts': n, 'comments': n})
+    on_progress: (완료된 동영상 수, 전체 동영상 수)를 받는 콜백
+    각 동영상의 단계가 실패하면 기본값으로 대체하고 나머지는 계속 진행
+    """
+    limits = dict(DEFAULT_STAGE_LIMITS)
+    if stage_limits:
+        limits.update(stage_limits)
+    semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in limits.items()}
+    
+    timings = {}
+    started = time.perf_counter()
+    
+    # 검색 단계 (검색 + 통계 + 구독자 수)
+    videos = await asyncio.to_thread(
+        lambda: search_keyword_videos(build_youtube(YOUTUBE_API_KEY), search_query, max_results)
+    )
+    timings['search'] = time.perf_counter() - started
+    
+    stage_spans = {}
+    
+    async def run(stage, func, video_id, default):
+        async with semaphores[stage]:
+            begin = time.perf_counter()
+            try:
+                return await asyncio.to_thread(func, video_id)
+            except Exception as e:
+                print(f'{video_id} {stage} 단계 실패: {str(e)}')
+                return default
+            finally:
+                first, last = stage_spans.get(stage, (begin, begin))
+                stage_spans[stage] = (min(first, begin), max(last, time.perf_counter()))
+    
+    done_count = 0
+    
+    fetch_comments = comment_fetcher(include_comments)
+    
+    async def enrich(video):
+        nonlocal done_count
+        video_id = video['video_id']
+        tasks = [
+            run('transcript', youtube_transcript, video_id, NO_TRANSCRIPT_MESSAGE),
+            run('shorts', is_youtubeshorts, video_id, False),
+            run('comments', lambda vid: fetch_comments(vid, 3), video_id, [dict(comment) for comment in NO_COMMENTS]),
+        ]
+        
+        results = await asyncio.gather(*tasks)
+        done_count += 1
+        if on_progress:
+            on_progress(done_count, len(videos))
+        return results
+    
+    enriched = await asyncio.gather(*(enrich(video) for video in videos))
+    
+    videos_data = []
+    for video, results in zip(videos, enriched):
+        video = dict(video)
+        video.pop('video_id')
+        video['1min_script'] = results[0]
+        video['is_shorts'] = results[1]
+        video['top_comments'] = results[2]
+        videos_data.append(video)
     
-    # 결과 데이터를 저장할 리스트
-    results = []
+    for stage, (first, last) in stage_spans.items():
+        timings[stage] = last - first
+    timings['total'] = time.perf_counter() - started
     
-    # 각 search_unique_id에 대해 가장 높은 video_view_subscriber_ratio를 가진 동영상 가져오기
-    for search_id in search_ids:
+    return pd.DataFrame(videos_data), timings
+
+# Streamlit 등 동기 코드에서 호출하는 비동기 수집
+def fetch_youtube_data_concurrent(search_query, max_results=50, stage_limits=None, include_comments=True, on_progress=None):
+    return asyncio.run(fetch_youtube_data_async(search_query, max_results, stage_limits, include_comments, on_progress))
+
+# 각 search_unique_id별로 가장 높은 비율의 동영상 하나씩 가져오는 함수
+def get_top_videos_by_search_id(table_name, limit=None, before_id=None, transcript_chars=None):
+    """
+    최신 search_unique_id부터 반환
+    limit: 검색 ID 개수 (None이면 전체)
+    before_id: 키셋 페이지네이션용. 이 값보다 작은 search_unique_id만 조회 (이전 페이지의 마지막 pk_ID)
+    transcript_chars: 스크립트를 이 길이까지만 조회 (목록 표시용, None이면 전체)
+    """
+    transcript = 'transcript' if transcript_chars is None else (
+        f"CASE WHEN LENGTH(transcript) > {int(transcript_chars)} THEN LEFT(transcript, {int(transcript_chars)}) || '...' ELSE transcript END"
+    )
+    # 조건/LIMIT을 DISTINCT ON 쿼리 안에 넣어 인덱스 순서대로 필요한 검색 ID까지만 읽음
+    where = "WHERE search_unique_id < %(before_id)s" if before_id is not None else ""
+    limit_clause = "LIMIT %(limit)s" if limit is not None else ""
+    with get_connection() as conn:
+        cur = conn.cursor()
         cur.execute(f"""
-        SELECT 
+        SELECT DISTINCT ON (search_unique_id)
             video_thumbnail, search_unique_id, keyword, channel_name, channel_url, video_id, video_title, 
             video_view_count, video_like_count, video_comment_count, video_view_subscriber_ratio, 
-            is_shorts, published_at, comment_1, comment_2, comment_3, transcript
+            is_shorts, published_at, comment_1, comment_2, comment_3, {transcript}
         FROM 
             {table_name} 
-        WHERE 
-            search_unique_id = %s
+        {where}
         ORDER BY 
-            video_view_subscriber_ratio DESC
-        LIMIT 1
-        """, (search_id,))
+            search_unique_id DESC, video_view_subscriber_ratio DESC
+        {limit_clause}
+        """, {'before_id': before_id, 'limit': limit})
         
-        row = cur.fetchone()
-        if row:
-            results.append(row)
+        results = cur.fetchall()
+        cur.close()
     
     # 컬럼 이름
     columns = [
@@ -187,54 +508,55 @@ def get_top_videos_by_search_id(table_name):
 
     # df.insert(0, '분석', '')
     
-    cur.close()
-    conn.close()
-    
     return df
 
 # 분석 결과 저장 함수
 def save_video_analysis(table_name, search_unique_id, is_shorts, analysis_result):
-    conn = connect_postgres()
-    cur = conn.cursor()
-    
-    cur.execute(f"""
-        INSERT INTO {table_name} (search_unique_id, is_shorts, channel_result) VALUES (%s, %s, %s)
-        """,
-        (search_unique_id, is_shorts, analysis_result)
-    )
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"""
+            INSERT INTO {table_name} (search_unique_id, is_shorts, channel_result) VALUES (%s, %s, %s)
+            """,
+            (search_unique_id, is_shorts, analysis_result)
+        )
+        cur.close()
+    invalidate(table_name)
 
 def save_video_analysis_keyword(table_name, search_unique_id, is_shorts, analysis_result):
-    conn = connect_postgres()
-    cur = conn.cursor()
-    
-    cur.execute(f"""
-        INSERT INTO {table_name} (search_unique_id, is_shorts, keyword_result) VALUES (%s, %s, %s)
-        """,
-        (search_unique_id, is_shorts, analysis_result)
-    )
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"""
+            INSERT INTO {table_name} (search_unique_id, is_shorts, keyword_result) VALUES (%s, %s, %s)
+            """,
+            (search_unique_id, is_shorts, analysis_result)
+        )
+        cur.close()
+    invalidate(table_name)
 
-# 썸네일 분석 저장 함수
+# 썸네일 분석 저장 함수 (한 번의 트랜잭션으로 저장, 저장된 id 리스트 반환)
 def save_thumbnail_analysis(thumbnail_data, search_unique_id, is_shorts, url):
-    conn = connect_postgres()
-    cur = conn.cursor()
+    if not isinstance(thumbnail_data, list) or not thumbnail_data:
+        return []
     
-    for item in thumbnail_data:
-        cur.execute("""
+    rows = [
+        (search_unique_id, item['키워드'], url, item['채널명'], item['video_id'], item['제목'], item['썸네일'], is_shorts, item['분석'])
+        for item in thumbnail_data
+    ]
+    
+    with transaction() as conn:
+        cur = conn.cursor()
+        inserted = execute_values(
+            cur,
+            """
             INSERT INTO analysis_thumbnail
             (search_unique_id, keyword, channel_url, channel_name, video_id, video_title, video_thumbnail, is_shorts, thumbnail_result)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            VALUES %s RETURNING id
             """,
-            (search_unique_id, item['키워드'], url, item['채널명'], item['video_id'], item['제목'], item['썸네일'], is_shorts, item['분석'])
+            rows,
+            page_size=len(rows),
+            fetch=True
         )
+        cur.close()
     
-    conn.commit()
-    cur.close()
-    conn.close()
+    invalidate('analysis_thumbnail')
+    return [row[0] for row in inserted]
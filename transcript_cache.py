@@ -0,0 +1,104 @@
+import json
+
+from cache import TTLCache
+from db import get_connection, transaction, register_migration
+
+
+# # 자막 캐시 (메모리 LRU + PostgreSQL) # #
+TRANSCRIPT_TTL = 30 * 24 * 60 * 60  # 자막 보관 기간(초)
+MISSING_TTL = 24 * 60 * 60  # '자막 없음' 결과 보관 기간(초)
+
+# 캐시에 '자막 없음'으로 저장된 경우 반환되는 값
+MISSING = 'missing'
+
+_memory = TTLCache(maxsize=512)
+
+register_migration('transcript_cache_table', """
+CREATE TABLE IF NOT EXISTS transcript_cache (
+    video_id TEXT NOT NULL,
+    language_code TEXT NOT NULL,
+    is_generated BOOLEAN NOT NULL,
+    is_missing BOOLEAN NOT NULL DEFAULT FALSE,
+    segments JSONB,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (video_id, language_code, is_generated)
+)
+""")
+
+
+# 캐시된 자막 조회 (수동 생성 자막 우선)
+def get_transcript(video_id):
+    """
+    {'language_code', 'is_generated', 'segments'} 딕셔너리,
+    자막이 없다고 캐시된 경우 MISSING, 캐시에 없으면 None을 반환
+    """
+    cached = _memory.get(video_id)
+    if cached is not None:
+        return cached
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            SELECT language_code, is_generated, is_missing, segments
+            FROM transcript_cache
+            WHERE video_id = %s
+              AND fetched_at > CURRENT_TIMESTAMP - make_interval(secs => CASE WHEN is_missing THEN %s ELSE %s END)
+            ORDER BY is_missing, is_generated
+            LIMIT 1
+            """, (video_id, MISSING_TTL, TRANSCRIPT_TTL))
+            row = cur.fetchone()
+            cur.close()
+    except Exception as e:
+        print(f'자막 캐시 조회 중 오류 발생: {str(e)}')
+        return None
+
+    if row is None:
+        return None
+
+    language_code, is_generated, is_missing, segments = row
+    if is_missing:
+        _memory.set(video_id, MISSING, ttl=MISSING_TTL)
+        return MISSING
+
+    transcript = {'language_code': language_code, 'is_generated': is_generated, 'segments': segments}
+    _memory.set(video_id, transcript, ttl=TRANSCRIPT_TTL)
+    return transcript
+
+
+# 자막 저장 (전체 구간)
+def save_transcript(video_id, language_code, is_generated, segments):
+    transcript = {'language_code': language_code, 'is_generated': is_generated, 'segments': segments}
+    _memory.set(video_id, transcript, ttl=TRANSCRIPT_TTL)
+
+    try:
+        with transaction() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM transcript_cache WHERE video_id = %s AND is_missing", (video_id,))
+            cur.execute("""
+            INSERT INTO transcript_cache (video_id, language_code, is_generated, is_missing, segments)
+            VALUES (%s, %s, %s, FALSE, %s)
+            ON CONFLICT (video_id, language_code, is_generated)
+            DO UPDATE SET segments = EXCLUDED.segments, is_missing = FALSE, fetched_at = CURRENT_TIMESTAMP
+            """, (video_id, language_code, is_generated, json.dumps(segments, ensure_ascii=False)))
+            cur.close()
+    except Exception as e:
+        print(f'자막 캐시 저장 중 오류 발생: {str(e)}')
+
+
+# '자막 없음' 결과 저장
+def save_missing(video_id):
+    _memory.set(video_id, MISSING, ttl=MISSING_TTL)
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            INSERT INTO transcript_cache (video_id, language_code, is_generated, is_missing)
+            VALUES (%s, '', FALSE, TRUE)
+            ON CONFLICT (video_id, language_code, is_generated)
+            DO UPDATE SET is_missing = TRUE, fetched_at = CURRENT_TIMESTAMP
+            """, (video_id,))
+            cur.close()
+    except Exception as e:
+        print(f'자막 캐시 저장 중 오류 발생: {str(e)}')
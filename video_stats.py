@@ -0,0 +1,170 @@
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from db import get_connection, register_migration
+
+
+# # 동영상 통계 시계열 저장소 (월별 파티션, 추가만 함) # #
+register_migration('video_stats_table', """
+CREATE TABLE IF NOT EXISTS video_stats (
+    video_id TEXT NOT NULL,
+    captured_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    views BIGINT NOT NULL,
+    likes BIGINT,
+    comments BIGINT,
+    subscribers BIGINT
+) PARTITION BY RANGE (captured_at);
+
+CREATE TABLE IF NOT EXISTS video_stats_default PARTITION OF video_stats DEFAULT;
+
+CREATE INDEX IF NOT EXISTS video_stats_video_captured_idx ON video_stats (video_id, captured_at DESC);
+""")
+
+_partitions = set()
+_partition_lock = threading.Lock()
+
+
+# 해당 월의 파티션이 없으면 생성 (video_stats_YYYY_MM)
+def ensure_partition(captured_at):
+    start = datetime(captured_at.year, captured_at.month, 1, tzinfo=timezone.utc)
+    end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+    name = f"video_stats_{start:%Y_%m}"
+
+    with _partition_lock:
+        if name in _partitions:
+            return name
+
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF video_stats FOR VALUES FROM (%s) TO (%s)",
+                (start, end)
+            )
+            cur.close()
+
+        _partitions.add(name)
+        return name
+
+
+# 통계 스냅샷 일괄 저장
+def save_video_stats(rows, captured_at=None):
+    """
+    rows: {'video_id', 'views', 'likes', 'comments', 'subscribers'} 딕셔너리 리스트
+    저장 중 오류가 나도 수집 과정은 계속되도록 예외를 출력만 하고 저장된 행 수(실패 시 0)를 반환
+    """
+    if not rows:
+        return 0
+
+    captured_at = captured_at or datetime.now(timezone.utc)
+
+    try:
+        ensure_partition(captured_at)
+        with get_connection() as conn:
+            cur = conn.cursor()
+            execute_values(
+                cur,
+                "INSERT INTO video_stats (video_id, captured_at, views, likes, comments, subscribers) VALUES %s",
+                [
+                    (row['video_id'], captured_at, row['views'], row.get('likes'), row.get('comments'), row.get('subscribers'))
+                    for row in rows
+                ],
+                page_size=1000
+            )
+            cur.close()
+        return len(rows)
+    except Exception as e:
+        print(f'동영상 통계 저장 중 오류 발생: {str(e)}')
+        return 0
+
+
+# save_info_bulk용 레코드에서 통계 행 추출
+def rows_from_info_records(records):
+    return [
+        {
+            'video_id': record['video_id'],
+            'views': record['video_view_count'],
+            'likes': record['video_like_count'],
+            'comments': record['video_comment_count'],
+            'subscribers': record['channel_subscribers'],
+        }
+        for record in records
+    ]
+
+
+# 동영상 하나의 통계 변화 기록
+def get_stats_history(video_id, since=None):
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+        SELECT captured_at, views, likes, comments, subscribers
+        FROM video_stats
+        WHERE video_id = %s AND captured_at >= COALESCE(%s, '-infinity'::timestamptz)
+        ORDER BY captured_at
+        """, (video_id, since))
+        results = cur.fetchall()
+        cur.close()
+
+    return pd.DataFrame(results, columns=['captured_at', 'views', 'likes', 'comments', 'subscribers'])
+
+
+# 기간 내 처음/마지막 스냅샷 기준 증가율과 시간당 조회수 증가 속도
+def get_growth(video_ids, since=None):
+    """
+    video_id별로 first_views, last_views, view_growth(%), like_growth(%), views_per_hour를 담은 DataFrame 반환
+    스냅샷이 하나뿐인 동영상은 증가율 0, 속도 NaN
+    """
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+        SELECT
+            video_id,
+            MIN(captured_at) AS first_at,
+            MAX(captured_at) AS last_at,
+            (ARRAY_AGG(views ORDER BY captured_at))[1] AS first_views,
+            (ARRAY_AGG(views ORDER BY captured_at DESC))[1] AS last_views,
+            (ARRAY_AGG(likes ORDER BY captured_at))[1] AS first_likes,
+            (ARRAY_AGG(likes ORDER BY captured_at DESC))[1] AS last_likes,
+            COUNT(*) AS snapshots
+        FROM video_stats
+        WHERE video_id = ANY(%s) AND captured_at >= COALESCE(%s, '-infinity'::timestamptz)
+        GROUP BY video_id
+        """, (list(video_ids), since))
+        results = cur.fetchall()
+        cur.close()
+
+    df = pd.DataFrame(results, columns=[
+        'video_id', 'first_at', 'last_at', 'first_views', 'last_views', 'first_likes', 'last_likes', 'snapshots'
+    ])
+    if df.empty:
+        return df
+
+    hours = (pd.to_datetime(df['last_at'], utc=True) - pd.to_datetime(df['first_at'], utc=True)).dt.total_seconds() / 3600
+    df['view_growth'] = (df['last_views'] - df['first_views']) / df['first_views'].where(df['first_views'] > 0) * 100
+    df['like_growth'] = (df['last_likes'] - df['first_likes']) / df['first_likes'].where(df['first_likes'] > 0) * 100
+    df['views_per_hour'] = (df['last_views'] - df['first_views']) / hours.where(hours > 0)
+
+    return df
+
+
+# 가장 최근 두 스냅샷 사이의 시간당 조회수 증가 속도
+def get_velocity(video_ids):
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+        SELECT DISTINCT ON (video_id)
+            video_id,
+            captured_at,
+            views,
+            (views - LAG(views) OVER w)::float8 / NULLIF(EXTRACT(EPOCH FROM captured_at - LAG(captured_at) OVER w)::float8 / 3600, 0) AS views_per_hour
+        FROM video_stats
+        WHERE video_id = ANY(%s)
+        WINDOW w AS (PARTITION BY video_id ORDER BY captured_at)
+        ORDER BY video_id, captured_at DESC
+        """, (list(video_ids),))
+        results = cur.fetchall()
+        cur.close()
+
+    return pd.DataFrame(results, columns=['video_id', 'captured_at', 'views', 'views_per_hour'])
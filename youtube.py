@@ -1,22 +1,403 @@
-import requests
-from youtube_transcript_api import YouTubeTranscriptApi
+import re
+from googleapiclient.discovery import build
+from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 import time
+from urllib.parse import unquote
 
-# 유튜브 쇼츠인지 아닌지 구분
-def is_youtubeshorts(video_id):
+import http_client
+import transcript_cache
+import channel_cache
+from quota import MeteredService
+from cache import TTLCache
+
+
+NO_TRANSCRIPT_MESSAGE = "⚠️ 자막을 가져올 수 없습니다 (여러 번 시도했으나 실패)"
+# 댓글을 가져올 수 없을 때 반환되는 값
+NO_COMMENTS = [{'author': '댓글 없음', 'text': '댓글을 가져올 수 없습니다 (비활성화되었거나 접근 불가)', 'like_count': 0, 'published_at': ''}]
+# 할당량 부족으로 댓글 수집을 건너뛰었을 때 저장되는 값 (채널/키워드 분석 공통)
+SKIPPED_COMMENTS = [{'author': '댓글 수집 생략', 'text': '댓글을 수집하지 않았습니다 (YouTube API 할당량 부족)', 'like_count': 0, 'published_at': ''}]
+
+SHORTS_MAX_SECONDS = 180  # 쇼츠 최대 길이(초)
+PLAYER_MAX_HEIGHT = 360  # player.embedWidth/embedHeight(화면 비율)를 받기 위해 필요한 값
+
+# 쇼츠 여부 캐시 (video_id -> bool)
+_shorts_cache = TTLCache(maxsize=10000)
+
+
+# ISO 8601 길이(PT1H2M3S)를 초로 변환
+def parse_duration(duration):
+    match = re.fullmatch(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?', duration or '')
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(value or 0) for value in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+# videos().list 응답 항목으로 쇼츠 여부 판단 (판단할 수 없으면 None)
+def classify_shorts(video_item):
+    seconds = parse_duration(video_item.get('contentDetails', {}).get('duration'))
+    if seconds is None or seconds == 0:  # 라이브 등 길이 정보가 없는 경우
+        return None
+    if seconds > SHORTS_MAX_SECONDS:
+        return False
+    
+    player = video_item.get('player', {})
+    width, height = player.get('embedWidth'), player.get('embedHeight')
+    if not width or not height:
+        return None
+    
+    # 쇼츠는 세로 또는 정사각형 영상
+    return int(height) >= int(width)
+
+
+# 동영상 정보(통계, 길이, 화면 비율)를 50개씩 묶어서 가져오기. {video_id: item} 반환
+def list_video_details(youtube, video_ids):
+    details = {}
+    
+    for i in range(0, len(video_ids), 50):
+        response = youtube.videos().list(
+            part='statistics,contentDetails,player',
+            id=','.join(video_ids[i:i + 50]),
+            maxHeight=PLAYER_MAX_HEIGHT
+        ).execute()
+        
+        for item in response.get('items', []):
+            details[item['id']] = item
+            
+            # 길이/화면 비율로 확실히 판단되면 캐시에 저장 (이후 is_youtubeshorts는 요청 없이 반환)
+            is_shorts = classify_shorts(item)
+            if is_shorts is not None:
+                _shorts_cache.set(item['id'], is_shorts)
+    
+    return details
+
+
+# 유튜브 쇼츠인지 아닌지 구분 (캐시에 없을 때만 shorts 주소로 확인)
+def is_youtubeshorts(video_id, timeout=(http_client.CONNECT_TIMEOUT, 5)):
+    cached = _shorts_cache.get(video_id)
+    if cached is not None:
+        return cached
+    
     url = 'https://www.youtube.com/shorts/' + video_id
-    req = requests.head(url)
+    req = http_client.head(url, timeout=timeout)
+    
+    is_shorts = req.status_code == 200
+    _shorts_cache.set(video_id, is_shorts)
+    
+    return is_shorts
+
+
+# YouTube Data API 서비스 객체 (요청마다 할당량 차감)
+def build_youtube(api_key):
+    return MeteredService(build('youtube', 'v3', developerKey=api_key))
+
+
+# 채널 주소에서 핸들 추출 (소문자, @ 제외, URL 인코딩 해제)
+def parse_handle(channel_url):
+    return unquote(channel_url.split('@')[1].split('/')[0].split('?')[0]).lower()
+
+
+# 유튜브 채널 데이터 수집
+class YouTubeAnalyzer:
+    def __init__(self, api_key):
+        self.youtube = build_youtube(api_key)
+        self.uploads_playlists = {}  # channel_id -> 업로드 재생목록 ID
+    
+    # Extract channel ID from URL or custom URL
+    def get_channel_id(self, channel_url):
+        if 'youtube.com/channel/' in channel_url:
+            return channel_url.split('channel/')[1].split('/')[0]
+        elif 'youtube.com/@' in channel_url:
+            handle = parse_handle(channel_url)
+            
+            # 이전에 찾은 적 있는 핸들이면 API 호출 없이 반환
+            cached = channel_cache.get_channel_ids([handle])
+            if handle in cached:
+                return cached[handle]
+            
+            channel_id = self.resolve_handle(handle)
+            if channel_id is None:
+                raise ValueError(f"Could not find channel ID for {channel_url}")
+            
+            channel_cache.save_channel_ids({handle: channel_id})
+            return channel_id
+    
+    # 핸들로 채널 ID 찾기 (forHandle → forUsername → search 순서, 못 찾으면 None)
+    def resolve_handle(self, handle):
+        for lookup in ('forHandle', 'forUsername'):
+            try:
+                response = self.youtube.channels().list(part='id', **{lookup: handle}).execute()
+                if response.get('items'):
+                    return response['items'][0]['id']
+            except Exception:
+                pass  # 오래된 discovery 문서에는 forHandle 파라미터가 없음
+        
+        # If the above method fails, try with search
+        request = self.youtube.search().list(
+            part='snippet',
+            q=handle,
+            type='channel',
+            maxResults=1
+        )
+        response = request.execute()
+        
+        # Verify the channel handle matches
+        for item in response['items']:
+            channel_id = item['snippet']['channelId']
+            channel_info = self.youtube.channels().list(
+                part='snippet',
+                id=channel_id
+            ).execute()
+            
+            if channel_info['items'][0]['snippet'].get('customUrl', '').lower() == f'@{handle}':
+                return channel_id
+        
+        return None
+    
+    # 여러 채널 주소의 채널 ID를 한 번에 찾기 (캐시는 한 번의 쿼리로 조회)
+    def resolve_channel_ids(self, channel_urls):
+        """
+        {channel_url: channel_id} 딕셔너리 반환. 찾지 못한 주소는 결과에서 빠짐
+        """
+        resolved = {}
+        handles = {}
+        for channel_url in channel_urls:
+            if 'youtube.com/channel/' in channel_url:
+                resolved[channel_url] = self.get_channel_id(channel_url)
+            elif 'youtube.com/@' in channel_url:
+                handles[channel_url] = parse_handle(channel_url)
+        
+        cached = channel_cache.get_channel_ids(handles.values())
+        
+        new_ids = {}
+        for channel_url, handle in handles.items():
+            channel_id = cached.get(handle) or new_ids.get(handle)
+            if channel_id is None:
+                try:
+                    channel_id = self.resolve_handle(handle)
+                except Exception as e:
+                    print(f'{channel_url} 채널 ID 조회 중 오류 발생: {str(e)}')
+                if channel_id is None:
+                    continue
+                new_ids[handle] = channel_id
+            resolved[channel_url] = channel_id
+        
+        channel_cache.save_channel_ids(new_ids)
+        return resolved
+    
+    # Get channel statistics including subscriber count
+    def get_channel_stats(self, channel_id):
+        request = self.youtube.channels().list(
+            part='statistics,snippet,contentDetails',
+            id=channel_id
+        )
+        response = request.execute()
+        channel_info = response['items'][0]
+        self.uploads_playlists[channel_id] = channel_info['contentDetails']['relatedPlaylists']['uploads']
+        return {
+            'title': channel_info['snippet']['title'],
+            'subscribers': int(channel_info['statistics']['subscriberCount']),
+            'thumbnail': channel_info['snippet']['thumbnails']['high']['url']
+        }
+    
+    # 채널의 업로드 재생목록 ID (채널 ID의 'UC'를 'UU'로 바꾼 값)
+    def get_uploads_playlist_id(self, channel_id):
+        if channel_id in self.uploads_playlists:
+            return self.uploads_playlists[channel_id]
+        return 'UU' + channel_id[2:]
+    
+    # 업로드 재생목록을 페이지 단위로 읽기 (최신 영상부터, 페이지당 1 유닛)
+    def iter_upload_pages(self, channel_id, limit=None, page_size=50, stop_at=None):
+        """
+        limit: 가져올 최대 동영상 수 (None이면 전체)
+        stop_at: 이미 알고 있는 동영상 ID 집합. 처음 만나는 지점에서 중단 (재생목록은 최신순)
+        각 페이지의 동영상 정보 리스트를 yield
+        """
+        playlist_id = self.get_uploads_playlist_id(channel_id)
+        next_page_token = None
+        fetched = 0
+        
+        while limit is None or fetched < limit:
+            max_results = page_size if limit is None else min(page_size, limit - fetched)
+            response = self.youtube.playlistItems().list(
+                part='snippet,contentDetails',
+                playlistId=playlist_id,
+                maxResults=max_results,
+                pageToken=next_page_token
+            ).execute()
+            
+            items = response.get('items', [])
+            reached_known = False
+            if stop_at:
+                for i, item in enumerate(items):
+                    if item['contentDetails']['videoId'] in stop_at:
+                        items = items[:i]
+                        reached_known = True
+                        break
+            
+            video_ids = [item['contentDetails']['videoId'] for item in items]
+            if not video_ids:
+                break
+            
+            # Get video statistics in batch (쇼츠 여부도 함께 판단됨)
+            video_details = list_video_details(self.youtube, video_ids)
+            
+            page = []
+            for item in items:
+                video_id = item['contentDetails']['videoId']
+                stats = video_details.get(video_id)
+                if stats is None:  # 비공개/삭제된 영상
+                    continue
+                page.append({
+                    'title': item['snippet']['title'],
+                    'thumbnail': item['snippet']['thumbnails']['high']['url'],
+                    'views': int(stats['statistics'].get('viewCount', 0)),
+                    'like_count': int(stats['statistics'].get('likeCount', 0)),
+                    'comment_count': int(stats['statistics'].get('commentCount', 0)),
+                    'published_at': item['contentDetails'].get('videoPublishedAt', item['snippet']['publishedAt']),
+                    'video_id': video_id
+                })
+            
+            fetched += len(items)
+            yield page
+            
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token or reached_known:
+                break
+    
+    # search().list로 동영상 목록 가져오기 (페이지당 100 유닛, 이전 방식)
+    def iter_search_pages(self, channel_id, limit=None):
+        next_page_token = None
+        fetched = 0
+        
+        while limit is None or fetched < limit:
+            request = self.youtube.search().list(
+                part='snippet',
+                channelId=channel_id,
+                maxResults=50,
+                type='video',
+                pageToken=next_page_token,
+                order='date'  # 최신 영상부터
+            )
+            response = request.execute()
+            
+            # Get video IDs for batch statistics request
+            video_ids = [item['id']['videoId'] for item in response['items']]
+            
+            if not video_ids:
+                break
+            
+            # Get video statistics in batch (쇼츠 여부도 함께 판단됨)
+            video_details = list_video_details(self.youtube, video_ids)
+            
+            # Combine video information with statistics
+            page = []
+            for video in response['items']:
+                stats = video_details.get(video['id']['videoId'])
+                if stats is None:
+                    continue
+                page.append({
+                    'title': video['snippet']['title'],
+                    'thumbnail': video['snippet']['thumbnails']['high']['url'],
+                    'views': int(stats['statistics'].get('viewCount', 0)),
+                    'like_count': int(stats['statistics'].get('likeCount', 0)),
+                    'comment_count': int(stats['statistics'].get('commentCount', 0)),
+                    'published_at': video['snippet']['publishedAt'],
+                    'video_id': video['id']['videoId']
+                })
+            
+            fetched += len(response['items'])
+            yield page
+            
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                break
+    
+    # 해당 채널의 동영상 정보 (최신 영상부터 limit개)
+    def get_all_videos(self, channel_id, limit=None, mode='uploads'):
+        """
+        mode: 'uploads' (업로드 재생목록, 기본값) 또는 'search' (search().list)
+        """
+        pages = self.iter_upload_pages(channel_id, limit) if mode == 'uploads' else self.iter_search_pages(channel_id, limit)
+        
+        videos = []
+        for page in pages:
+            videos.extend(page)
+        
+        return videos[:limit] if limit is not None else videos
+    
+    # 이미 저장된 동영상 이후에 올라온 동영상만 가져오기
+    def get_new_videos(self, channel_id, known_video_ids, limit=None):
+        videos = []
+        for page in self.iter_upload_pages(channel_id, limit, stop_at=set(known_video_ids)):
+            videos.extend(page)
+        
+        return videos
+    
+    # 동영상 통계만 다시 조회 (50개씩 묶어서 요청, 삭제/비공개 영상은 결과에서 빠짐)
+    def get_video_stats(self, video_ids):
+        video_details = list_video_details(self.youtube, list(video_ids))
+        
+        return {
+            video_id: {
+                'views': int(item['statistics'].get('viewCount', 0)),
+                'like_count': int(item['statistics'].get('likeCount', 0)),
+                'comment_count': int(item['statistics'].get('commentCount', 0)),
+            }
+            for video_id, item in video_details.items()
+        }
+    
+    # 상위 n개 댓글
+    def get_top_comments(self, video_id, max_results=3):
+        """Get top comments for a specific video"""
+        try:
+            request = self.youtube.commentThreads().list(
+                part='snippet',
+                videoId=video_id,
+                maxResults=max_results,
+                order='relevance'  # 인기순 정렬
+            )
+            response = request.execute()
+            
+            comments = []
+            for item in response.get('items', []):
+                comment = item['snippet']['topLevelComment']['snippet']
+                comments.append({
+                    'author': comment['authorDisplayName'],
+                    'text': comment['textDisplay'],
+                    'like_count': comment['likeCount'],
+                    'published_at': comment['publishedAt']
+                })
+            
+            return comments
+        except Exception as e:
+            # 댓글이 비활성화된 경우 등의 예외 처리
+            return [dict(comment) for comment in NO_COMMENTS]
+
+
+# 자막 구간 리스트를 앞에서부터 max_seconds 분량만 이어붙이기
+def join_transcript(segments, max_seconds=180):
+    first_minute = []
+    current_time = 0
     
-    return req.status_code == 200
+    for line in segments:
+        if current_time > max_seconds:  # 180초 = 3분
+            break
+        first_minute.append(line['text'])
+        current_time += line['duration']
+    
+    return ' '.join(first_minute)
 
 
-# YouTube Transcript API로 스크립트 요약
-def youtube_transcript(video_id, max_retries=3, retry_delay=1.5):
+# YouTube Transcript API로 자막 전체 구간 가져오기
+def fetch_transcript_segments(video_id, max_retries=3, retry_delay=1.5):
     """
-    YouTube 동영상의 스크립트를 추출하는 함수.
-    max_retries: 최대 재시도 횟수
-    retry_delay: 재시도 사이의 대기 시간(초)
+    ('ok', {'language_code', 'is_generated', 'segments'}): 자막을 가져온 경우
+    ('missing', None): 한국어 자막이 없는 경우
+    ('error', None): 여러 번 시도했으나 실패한 경우
     """
+    status = 'error'
+    
     for retry in range(max_retries):
         try:
             if retry > 0:
@@ -44,47 +425,73 @@ def youtube_transcript(video_id, max_retries=3, retry_delay=1.5):
                     transcript = transcript_list.find_generated_transcript(['ko'])
                     print('자동 생성 한국어 자막을 불러왔습니다.')
                 except Exception as e2:
-                    try:
-                        # 3. 다른 형식의 한국어 자막
-                        for t in transcript_list:
-                            if t.language_code.startswith('ko'):
-                                transcript = t
-                                print(f'한국어 자막을 찾았습니다: {t.language_code} ({"자동 생성" if t.is_generated else "수동 생성"})')
-                                break
-                    except Exception as e3:
-                        print('한국어 자막을 찾을 수 없습니다.')
-                        # 계속 진행하여 다른 시도를 해보기 위해 continue 하지 않음
+                    # 3. 다른 형식의 한국어 자막
+                    for t in transcript_list:
+                        if t.language_code.startswith('ko'):
+                            transcript = t
+                            print(f'한국어 자막을 찾았습니다: {t.language_code} ({"자동 생성" if t.is_generated else "수동 생성"})')
+                            break
             
             if transcript:
                 try:
-                    # 자막 텍스트 추출
-                    transcript_data = transcript.fetch()
-                    first_minute = []
-                    current_time = 0
+                    # 자막 전체 구간 추출
+                    segments = [
+                        {'text': line['text'], 'start': line['start'], 'duration': line['duration']}
+                        for line in transcript.fetch()
+                    ]
                     
-                    for line in transcript_data:
-                        if current_time > 180:  # 180초 = 3분
-                            break
-                        first_minute.append(line['text'])
-                        current_time += line['duration']
-                    
-                    result = ' '.join(first_minute)
-                    if result:
-                        print(f'성공적으로 {current_time:.1f}초 분량의 자막을 추출했습니다.')
-                        return result
+                    if segments:
+                        return 'ok', {
+                            'language_code': transcript.language_code,
+                            'is_generated': transcript.is_generated,
+                            'segments': segments
+                        }
                     else:
                         print('자막은 찾았으나 내용이 비어있습니다.')
                 except Exception as e:
                     print(f'자막 추출 중 오류 발생: {str(e)}')
             else:
                 print('사용 가능한 자막을 찾지 못했습니다.')
+                status = 'missing'
+                break  # 자막 목록을 정상적으로 받았으므로 재시도해도 결과가 같음
                 
+        except (TranscriptsDisabled, NoTranscriptFound) as e:
+            print(f'자막이 제공되지 않는 영상입니다: {str(e)}')
+            status = 'missing'
+            break
         except Exception as e:
             print(f'스크립트를 불러오는 중 오류가 발생했습니다: {str(e)}')
+    
+    return status, None
+
+
+# YouTube Transcript API로 스크립트 요약 (캐시 우선)
+def youtube_transcript(video_id, max_retries=3, retry_delay=1.5, use_cache=True):
+    """
+    YouTube 동영상의 스크립트(처음 3분)를 추출하는 함수.
+    max_retries: 최대 재시도 횟수
+    retry_delay: 재시도 사이의 대기 시간(초)
+    use_cache: 자막 캐시(transcript_cache) 사용 여부
+    """
+    if use_cache:
+        cached = transcript_cache.get_transcript(video_id)
+        if cached == transcript_cache.MISSING:
+            return NO_TRANSCRIPT_MESSAGE
+        if cached is not None:
+            return join_transcript(cached['segments'])
+    
+    status, transcript = fetch_transcript_segments(video_id, max_retries, retry_delay)
+    
+    if status == 'ok':
+        if use_cache:
+            transcript_cache.save_transcript(video_id, transcript['language_code'], transcript['is_generated'], transcript['segments'])
         
-        # 재시도가 남아 있으면 계속 시도
-        if retry < max_retries - 1:
-            continue
+        result = join_transcript(transcript['segments'])
+        print(f'성공적으로 자막을 추출했습니다. ({len(result)}자)')
+        return result
+    
+    if status == 'missing' and use_cache:
+        transcript_cache.save_missing(video_id)
     
     # 모든 시도가 실패하면 명확한 메시지 반환
-    return "⚠️ 자막을 가져올 수 없습니다 (여러 번 시도했으나 실패)"
+    return NO_TRANSCRIPT_MESSAGE